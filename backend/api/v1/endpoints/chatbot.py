@@ -15,7 +15,7 @@ async def chat_with_text(
 ):
     resources = request.app.state.resources
     chatbot_service = ChatbotService()
-    response = chatbot_service.run(resources=resources, text=text, user_id=user_id, session_id=session_id, files=files)
+    response = await chatbot_service.run(resources=resources, text=text, user_id=user_id, session_id=session_id, files=files)
     return {"response": response}
 
 
@@ -29,6 +29,6 @@ async def chat_with_audio(
 ):
     resources = request.app.state.resources
     chatbot_service = ChatbotService()
-    response = chatbot_service.run(resources=resources, audio=audio, user_id=user_id, session_id=session_id, files=files)
+    response = await chatbot_service.run(resources=resources, audio=audio, user_id=user_id, session_id=session_id, files=files)
     return {"response": response}
 
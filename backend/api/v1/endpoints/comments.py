@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request, Depends, Query
 from backend.models.comments import CommentRequest
 from backend.core.security import verify_token
 from backend.crud import comments as crud_comments
@@ -22,3 +22,9 @@ async def get_comment_likes(request: Request, comment_id: int):
     resources = request.app.state.resources
     likes = await crud_comments.count_comment_likes(resources=resources, comment_id=comment_id)
     return {"likes": likes}
+
+
+@router.get("/post/{post_id}/comments")
+async def get_post_comments(request: Request, post_id: int, after: int = None, limit: int = Query(20, ge=1, le=100)):
+    resources = request.app.state.resources
+    return await crud_comments.get_comments(resources=resources, post_id=post_id, after_comment_id=after, limit=limit)
@@ -1,28 +1,96 @@
-from fastapi import APIRouter, Request, UploadFile, File, Form, Depends, Query
-from fastapi.responses import JSONResponse
+import hashlib
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, Request, UploadFile, File, Form, Depends, Query, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from typing import List, Optional
 from backend.services.issues import service
+from backend.services.media import service as media_service
 from backend.models.issues import IssueReport, IssueFilter, Proximity, Location
+from backend.models.media import MediaUploadsRequest, MediaUploadComplete
 from backend.services.vlm_issue_categoriser.service import VLMIssueCategoriserService
 from backend.services.stfm_issue_count.service import STFMIssueCountService
 
 router = APIRouter()
 
+TILE_CACHE_MAX_AGE = 60  # seconds
+
+
+def build_proximity(latitude: Optional[float], longitude: Optional[float], radius: Optional[float]) -> Optional[Proximity]:
+    # Proximity filtering only applies when the full centre and radius are given
+    if None not in (latitude, longitude, radius):
+        return Proximity(latitude=latitude, longitude=longitude, radius=radius)
+    if latitude is not None or longitude is not None or radius is not None:
+        raise HTTPException(status_code=400, detail="latitude, longitude and radius must be given together.")
+    return None
+
+
+# --------------------------------------------------------
+# Conditional GET
+# --------------------------------------------------------
+
+def make_etag(*parts: str) -> str:
+    return f'W/"{hashlib.sha1("|".join(parts).encode()).hexdigest()}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    # no-cache: clients may keep the response but must revalidate it, which is a 304 while nothing changed
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    If-None-Match (weak comparison) takes precedence, If-Modified-Since is only consulted without it.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
 @router.get("/categories")
-async def get_issue_categories(request: Request):
+async def get_issue_categories(request: Request, response: Response):
     resources = request.app.state.resources
-    return service.fetch_issue_types_and_subtypes(resources)
+    # Read before the data: a concurrent change can only make the ETag older than the body, never newer
+    version, last_modified = await service.fetch_data_version(resources, service.CATEGORY_TABLES)
+    headers = validator_headers(make_etag("categories", version), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return await service.fetch_issue_types_and_subtypes(resources)
 
 
 @router.get("/nearby")
-async def get_issues_nearby_for_forum_post(request: Request, lat: float, lon: float, radius: int = 100):
+async def get_issues_nearby_for_forum_post(
+        request: Request,
+        lat: float,
+        lon: float,
+        radius: int = 100,
+        comment_limit: int = Query(20, ge=1, le=100)
+    ):
     resources = request.app.state.resources
-    return service.fetch_issues_nearby_for_forum_post(resources=resources, lat=lat, lon=lon, radius=radius)
+    return await service.fetch_issues_nearby_for_forum_post(resources=resources, lat=lat, lon=lon, radius=radius, comment_limit=comment_limit)
 
 
 @router.get("/")
 async def get_issue_reports(
         request: Request, 
+        response: Response,
         from_: Optional[str] = Query(None, alias="from"),
         to: Optional[str] = None,   
         types: Optional[str] = None,
@@ -30,11 +98,14 @@ async def get_issue_reports(
         severity: Optional[str] = None,
         status: Optional[str] = None,
         subzone_name: Optional[str] = None,
-        page: Optional[int] = 1,
-        limit: Optional[int] = 10000,
-        proximity: Optional[Proximity] = Depends()
+        page: Optional[int] = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(100, ge=1, le=1000),
+        latitude: Optional[float] = Query(None, ge=-90, le=90),
+        longitude: Optional[float] = Query(None, ge=-180, le=180),
+        radius: Optional[float] = Query(None, gt=0),
+        order: str = Query("updated", pattern="^(updated|distance)$")
     ):
-
     filters = IssueFilter(
         from_=from_,
         to=to,
@@ -44,12 +115,217 @@ async def get_issue_reports(
         status=status,
         subzone_name=subzone_name,
         page=page,
+        cursor=cursor,
+        limit=limit,
+        proximity=build_proximity(latitude, longitude, radius),
+        order=order
+    )
+
+    resources = request.app.state.resources
+    version, last_modified = await service.fetch_data_version(resources, service.ISSUE_LIST_TABLES)
+    headers = validator_headers(make_etag("issues", version, str(request.url.query)), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    try:
+        return await service.fetch_issue_reports(resources=resources, filters=filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/search")
+async def search_issue_reports(
+        request: Request,
+        q: str = Query(..., min_length=1, max_length=500),
+        from_: Optional[str] = Query(None, alias="from"),
+        to: Optional[str] = None,
+        types: Optional[str] = None,
+        subtypes: Optional[str] = None,
+        severity: Optional[str] = None,
+        status: Optional[str] = None,
+        subzone_name: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(20, ge=1, le=1000),
+        latitude: Optional[float] = Query(None, ge=-90, le=90),
+        longitude: Optional[float] = Query(None, ge=-180, le=180),
+        radius: Optional[float] = Query(None, gt=0)
+    ):
+    """
+    Ranked keyword search, e.g.
+
+    curl "http://localhost:XXXX/v1/issues/search?q=%22broken%20lamp%22%20-bulb&status=Reported"
+    """
+    filters = IssueFilter(
+        from_=from_,
+        to=to,
+        types=types,
+        subtypes=subtypes,
+        severity=severity,
+        status=status,
+        subzone_name=subzone_name,
+        cursor=cursor,
         limit=limit,
-        proximity=proximity
+        proximity=build_proximity(latitude, longitude, radius)
     )
 
     resources = request.app.state.resources
-    return service.fetch_issue_reports(resources=resources, filters=filters)
+    try:
+        return await service.search_issue_reports(resources=resources, query=q, filters=filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/export")
+async def export_issue_reports(
+        request: Request, 
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        from_: Optional[str] = Query(None, alias="from"),
+        to: Optional[str] = None,   
+        types: Optional[str] = None,
+        subtypes: Optional[str] = None,
+        severity: Optional[str] = None,
+        status: Optional[str] = None,
+        subzone_name: Optional[str] = None
+    ):
+    """
+    Streams all matching issues as NDJSON or CSV, e.g.
+
+    curl "http://localhost:XXXX/v1/issues/export?format=csv&status=Reported" -o issues.csv
+    """
+    filters = IssueFilter(
+        from_=from_,
+        to=to,
+        types=types,
+        subtypes=subtypes,
+        severity=severity,
+        status=status,
+        subzone_name=subzone_name
+    )
+
+    resources = request.app.state.resources
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        service.export_issue_reports(resources=resources, filters=filters, fmt=format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=issues.{format}"}
+    )
+
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_issue_tile(
+        request: Request, 
+        z: int,
+        x: int,
+        y: int,
+        types: Optional[str] = None,
+        subtypes: Optional[str] = None,
+        severity: Optional[str] = None,
+        status: Optional[str] = None
+    ):
+    filters = IssueFilter(
+        types=types,
+        subtypes=subtypes,
+        severity=severity,
+        status=status
+    )
+
+    resources = request.app.state.resources
+    try:
+        tile = await service.fetch_issue_tile(resources=resources, z=z, x=x, y=y, filters=filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(
+        content=tile,
+        media_type="application/vnd.mapbox-vector-tile",
+        headers={"Cache-Control": f"public, max-age={TILE_CACHE_MAX_AGE}"}
+    )
+
+
+@router.get("/aggregate")
+async def get_issue_grid_aggregation(
+        request: Request, 
+        cell_size: int = Query(1000, description="Cell size in metres: 100, 200, 500, 1000, 2000 or 5000"),
+        min_lat: Optional[float] = None,
+        min_lon: Optional[float] = None,
+        max_lat: Optional[float] = None,
+        max_lon: Optional[float] = None,
+        from_: Optional[str] = Query(None, alias="from"),
+        to: Optional[str] = None,   
+        types: Optional[str] = None,
+        subtypes: Optional[str] = None,
+        severity: Optional[str] = None,
+        status: Optional[str] = None,
+        subzone_name: Optional[str] = None
+    ):
+    filters = IssueFilter(
+        from_=from_,
+        to=to,
+        types=types,
+        subtypes=subtypes,
+        severity=severity,
+        status=status,
+        subzone_name=subzone_name
+    )
+
+    bbox_values = (min_lat, min_lon, max_lat, max_lon)
+    bbox = None
+    if all(v is not None for v in bbox_values):
+        bbox = {"min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon}
+    elif any(v is not None for v in bbox_values):
+        raise HTTPException(status_code=400, detail="Bounding box requires min_lat, min_lon, max_lat and max_lon.")
+
+    resources = request.app.state.resources
+    try:
+        return await service.fetch_issue_grid_aggregation(resources=resources, cell_size=cell_size, filters=filters, bbox=bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/daily-count")
+async def get_daily_issue_counts(
+        request: Request, 
+        days: int = Query(14, ge=1, le=366),
+        subzone_name: Optional[str] = None,
+        types: Optional[str] = None,
+        subtypes: Optional[str] = None,
+        authority_name: Optional[str] = None
+    ):
+    resources = request.app.state.resources
+    return await service.fetch_daily_issue_counts(
+        resources=resources,
+        days=days,
+        subzone_name=subzone_name,
+        types=types,
+        subtypes=subtypes,
+        authority_name=authority_name
+    )
+
+
+@router.get("/daily-count/batch")
+async def get_daily_issue_count_matrix(
+        request: Request,
+        subzones: str = Query(..., description="Comma-separated subzone names"),
+        types: Optional[str] = Query(None, description="Comma-separated issue type names, one series per subzone and type"),
+        from_: Optional[date] = Query(None, alias="from", description="First day, defaults to 13 days before 'to'"),
+        to: Optional[date] = Query(None, description="Last day, defaults to today")
+    ):
+    """
+    Daily issue counts for many subzones (and types) at once, in one query. Columnar response:
+    a shared "dates" array and one "counts" array per series, aligned with it.
+    """
+    resources = request.app.state.resources
+    try:
+        return await service.fetch_daily_issue_count_matrix(
+            resources=resources,
+            subzones=subzones,
+            types=types,
+            start_date=from_,
+            end_date=to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/")
@@ -59,6 +335,50 @@ async def create_issue_report(request: Request, issue: IssueReport):
     return {"message": "Issue created successfully", "issue_id": inserted_issue["issue_id"]}
 
 
+@router.post("/{issue_id}/media/uploads")
+async def create_issue_media_uploads(request: Request, issue_id: int, body: MediaUploadsRequest):
+    """
+    Presigned PUT URLs for uploading report media straight to object storage.
+    After each PUT succeeds, call /{issue_id}/media/complete with its object_name.
+    """
+    resources = request.app.state.resources
+    try:
+        return {"uploads": await media_service.create_media_uploads(resources=resources, issue_id=issue_id, files=body.files)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{issue_id}/media/complete")
+async def complete_issue_media_upload(request: Request, issue_id: int, body: MediaUploadComplete):
+    resources = request.app.state.resources
+    try:
+        return await media_service.complete_media_upload(resources=resources, issue_id=issue_id, object_name=body.object_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk")
+async def bulk_create_issue_reports(
+    request: Request,
+    file: UploadFile = File(...),
+    format: str = Form("ndjson", pattern="^(ndjson|csv)$")
+):
+    """
+    Example curl request:
+
+    curl -X POST "http://localhost:XXXX/v1/issues/bulk" \
+    -F "format=csv" \
+    -F "file=@/path/to/backlog.csv"
+
+    CSV columns follow IssueReport, plus optional issue_type_ids / issue_subtype_ids as ';'-separated ids.
+    """
+    resources = request.app.state.resources
+    try:
+        return await service.ingest_issue_reports(resources=resources, file=file.file, fmt=format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/categorise")
 async def infer_vlm_and_categorise_issues(
     request: Request,
@@ -102,5 +422,5 @@ async def infer_vlm_and_categorise_issues(
 ):
     resources = request.app.state.resources
     sftm_issue_count_service = STFMIssueCountService()
-    response = sftm_issue_count_service.run(resources=resources, subzone_name=subzone_name, issue_type=issue_type)
+    response = await sftm_issue_count_service.run(resources=resources, subzone_name=subzone_name, issue_type=issue_type)
     return {"response": response}
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request
+
+router = APIRouter()
+
+@router.get("/db_pool")
+async def get_db_pool_metrics(request: Request):
+    """
+    Connection pool metrics of the worker that served the request: size, in-use and waiting
+    counts, cumulative wait time and recent checkout latency percentiles.
+    """
+    resources = request.app.state.resources
+    return resources.db_client.metrics()
+
+@router.get("/db_pool/replicas")
+async def get_replica_pool_metrics(request: Request):
+    """
+    The same metrics for each read replica pool, empty when reads go to the primary.
+    """
+    resources = request.app.state.resources
+    if resources.replica_db_client is resources.db_client:
+        return []
+    return resources.replica_db_client.metrics()
+
+@router.get("/readiness")
+async def get_readiness(request: Request):
+    """
+    Result and duration of each data store's startup readiness check in this worker.
+    """
+    resources = request.app.state.resources
+    return resources.readiness
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request, Depends, Query
 from backend.core.security import verify_token
 from backend.crud import posts as crud_posts
+from backend.services.posts import service
 
 router = APIRouter()
 
@@ -25,22 +26,4 @@ async def get_post_likes(request: Request, post_id: int):
 @router.get("/forum-posts")
 async def get_forum_posts(request: Request, lat: float, lon: float):
     resources = request.app.state.resources
-
-    posts = await crud_posts.get_forum_posts(resources=resources, user_lat=lat, user_lon=lon, radius_meters=2000)
-
-    formatted_posts = [
-        {
-            "id": post["post_id"],
-            "title": post["title"],
-            "description": post["description"],
-            "latitude": post["latitude"],
-            "longitude": post["longitude"],
-            "severity": post["severity"],
-            "status": post["status"],
-            "created_at": post["created_at"],
-            "image": f"/{post['file_path']}" if post["file_path"] else None
-        }
-        for post in posts
-    ]
-    print(formatted_posts[0]["image"])
-    return {"posts": formatted_posts}
\ No newline at end of file
+    return await service.fetch_forum_posts(resources=resources, lat=lat, lon=lon)
@@ -20,14 +20,17 @@ async def get_authorities(resources: Resources, params: dict):
         ORDER BY name ASC
     """
 
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(query, values)
             return await cur.fetchall()
 
 
 async def fetch_agency_id_from_name(resources: Resources, name: str) -> int | None:
-    async with resources.db_client.connection() as conn:
+    if resources.reference_data.loaded:
+        return resources.reference_data.authority_ref_id_from_name("agency", name)
+
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 "SELECT agency_id FROM agencies WHERE name = %s",
@@ -37,7 +40,10 @@ async def fetch_agency_id_from_name(resources: Resources, name: str) -> int | No
             return row["agency_id"] if row else None
 
 async def fetch_town_council_id_from_name(resources: Resources, name: str) -> int | None:
-    async with resources.db_client.connection() as conn:
+    if resources.reference_data.loaded:
+        return resources.reference_data.authority_ref_id_from_name("town_council", name)
+
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 "SELECT town_council_id FROM town_councils WHERE name = %s",
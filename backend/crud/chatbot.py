@@ -25,7 +25,7 @@ async def log_message(resources: Resources, session_id: str, user_id: str, sende
             return log_data
 
 async def get_session_messages(resources: Resources, session_id: str, user_id: str = None):
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             if user_id:
                 await cur.execute(
@@ -5,7 +5,10 @@ async def like_comment(resources: Resources, user_id: int, comment_id: int):
     async with resources.db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
-                "INSERT INTO comment_votes (user_id, comment_id) VALUES (%s, %s)",
+                """
+                INSERT INTO comment_votes (user_id, comment_id, vote_type) VALUES (%s, %s, 1)
+                ON CONFLICT (user_id, comment_id) DO UPDATE SET vote_type = EXCLUDED.vote_type
+                """,
                 (user_id, comment_id)
             )
 
@@ -24,11 +27,35 @@ async def create_comment(resources: Resources, user_id: int, post_id: int, conte
             return new_comment
 
 async def count_comment_likes(resources: Resources, comment_id: int):
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
-                "SELECT COUNT(*) FROM comment_votes WHERE comment_id = %s",
+                "SELECT like_count FROM comments WHERE comment_id = %s",
                 (comment_id,)
             )
             result = await cur.fetchone()
-            return result["count"]
+            return result["like_count"] if result else 0
+
+
+async def get_comments(resources: Resources, post_id: int, after_comment_id: int = None, limit: int = 20):
+    """
+    Comments on a post in comment_id order, keyed on the last comment_id already seen.
+    """
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT c.comment_id, c.parent_comment_id, c.content, c.created_at AS comment_created_at,
+                       c.like_count AS comment_likes, c.dislike_count AS comment_dislikes
+                FROM comments c
+                WHERE c.post_id = %s AND c.comment_id > %s
+                ORDER BY c.comment_id
+                LIMIT %s
+                """,
+                (post_id, after_comment_id or 0, limit + 1),
+                prepare=True
+            )
+            rows = await cur.fetchall()
+
+    next_after = rows[limit - 1]["comment_id"] if len(rows) > limit else None
+    return {"comments": rows[:limit], "next_comment_after": next_after}
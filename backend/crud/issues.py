@@ -1,78 +1,440 @@
+import json
+import math
+import base64
 from backend.data_stores.resources import Resources
+from backend.data_stores.reference_data import ReferenceDataCache
 from backend.models.issues import IssueReport
 from psycopg.rows import dict_row
-from typing import Optional
-from datetime import date, timedelta
+from typing import Optional, AsyncIterator
+from datetime import date, datetime, timedelta
 
-async def get_issues(resources: Resources, params: dict):
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+POINT_SQL = "ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography"  # params: longitude, latitude
+
+
+def encode_issue_cursor(sort_key: datetime | float | None, issue_id: int) -> str:
+    """
+    Encode the sort key of the last issue on a page into an opaque cursor.
+    The sort key is datetime_updated, or a numeric score (distance in metres, search rank).
+    """
+    if isinstance(sort_key, float):
+        payload = {"d": sort_key, "id": issue_id}
+    else:
+        payload = {"u": sort_key.isoformat() if sort_key else None, "id": issue_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_issue_cursor(cursor: str) -> tuple[datetime | float | None, int]:
+    """
+    Decode a cursor produced by encode_issue_cursor back into (sort_key, issue_id).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if "d" in payload:
+            return float(payload["d"]), int(payload["id"])
+        datetime_updated = datetime.fromisoformat(payload["u"]) if payload["u"] else None
+        return datetime_updated, int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor value.") from e
+
+
+def build_issue_filters(params: dict, reference_data: ReferenceDataCache | None = None) -> tuple[list[str], list]:
+    """
+    Translate IssueFilter parameters into SQL conditions over `issues i` joined to `subzones sz`.
+    Type and subtype names are resolved to ids in-process when the reference data cache is loaded.
+    """
     filters, values = [], []
 
     def add_filter(condition: str, value):
         filters.append(condition.replace("{}", f"%s"))
         values.append(value)
 
-    if params.get("subzoneName"): add_filter("sz.name = {}", params["subzoneName"])
+    if params.get("subzone_name"): add_filter("sz.name = {}", params["subzone_name"])
     if params.get("from"): add_filter("i.datetime_updated >= {}", params["from"])
-    if params.get("to"): add_filter("i.datetime_updated <= {}", params["to"])
+    if params.get("to"):
+        add_filter("i.datetime_updated <= {}", params["to"])
+        # Implied by CHECK issues_updated_after_reported, stated so the planner prunes later partitions
+        add_filter("i.datetime_reported <= {}", params["to"])
     if params.get("severity"): add_filter("i.severity = {}", params["severity"])
     if params.get("status"): add_filter("i.status = {}", params["status"])
 
+    if params.get("proximity"):
+        # Radius in metres on the stored geography, answered from idx_issues_location
+        proximity = params["proximity"]
+        filters.append(f"ST_DWithin(i.location, {POINT_SQL}, %s)")
+        values.extend([proximity["longitude"], proximity["latitude"], proximity["radius"]])
+
+    # Overlap (&&) against the trigger-maintained category arrays, answered from their GIN indexes
     if params.get("types"):
         types = params["types"].split(",")
-        placeholders = ",".join(["%s"] * len(types))
-        filters.append(f"""EXISTS (
-            SELECT 1 FROM issue_type_to_issue_mapping itim
-            JOIN issue_types it ON itim.issue_type_id = it.issue_type_id
-            WHERE itim.issue_id = i.issue_id AND it.name IN ({placeholders})
-        )""")
-        values.extend(types)
+        if reference_data and reference_data.loaded:
+            add_filter("i.issue_type_ids && {}::integer[]", reference_data.issue_type_ids_from_names(types))
+        else:
+            add_filter("i.issue_type_ids && ARRAY(SELECT it.issue_type_id FROM issue_types it WHERE it.name = ANY({}))", types)
 
     if params.get("subtypes"):
         subtypes = params["subtypes"].split(",")
-        placeholders = ",".join(["%s"] * len(subtypes))
-        filters.append(f"""EXISTS (
-            SELECT 1 FROM issue_subtype_to_issue_mapping iscm
-            JOIN issue_subtypes isc ON iscm.issue_subtype_id = isc.issue_subtype_id
-            WHERE iscm.issue_id = i.issue_id AND isc.name IN ({placeholders})
-        )""")
-        values.extend(subtypes)
+        if reference_data and reference_data.loaded:
+            add_filter("i.issue_subtype_ids && {}::integer[]", reference_data.issue_subtype_ids_from_names(subtypes))
+        else:
+            add_filter("i.issue_subtype_ids && ARRAY(SELECT isc.issue_subtype_id FROM issue_subtypes isc WHERE isc.name = ANY({}))", subtypes)
+
+    return filters, values
+
+
+def attach_reference_names(rows: list[dict], reference_data: ReferenceDataCache) -> None:
+    """
+    Replace issue_type_ids, issue_subtype_ids and authority_id on each row with the names
+    from the reference data cache, so list queries need no joins to the lookup tables.
+    """
+    for row in rows:
+        type_ids, subtype_ids = row.pop("issue_type_ids"), row.pop("issue_subtype_ids")
+        authority = reference_data.authorities_by_id.get(row.pop("authority_id"), {})
+        row["issue_types"] = sorted(reference_data.issue_types_by_id[t]["name"] for t in type_ids if t in reference_data.issue_types_by_id)
+        row["issue_subtypes"] = sorted(reference_data.issue_subtypes_by_id[t]["name"] for t in subtype_ids if t in reference_data.issue_subtypes_by_id)
+        row["authority_name"] = authority.get("name")
+        row["authority_type"] = authority.get("authority_type")
+        row["authority_ref_id"] = authority.get("authority_ref_id")
+
+
+async def resolve_reference_names(resources: Resources, rows: list[dict]) -> None:
+    """
+    attach_reference_names from the reference data cache, or, while it is not loaded (cold
+    start, failed load), from the lookup rows these issues need, fetched in one round trip.
+    """
+    reference_data = resources.reference_data
+    if not reference_data.loaded:
+        type_ids = list({t for row in rows for t in row["issue_type_ids"] or []})
+        subtype_ids = list({t for row in rows for t in row["issue_subtype_ids"] or []})
+        authority_ids = list({row["authority_id"] for row in rows if row["authority_id"] is not None})
+
+        async with resources.read_db_client.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute("SELECT issue_type_id, name FROM issue_types WHERE issue_type_id = ANY(%s)", (type_ids,))
+                issue_types = await cur.fetchall()
+                await cur.execute("SELECT issue_subtype_id, name FROM issue_subtypes WHERE issue_subtype_id = ANY(%s)", (subtype_ids,))
+                issue_subtypes = await cur.fetchall()
+                await cur.execute(
+                    "SELECT authority_id, authority_type, authority_ref_id, name FROM authorities WHERE authority_id = ANY(%s)",
+                    (authority_ids,)
+                )
+                authorities = await cur.fetchall()
+
+        reference_data = ReferenceDataCache()
+        reference_data.issue_types_by_id = {row["issue_type_id"]: row for row in issue_types}
+        reference_data.issue_subtypes_by_id = {row["issue_subtype_id"]: row for row in issue_subtypes}
+        reference_data.authorities_by_id = {row["authority_id"]: row for row in authorities}
+
+    attach_reference_names(rows, reference_data)
+
+
+async def get_issues(resources: Resources, params: dict):
+    """
+    {
+        "issues": [<issue row>, ...],
+        "next_cursor": <string or None>
+    }
+
+    Pages are keyed on (datetime_updated, issue_id), or on (distance, issue_id) with order=distance,
+    unless an explicit `page` is given, in which case the legacy LIMIT/OFFSET behaviour is used.
+    """
+    filters, values = build_issue_filters(params, resources.reference_data)
+
+    limit = min(int(params.get("limit") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+    page = params.get("page")
+    offset_clause = ""
+
+    proximity = params.get("proximity")
+    by_distance = params.get("order") == "distance"
+    if by_distance and not proximity:
+        raise ValueError("order=distance requires latitude, longitude and radius.")
+    origin = [proximity["longitude"], proximity["latitude"]] if by_distance else []
+
+    if page:
+        offset_clause = "OFFSET %s"
+    elif params.get("cursor"):
+        last_key, last_issue_id = decode_issue_cursor(params["cursor"])
+        if by_distance != isinstance(last_key, float):
+            raise ValueError("Cursor does not match the requested order.")
+        if by_distance:
+            filters.append(f"(i.location <-> {POINT_SQL}, i.issue_id) > (%s, %s)")
+            values.extend([*origin, last_key, last_issue_id])
+        elif last_key is None:
+            # NULL timestamps sort last, so only the NULL tail remains
+            filters.append("(i.datetime_updated IS NULL AND i.issue_id < %s)")
+            values.append(last_issue_id)
+        else:
+            filters.append("((i.datetime_updated, i.issue_id) < (%s, %s) OR i.datetime_updated IS NULL)")
+            values.extend([last_key, last_issue_id])
 
     where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
 
-    offset = (int(params.get("page", 1)) - 1) * int(params.get("limit", 10000))
-    limit = int(params.get("limit", 10000))
-    values.extend([limit, offset])
+    if by_distance:
+        # KNN ordering with <-> walks idx_issues_location nearest-first
+        distance_select = f", i.location <-> {POINT_SQL} AS distance_m"
+        page_order = f"i.location <-> {POINT_SQL}, i.issue_id"
+        result_order = "p.distance_m, i.issue_id"
+        values = [*origin, *values, *origin]
+    else:
+        distance_select = ""
+        page_order = "i.datetime_updated DESC NULLS LAST, i.issue_id DESC"
+        result_order = "i.datetime_updated DESC NULLS LAST, i.issue_id DESC"
+
+    # Fetch one extra row to know whether another page exists
+    values.append(limit + 1)
+    if page:
+        values.append((int(page) - 1) * limit)
+
+    query = f"""
+        WITH page AS (
+            SELECT i.issue_id, sz.name AS subzone_name{distance_select}
+            FROM issues i
+            JOIN subzones sz ON i.subzone_id = sz.subzone_id
+            {where_clause}
+            ORDER BY {page_order}
+            LIMIT %s {offset_clause}
+        )
+        SELECT i.issue_id, i.description, i.severity, i.latitude, i.longitude, i.address, i.status,
+               p.subzone_name, i.datetime_reported, i.datetime_acknowledged,
+               i.datetime_closed, i.datetime_updated,
+               i.issue_type_ids, i.issue_subtype_ids,
+               i.authority_id{", p.distance_m" if by_distance else ""}
+        FROM page p
+        JOIN issues i ON i.issue_id = p.issue_id
+        ORDER BY {result_order}
+    """
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, values)
+            rows = await cur.fetchall()
+
+    await resolve_reference_names(resources, rows)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        sort_key = float(last["distance_m"]) if by_distance else last["datetime_updated"]
+        next_cursor = encode_issue_cursor(sort_key, last["issue_id"])
+
+    return {"issues": rows, "next_cursor": next_cursor}
+    
+
+SEARCH_CONFIG = "english"
+TSQUERY_SQL = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+RANK_SQL = f"ts_rank(i.search_vector, {TSQUERY_SQL})::float8"  # float8 so the rank round-trips exactly through cursors
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+async def search_issues(resources: Resources, query: str, params: dict):
+    """
+    {
+        "issues": [<issue row with "rank" and "highlight">, ...],
+        "next_cursor": <string or None>
+    }
+
+    Full-text search over the stored search_vector (description and address, GIN-indexed),
+    with the same filters as get_issues. `query` uses web search syntax ("quoted phrases",
+    OR, -exclusions). Pages are keyed on (rank, issue_id), highlights are only built for the page.
+    """
+    if not query or not query.strip():
+        raise ValueError("Search query must not be empty.")
+
+    filters, filter_values = build_issue_filters(params, resources.reference_data)
+    limit = min(int(params.get("limit") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
 
+    filters.insert(0, f"i.search_vector @@ {TSQUERY_SQL}")
+    values = [query, query, *filter_values]
+
+    if params.get("cursor"):
+        last_rank, last_issue_id = decode_issue_cursor(params["cursor"])
+        if not isinstance(last_rank, float):
+            raise ValueError("Cursor does not match the requested order.")
+        filters.append(f"({RANK_SQL}, i.issue_id) < (%s, %s)")
+        values.extend([query, last_rank, last_issue_id])
+
+    # Fetch one extra row to know whether another page exists
+    values.extend([limit + 1, query])
+
+    sql = f"""
+        WITH page AS (
+            SELECT i.issue_id, sz.name AS subzone_name, {RANK_SQL} AS rank
+            FROM issues i
+            JOIN subzones sz ON i.subzone_id = sz.subzone_id
+            WHERE {' AND '.join(filters)}
+            ORDER BY rank DESC, i.issue_id DESC
+            LIMIT %s
+        )
+        SELECT i.issue_id, i.description, i.severity, i.latitude, i.longitude, i.address, i.status,
+               p.subzone_name, i.datetime_reported, i.datetime_acknowledged,
+               i.datetime_closed, i.datetime_updated,
+               i.issue_type_ids, i.issue_subtype_ids, i.authority_id,
+               p.rank,
+               ts_headline('{SEARCH_CONFIG}', COALESCE(i.description, ''), {TSQUERY_SQL}, '{HEADLINE_OPTIONS}') AS highlight
+        FROM page p
+        JOIN issues i ON i.issue_id = p.issue_id
+        ORDER BY p.rank DESC, i.issue_id DESC
+    """
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(sql, values)
+            rows = await cur.fetchall()
+
+    await resolve_reference_names(resources, rows)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_issue_cursor(float(last["rank"]), last["issue_id"])
+
+    return {"issues": rows, "next_cursor": next_cursor}
+
+
+EXPORT_FETCH_SIZE = 2000
+
+
+async def stream_issues(resources: Resources, params: dict) -> AsyncIterator[dict]:
+    """
+    Yield every issue matching the filters from a named (server-side) cursor,
+    so only one batch of rows is held in memory at a time.
+    """
+    filters, values = build_issue_filters(params, resources.reference_data)
+    where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    # Correlated subqueries instead of GROUP BY so rows stream without a blocking aggregate
     query = f"""
         SELECT i.issue_id, i.description, i.severity, i.latitude, i.longitude, i.address, i.status,
                sz.name AS subzone_name, i.datetime_reported, i.datetime_acknowledged,
                i.datetime_closed, i.datetime_updated,
-               COALESCE(json_agg(DISTINCT it.name) FILTER (WHERE it.name IS NOT NULL), '[]') AS issue_types,
-               COALESCE(json_agg(DISTINCT isc.name) FILTER (WHERE isc.name IS NOT NULL), '[]') AS issue_subtypes,
+               ARRAY(SELECT it.name FROM issue_types it WHERE it.issue_type_id = ANY(i.issue_type_ids)) AS issue_types,
+               ARRAY(SELECT isc.name FROM issue_subtypes isc WHERE isc.issue_subtype_id = ANY(i.issue_subtype_ids)) AS issue_subtypes,
                auth.name AS authority_name,
                auth.authority_type,
                auth.authority_ref_id
         FROM issues i
         JOIN subzones sz ON i.subzone_id = sz.subzone_id
-        LEFT JOIN issue_type_to_issue_mapping itim ON i.issue_id = itim.issue_id
-        LEFT JOIN issue_types it ON itim.issue_type_id = it.issue_type_id
-        LEFT JOIN issue_subtype_to_issue_mapping iscm ON i.issue_id = iscm.issue_id
-        LEFT JOIN issue_subtypes isc ON iscm.issue_subtype_id = isc.issue_subtype_id
         LEFT JOIN authorities auth ON i.authority_id = auth.authority_id
         {where_clause}
-        GROUP BY i.issue_id, sz.name, auth.name, auth.authority_type, auth.authority_ref_id
-        ORDER BY i.datetime_updated DESC
-        LIMIT %s OFFSET %s
+        ORDER BY i.issue_id
     """
 
-    async with resources.db_client.connection() as conn:
-        async with conn.cursor(row_factory=dict_row) as cur:
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(name="issues_export", row_factory=dict_row) as cur:
+            cur.itersize = EXPORT_FETCH_SIZE
             await cur.execute(query, values)
+            async for row in cur:
+                yield row
+
+
+def tile_feature_cap(z: int) -> int:
+    """
+    Maximum number of issues encoded into a single tile at zoom level z.
+    """
+    if z <= 10:
+        return 500
+    if z <= 13:
+        return 2000
+    return 5000
+
+
+async def get_issue_tile(resources: Resources, z: int, x: int, y: int, params: dict) -> bytes:
+    """
+    Render the issues inside tile z/x/y as a Mapbox Vector Tile with a single 'issues' layer.
+    """
+    filters, values = build_issue_filters(params, resources.reference_data)
+    filters.append("i.location && ST_Transform(bounds.geom, 4326)::geography")
+    where_clause = f"WHERE {' AND '.join(filters)}"
+
+    query = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+        ),
+        features AS (
+            SELECT ST_AsMVTGeom(ST_Transform(i.location::geometry, 3857), bounds.geom) AS geom,
+                   i.issue_id, i.severity, i.status, i.datetime_updated::text AS datetime_updated
+            FROM issues i
+            JOIN subzones sz ON i.subzone_id = sz.subzone_id
+            CROSS JOIN bounds
+            {where_clause}
+            ORDER BY i.datetime_updated DESC NULLS LAST
+            LIMIT %s
+        )
+        SELECT ST_AsMVT(features.*, 'issues') AS tile
+        FROM features
+    """
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, [z, x, y, *values, tile_feature_cap(z)])
+            row = await cur.fetchone()
+            return bytes(row["tile"]) if row and row["tile"] else b""
+
+
+GRID_BASE_DEGREES = 0.0009  # Must match issues.grid_x / grid_y in schema/tables/11_issues.sql
+GRID_CELL_FACTORS = {100: 1, 200: 2, 500: 5, 1000: 10, 2000: 20, 5000: 50}  # cell size (m) -> base cells per side
+
+
+async def get_issue_grid_counts(resources: Resources, cell_size: int, params: dict, bbox: Optional[dict] = None):
+    """
+    [
+        {
+            "cell_x": <integer>,
+            "cell_y": <integer>,
+            "count": <integer>,
+            "severity_counts": {<severity>: <integer>, ...}
+        },
+        ...
+    ]
+    """
+    factor = GRID_CELL_FACTORS.get(cell_size)
+    if factor is None:
+        raise ValueError(f"Invalid cell_size value. Must be one of: {', '.join(map(str, GRID_CELL_FACTORS))}.")
+
+    filters, values = build_issue_filters(params, resources.reference_data)
+
+    if bbox:
+        # Range over the stored base cells so the bbox is served by idx_issues_grid
+        filters.append("i.grid_y BETWEEN %s AND %s AND i.grid_x BETWEEN %s AND %s")
+        values.extend([
+            math.floor(bbox["min_lat"] / GRID_BASE_DEGREES), math.floor(bbox["max_lat"] / GRID_BASE_DEGREES),
+            math.floor(bbox["min_lon"] / GRID_BASE_DEGREES), math.floor(bbox["max_lon"] / GRID_BASE_DEGREES)
+        ])
+
+    where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    query = f"""
+        WITH cells AS (
+            SELECT floor(i.grid_x::float8 / %s)::integer AS cell_x,
+                   floor(i.grid_y::float8 / %s)::integer AS cell_y,
+                   COALESCE(i.severity, 'Unknown') AS severity,
+                   COUNT(*) AS count
+            FROM issues i
+            JOIN subzones sz ON i.subzone_id = sz.subzone_id
+            {where_clause}
+            GROUP BY 1, 2, 3
+        )
+        SELECT cell_x, cell_y, SUM(count)::integer AS count,
+               jsonb_object_agg(severity, count) AS severity_counts
+        FROM cells
+        GROUP BY cell_x, cell_y
+    """
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, [factor, factor, *values])
             return await cur.fetchall()
-    
 
-async def fetch_issue_type_info_from_name(resources: Resources, name: str) -> int | None:
-    async with resources.db_client.connection() as conn:
+
+async def fetch_issue_type_info_from_name(resources: Resources, name: str) -> dict | None:
+    if resources.reference_data.loaded:
+        return resources.reference_data.issue_types_by_name.get(name)
+
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 "SELECT * FROM issue_types WHERE name = %s",
@@ -81,8 +443,23 @@ async def fetch_issue_type_info_from_name(resources: Resources, name: str) -> in
             return await cur.fetchone()
     
 
-async def fetch_issue_subtype_info_from_name(resources: Resources, name: str) -> int | None:
-    async with resources.db_client.connection() as conn:
+async def fetch_issue_subtypes(resources: Resources) -> list[dict]:
+    if resources.reference_data.loaded:
+        return list(resources.reference_data.issue_subtypes_by_id.values())
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                "SELECT issue_subtype_id, issue_type_id, name, description FROM issue_subtypes ORDER BY issue_type_id, issue_subtype_id"
+            )
+            return await cur.fetchall()
+
+
+async def fetch_issue_subtype_info_from_name(resources: Resources, name: str) -> dict | None:
+    if resources.reference_data.loaded:
+        return resources.reference_data.issue_subtypes_by_name.get(name)
+
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 "SELECT * FROM issue_subtypes WHERE name = %s",
@@ -91,8 +468,39 @@ async def fetch_issue_subtype_info_from_name(resources: Resources, name: str) ->
             return await cur.fetchone()
         
 
-async def get_issue_type_and_subtype(resources: Resources, params: dict):
-    category = params.get("category", "both")
+async def get_issue_type_and_subtype(resources: Resources, params: dict | None = None):
+    category = (params or {}).get("category", "both")
+
+    reference_data = resources.reference_data
+    if reference_data.loaded and category in {"type", "subtype", "both"}:
+        issue_types = reference_data.issue_types_by_id
+        subtypes_by_type = {}
+        for subtype in reference_data.issue_subtypes_by_id.values():
+            subtypes_by_type.setdefault(subtype["issue_type_id"], []).append(subtype)
+
+        if category == "type":
+            return [
+                {"issue_type_id": t["issue_type_id"], "type_name": t["name"], "type_description": t["description"]}
+                for t in issue_types.values()
+            ]
+        if category == "subtype":
+            return [
+                {
+                    "issue_subtype_id": st["issue_subtype_id"], "subtype_name": st["name"], "subtype_description": st["description"],
+                    "issue_type_id": st["issue_type_id"], "parent_type_name": issue_types.get(st["issue_type_id"], {}).get("name")
+                }
+                for st in reference_data.issue_subtypes_by_id.values()
+            ]
+        return [
+            {
+                "issue_type_id": t["issue_type_id"], "type_name": t["name"], "type_description": t["description"],
+                "issue_subtype_id": st["issue_subtype_id"] if st else None,
+                "subtype_name": st["name"] if st else None,
+                "subtype_description": st["description"] if st else None
+            }
+            for t in issue_types.values()
+            for st in (subtypes_by_type.get(t["issue_type_id"]) or [None])
+        ]
 
     query = {
         "type": """
@@ -119,39 +527,93 @@ async def get_issue_type_and_subtype(resources: Resources, params: dict):
     if query is None:
         raise ValueError("Invalid category value. Must be one of: 'type', 'subtype', or 'both'.")
 
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(query)
             return await cur.fetchall()
 
 
-async def get_issues_nearby(resources: Resources, lat: float, lon: float, radius: int):
-    async with resources.db_client.connection() as conn:
+NEARBY_COMMENT_LIMIT = 20
+MAX_NEARBY_COMMENT_LIMIT = 100
+
+
+async def get_issues_nearby(resources: Resources, lat: float, lon: float, radius: int, comment_limit: int = NEARBY_COMMENT_LIMIT):
+    """
+    One row per issue within `radius` metres, with its forum post, its trigger-maintained
+    vote and comment counters, its first image (image_url) and the first `comment_limit` comments (oldest first) already aggregated as JSON.
+    Further comments are paged with crud.comments.get_comments from next_comment_after.
+    """
+    comment_limit = min(comment_limit, MAX_NEARBY_COMMENT_LIMIT)
+
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
-                """
-                SELECT 
-                    i.*, 
-                    fp.*, 
-                    c.comment_id, 
-                    c.parent_comment_id, 
-                    c.content AS comment_content, 
-                    c.created_at AS comment_created_at, 
-                    COUNT(DISTINCT pv.user_id) AS post_likes, 
-                    COUNT(DISTINCT c.comment_id) OVER (PARTITION BY fp.post_id) AS comment_count, 
-                    COUNT(DISTINCT cv.user_id) AS comment_likes
+                f"""
+                SELECT
+                    i.issue_id, i.user_id, i.issue_type_ids, i.issue_subtype_ids,
+                    i.latitude, i.longitude, i.address, i.description, i.severity, i.status,
+                    i.datetime_reported, i.datetime_acknowledged, i.datetime_closed, i.datetime_updated,
+                    i.authority_id, i.subzone_id, i.planning_area_id, i.is_public,
+                    fp.post_id,
+                    fp.created_at,
+                    COALESCE(fp.like_count, 0) AS post_likes,
+                    COALESCE(fp.dislike_count, 0) AS post_dislikes,
+                    COALESCE(fp.comment_count, 0) AS comment_count,
+                    COALESCE(cm.comments, '[]'::json) AS comments,
+                    ima.image_url
                 FROM issues i
-                LEFT JOIN forum_posts fp ON i.issue_id = fp.issue_id
-                LEFT JOIN comments c ON fp.post_id = c.post_id
-                LEFT JOIN post_votes pv ON fp.post_id = pv.post_id
-                LEFT JOIN comment_votes cv ON c.comment_id = cv.comment_id
-                WHERE ST_DWithin(i.location, ST_MakePoint(%s, %s)::geography, %s)
-                ORDER BY i.issue_id, fp.post_id, c.comment_id
+                LEFT JOIN LATERAL (
+                    -- The medium variant once rendered (services/media/derivatives.py), the original until then
+                    SELECT COALESCE(metadata #>> '{{variants,medium,file_path}}', file_path) AS image_url
+                    FROM issue_media_assets
+                    WHERE issue_id = i.issue_id AND media_type = 'image'
+                    ORDER BY issue_media_id
+                    LIMIT 1
+                ) ima ON true
+                LEFT JOIN LATERAL (
+                    SELECT post_id, created_at, like_count, dislike_count, comment_count FROM forum_posts
+                    WHERE issue_id = i.issue_id
+                    ORDER BY post_id
+                    LIMIT 1
+                ) fp ON true
+                LEFT JOIN LATERAL (
+                    SELECT json_agg(json_build_object(
+                        'comment_id', c.comment_id,
+                        'parent_comment_id', c.parent_comment_id,
+                        'content', c.content,
+                        'comment_created_at', c.created_at,
+                        'comment_likes', c.like_count,
+                        'comment_dislikes', c.dislike_count
+                    ) ORDER BY c.comment_id) AS comments
+                    FROM (
+                        SELECT comment_id, parent_comment_id, content, created_at, like_count, dislike_count FROM comments
+                        WHERE post_id = fp.post_id
+                        ORDER BY comment_id
+                        LIMIT %s
+                    ) c
+                ) cm ON true
+                WHERE ST_DWithin(i.location, {POINT_SQL}, %s)
+                ORDER BY i.issue_id
                 """,
-                (lon, lat, radius)
+                (comment_limit, lon, lat, radius),
+                prepare=True
             )
             rows = await cur.fetchall()
-            return rows
+
+    for row in rows:
+        comments = row["comments"]
+        row["next_comment_after"] = comments[-1]["comment_id"] if len(comments) < row["comment_count"] else None
+    return rows
+
+
+async def issue_exists(resources: Resources, issue_id: int) -> bool:
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT 1 FROM issues WHERE issue_id = %s AND is_deleted IS NOT TRUE",
+                (issue_id,)
+            )
+            return await cur.fetchone() is not None
 
 
 async def create_issue(resources: Resources, issue: IssueReport):
@@ -160,17 +622,19 @@ async def create_issue(resources: Resources, issue: IssueReport):
             await cur.execute(
                 """
                 INSERT INTO issues (
-                    userid, latitude, longitude, address, description,
+                    user_id, latitude, longitude, address, description,
                     severity, status, datetime_reported, datetime_updated,
                     authority_id, subzone_id, planning_area_id, is_public
                 )
                 VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                    %s, %s, %s, %s, %s, %s, %s,
+                    COALESCE(%s, CURRENT_TIMESTAMP), COALESCE(%s, CURRENT_TIMESTAMP),
+                    %s, %s, %s, %s
                 )
                 RETURNING issue_id
                 """,
                 (
-                    issue["userid"], issue["latitude"], issue["longitude"], issue["address"],
+                    issue.get("user_id"), issue["latitude"], issue["longitude"], issue["address"],
                     issue["description"], issue["severity"], issue.get("status", "Reported"),
                     issue.get("datetime_reported"), issue.get("datetime_updated"), issue.get("authority_id"), 
                     issue.get("subzone_id"), issue.get("planning_area_id"), issue.get("is_public", True)
@@ -195,6 +659,178 @@ async def create_issue(resources: Resources, issue: IssueReport):
             return {"issue_id": issue_id}
 
 
+BULK_ISSUE_COLUMNS = [
+    "row_no", "user_id", "latitude", "longitude", "address", "description", "severity", "status",
+    "datetime_reported", "datetime_acknowledged", "datetime_closed", "datetime_updated",
+    "authority_id", "subzone_id", "planning_area_id", "is_public", "issue_type_ids", "issue_subtype_ids"
+]
+
+
+async def bulk_create_issues(resources: Resources, rows: list[dict]) -> dict:
+    """
+    {
+        "inserted": <integer>,
+        "issue_ids": [<integer>, ...],
+        "errors": [{"row": <integer>, "error": <string>}, ...]
+    }
+
+    Loads validated issue rows (each carrying a "row_no") with COPY into a temporary staging table,
+    resolves missing subzone/planning area by spatial join, checks references set-wise and then
+    inserts issues and their category mappings with one statement each.
+    """
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            # Staging spans the three transactions below, so it is dropped explicitly rather than on commit
+            await cur.execute("DROP TABLE IF EXISTS pg_temp.issues_staging")
+            await cur.execute("""
+                CREATE TEMP TABLE issues_staging (
+                    row_no INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    latitude DOUBLE PRECISION,
+                    longitude DOUBLE PRECISION,
+                    address TEXT,
+                    description TEXT,
+                    severity VARCHAR(50),
+                    status VARCHAR(50),
+                    datetime_reported TIMESTAMP,
+                    datetime_acknowledged TIMESTAMP,
+                    datetime_closed TIMESTAMP,
+                    datetime_updated TIMESTAMP,
+                    authority_id INTEGER,
+                    subzone_id INTEGER,
+                    planning_area_id INTEGER,
+                    is_public BOOLEAN,
+                    issue_type_ids INTEGER[],
+                    issue_subtype_ids INTEGER[],
+                    issue_id INTEGER,
+                    error TEXT
+                )
+            """)
+
+            async with cur.copy(f"COPY issues_staging ({', '.join(BULK_ISSUE_COLUMNS)}) FROM STDIN") as copy:
+                for row in rows:
+                    await copy.write_row([row.get(column) for column in BULK_ISSUE_COLUMNS])
+
+            # Geo-tag rows that came without a subzone
+            await cur.execute("""
+                UPDATE issues_staging s
+                SET subzone_id = sz.subzone_id,
+                    planning_area_id = COALESCE(s.planning_area_id, sz.planning_area_id)
+                FROM subzones sz
+                WHERE s.subzone_id IS NULL
+                  AND ST_Covers(sz.geom, ST_SetSRID(ST_MakePoint(s.longitude, s.latitude), 4326)::geography)
+            """)
+            await cur.execute("""
+                UPDATE issues_staging s
+                SET planning_area_id = sz.planning_area_id
+                FROM subzones sz
+                WHERE s.planning_area_id IS NULL AND s.subzone_id = sz.subzone_id
+            """)
+
+            # Reference checks, first failure per row wins
+            await cur.execute("""
+                UPDATE issues_staging s
+                SET error = CASE
+                    WHEN s.user_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = s.user_id)
+                        THEN 'Unknown user_id'
+                    WHEN s.authority_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM authorities a WHERE a.authority_id = s.authority_id)
+                        THEN 'Unknown authority_id'
+                    WHEN COALESCE(s.datetime_updated, CURRENT_TIMESTAMP) < COALESCE(s.datetime_reported, CURRENT_TIMESTAMP)
+                        THEN 'datetime_updated is before datetime_reported'
+                    WHEN s.subzone_id IS NULL
+                        THEN 'Location is not inside any subzone'
+                    WHEN NOT EXISTS (SELECT 1 FROM subzones sz WHERE sz.subzone_id = s.subzone_id)
+                        THEN 'Unknown subzone_id'
+                    WHEN EXISTS (
+                        SELECT 1 FROM unnest(s.issue_type_ids) t(issue_type_id)
+                        WHERE NOT EXISTS (SELECT 1 FROM issue_types it WHERE it.issue_type_id = t.issue_type_id)
+                    ) THEN 'Unknown issue_type_id'
+                    WHEN EXISTS (
+                        SELECT 1 FROM unnest(s.issue_subtype_ids) t(issue_subtype_id)
+                        WHERE NOT EXISTS (SELECT 1 FROM issue_subtypes isc WHERE isc.issue_subtype_id = t.issue_subtype_id)
+                    ) THEN 'Unknown issue_subtype_id'
+                END
+            """)
+
+            # Make sure every reported month has its partition instead of piling into issues_default.
+            # Staging is committed first and the DDL commits on its own, so its lock on issues is
+            # released before the import transaction starts.
+            await cur.execute("""
+                SELECT MIN(COALESCE(datetime_reported, CURRENT_TIMESTAMP))::date AS range_from,
+                       MAX(COALESCE(datetime_reported, CURRENT_TIMESTAMP))::date AS range_to
+                FROM issues_staging
+                WHERE error IS NULL
+            """)
+            reported_range = await cur.fetchone()
+            await conn.commit()
+            if reported_range["range_from"] is not None:
+                await cur.execute(
+                    "SELECT create_monthly_partitions('issues', %s, %s)",
+                    (reported_range["range_from"], reported_range["range_to"])
+                )
+                await conn.commit()
+
+            # Skip the per-row vectorstore webhook, the caller indexes the returned issue_ids in one call
+            await cur.execute("SET LOCAL hualaowei.skip_issue_webhook = 'on'")
+
+            # Allocate ids up front so the mappings can be inserted set-wise
+            await cur.execute("""
+                UPDATE issues_staging
+                SET issue_id = nextval(pg_get_serial_sequence('issues', 'issue_id'))
+                WHERE error IS NULL
+            """)
+
+            await cur.execute("""
+                INSERT INTO issues (
+                    issue_id, user_id, latitude, longitude, address, description,
+                    severity, status, datetime_reported, datetime_acknowledged, datetime_closed, datetime_updated,
+                    authority_id, subzone_id, planning_area_id, is_public
+                )
+                SELECT issue_id, user_id, latitude, longitude, address, description,
+                       severity, COALESCE(status, 'Reported'), COALESCE(datetime_reported, CURRENT_TIMESTAMP),
+                       datetime_acknowledged, datetime_closed, COALESCE(datetime_updated, CURRENT_TIMESTAMP),
+                       authority_id, subzone_id, planning_area_id, COALESCE(is_public, TRUE)
+                FROM issues_staging
+                WHERE error IS NULL
+                ORDER BY row_no
+                RETURNING issue_id
+            """)
+            issue_ids = [row["issue_id"] for row in await cur.fetchall()]
+
+            await cur.execute("""
+                INSERT INTO issue_type_to_issue_mapping (issue_id, issue_type_id)
+                SELECT DISTINCT s.issue_id, t.issue_type_id
+                FROM issues_staging s
+                CROSS JOIN LATERAL unnest(s.issue_type_ids) t(issue_type_id)
+                WHERE s.error IS NULL
+            """)
+            await cur.execute("""
+                INSERT INTO issue_subtype_to_issue_mapping (issue_id, issue_subtype_id)
+                SELECT DISTINCT s.issue_id, t.issue_subtype_id
+                FROM issues_staging s
+                CROSS JOIN LATERAL unnest(s.issue_subtype_ids) t(issue_subtype_id)
+                WHERE s.error IS NULL
+            """)
+
+            await cur.execute("SELECT row_no AS row, error FROM issues_staging WHERE error IS NOT NULL ORDER BY row_no")
+            errors = await cur.fetchall()
+            await cur.execute("DROP TABLE issues_staging")
+
+    return {"inserted": len(issue_ids), "issue_ids": issue_ids, "errors": errors}
+
+
+async def get_issue_webhook_url(resources: Resources) -> str | None:
+    """
+    The vectorstore indexing webhook call_issue_webhook() posts to, None when not configured.
+    """
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute("SELECT value FROM system_config WHERE key = 'webhook.issue.url'")
+            row = await cur.fetchone()
+            url = row["value"] if row else None
+            return url if url and url.startswith("http") else None
+
+
 async def get_daily_issue_counts_by_subzone(
     resources: Resources,
     days: int,
@@ -203,67 +839,220 @@ async def get_daily_issue_counts_by_subzone(
     authority_name: Optional[str] = None,
     subzone_name: Optional[str] = None
 ):
+    """
+    [
+        {"date": <iso date>, "count": <integer>},   # today first, one entry per day
+        ...
+    ]
+
+    Every issue is counted once. Reads from the trigger-maintained daily_issue_counts rollup,
+    which holds one count per category. Summing several categories there would count an issue
+    mapped to more than one of them repeatedly, so filters naming more than one type or subtype
+    count distinct issues on issues instead.
+    """
     today = date.today()
     start_date = today - timedelta(days=days - 1)
 
-    filters = ["i.datetime_reported::date >= %s"]
-    values = [start_date]
+    single_category = (not issue_subtypes and len(issue_types or []) <= 1) or (len(issue_subtypes or []) == 1 and not issue_types)
+    if not single_category:
+        return await count_daily_issues(resources, start_date, today, issue_types, issue_subtypes, authority_name, subzone_name)
 
-    if issue_types:
-        placeholders = ','.join(['%s'] * len(issue_types))
-        filters.append(f"""EXISTS (
-            SELECT 1 FROM issue_type_to_issue_mapping itim
-            JOIN issue_types it ON itim.issue_type_id = it.issue_type_id
-            WHERE itim.issue_id = i.issue_id AND it.name IN ({placeholders})
-        )""")
-        values.extend(issue_types)
+    filters, values = [], []
 
     if issue_subtypes:
-        placeholders = ','.join(['%s'] * len(issue_subtypes))
-        filters.append(f"""EXISTS (
-            SELECT 1 FROM issue_subtype_to_issue_mapping iscm
-            JOIN issue_subtypes isc ON iscm.issue_subtype_id = isc.issue_subtype_id
-            WHERE iscm.issue_id = i.issue_id AND isc.name IN ({placeholders})
-        )""")
-        values.extend(issue_subtypes)
+        filters.append("dic.issue_subtype_id IN (SELECT issue_subtype_id FROM issue_subtypes WHERE name = ANY(%s))")
+        values.append(issue_subtypes)
+        if issue_types:
+            filters.append("dic.issue_type_id IN (SELECT issue_type_id FROM issue_types WHERE name = ANY(%s))")
+            values.append(issue_types)
+    elif issue_types:
+        filters.append("dic.issue_subtype_id IS NULL")
+        filters.append("dic.issue_type_id IN (SELECT issue_type_id FROM issue_types WHERE name = ANY(%s))")
+        values.append(issue_types)
+    else:
+        filters.append("dic.issue_type_id IS NULL AND dic.issue_subtype_id IS NULL")
 
     if authority_name:
-        filters.append("auth.name = %s")
+        filters.append("dic.authority_id IN (SELECT authority_id FROM authorities WHERE name = %s)")
         values.append(authority_name)
 
     if subzone_name:
-        filters.append("sz.name = %s")
+        filters.append("dic.subzone_id = (SELECT subzone_id FROM subzones WHERE name = %s)")
         values.append(subzone_name)
 
-    where_clause = "WHERE " + " AND ".join(filters)
+    join_clause = " AND ".join(filters)
 
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 f"""
                 SELECT 
-                    i.datetime_reported::date AS date, 
-                    COUNT(*) AS count
-                FROM issues i
-                LEFT JOIN authorities auth ON i.authority_id = auth.authority_id
-                LEFT JOIN subzones sz ON i.subzone_id = sz.subzone_id
-                {where_clause}
-                GROUP BY date
-                ORDER BY date DESC
+                    d.day::date AS date, 
+                    COALESCE(SUM(dic.count), 0)::integer AS count
+                FROM generate_series(%s::date, %s::date, interval '1 day') AS d(day)
+                LEFT JOIN daily_issue_counts dic ON dic.date = d.day::date AND {join_clause}
+                GROUP BY d.day
+                ORDER BY d.day DESC
+                """,
+                (start_date, today, *values)
+            )
+            rows = await cur.fetchall()
+
+    return [{"date": row["date"].isoformat(), "count": row["count"]} for row in rows]
+
+
+async def count_daily_issues(
+    resources: Resources,
+    start_date: date,
+    end_date: date,
+    issue_types: Optional[list[str]] = None,
+    issue_subtypes: Optional[list[str]] = None,
+    authority_name: Optional[str] = None,
+    subzone_name: Optional[str] = None
+):
+    """
+    Same result as get_daily_issue_counts_by_subzone, counted on issues: an issue matches when it
+    is mapped to any of the types and any of the subtypes, and counts once however many it hits.
+    """
+    filters, values = [], []
+
+    if issue_types:
+        filters.append("i.issue_type_ids && ARRAY(SELECT it.issue_type_id FROM issue_types it WHERE it.name = ANY(%s))")
+        values.append(issue_types)
+
+    if issue_subtypes:
+        filters.append("i.issue_subtype_ids && ARRAY(SELECT isc.issue_subtype_id FROM issue_subtypes isc WHERE isc.name = ANY(%s))")
+        values.append(issue_subtypes)
+
+    if authority_name:
+        filters.append("i.authority_id IN (SELECT authority_id FROM authorities WHERE name = %s)")
+        values.append(authority_name)
+
+    if subzone_name:
+        filters.append("i.subzone_id = (SELECT subzone_id FROM subzones WHERE name = %s)")
+        values.append(subzone_name)
+
+    # Constant bounds on datetime_reported as well, so only the partitions of the window are scanned
+    join_clause = " AND ".join([
+        "i.datetime_reported >= %s", "i.datetime_reported < %s",
+        "i.datetime_reported >= d.day", "i.datetime_reported < d.day + interval '1 day'",
+        *filters
+    ])
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                f"""
+                SELECT
+                    d.day::date AS date,
+                    COUNT(i.issue_id)::integer AS count
+                FROM generate_series(%s::date, %s::date, interval '1 day') AS d(day)
+                LEFT JOIN issues i ON {join_clause}
+                GROUP BY d.day
+                ORDER BY d.day DESC
                 """,
-                tuple(values)
+                (start_date, end_date, start_date, end_date + timedelta(days=1), *values)
             )
             rows = await cur.fetchall()
 
-    # Fill missing dates with 0
-    result_map = {row["date"]: row["count"] for row in rows}
-    result = []
-    for i in range(days):
-        day = today - timedelta(days=i)
-        result.append({
-            "date": day.isoformat(),
-            "count": result_map.get(day, 0)
-        })
+    return [{"date": row["date"].isoformat(), "count": row["count"]} for row in rows]
+
+
+MAX_DAILY_SERIES = 200
+MAX_DAILY_DAYS = 366
+
+
+async def get_daily_issue_count_matrix(
+    resources: Resources,
+    subzone_names: list[str],
+    start_date: date,
+    end_date: date,
+    issue_types: Optional[list[str]] = None
+):
+    """
+    {
+        "dates": [<iso date>, ...],                 # oldest first
+        "series": [
+            {"subzone_name": <string>, "type_name": <string or None>, "counts": [<integer>, ...]},
+            ...
+        ]
+    }
+
+    One series per subzone, or per (subzone, type) when types are given, in request order.
+    Every series has one count per date. The whole matrix comes from daily_issue_counts
+    in one statement: generate_series supplies the dense date axis, GROUP BY the series.
+    """
+    subzone_names = list(dict.fromkeys(subzone_names))
+    issue_types = list(dict.fromkeys(issue_types)) if issue_types else None
+
+    if not subzone_names:
+        raise ValueError("At least one subzone is required.")
+    if end_date < start_date:
+        raise ValueError("to must not be before from.")
+    if (end_date - start_date).days + 1 > MAX_DAILY_DAYS:
+        raise ValueError(f"Date window must not exceed {MAX_DAILY_DAYS} days.")
+    if len(subzone_names) * len(issue_types or [None]) > MAX_DAILY_SERIES:
+        raise ValueError(f"At most {MAX_DAILY_SERIES} series (subzones x types) per request.")
+
+    if issue_types:
+        type_keys = """
+            SELECT it.issue_type_id, it.name AS type_name, k.ord
+            FROM unnest(%s::text[]) WITH ORDINALITY AS k(name, ord)
+            JOIN issue_types it ON it.name = k.name
+        """
+        type_filter = "dic.issue_type_id IN (SELECT issue_type_id FROM type_keys)"
+        type_values = [issue_types]
+    else:
+        # The all-issues level of the rollup
+        type_keys = "SELECT NULL::integer AS issue_type_id, NULL::text AS type_name, 1::bigint AS ord"
+        type_filter = "dic.issue_type_id IS NULL"
+        type_values = []
+
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                f"""
+                WITH subzone_keys AS (
+                    SELECT sz.subzone_id, sz.name AS subzone_name, k.ord
+                    FROM unnest(%s::text[]) WITH ORDINALITY AS k(name, ord)
+                    JOIN subzones sz ON sz.name = k.name
+                ),
+                type_keys AS ({type_keys}),
+                counts AS (
+                    SELECT dic.date, dic.subzone_id, dic.issue_type_id, SUM(dic.count)::integer AS count
+                    FROM daily_issue_counts dic
+                    WHERE dic.subzone_id IN (SELECT subzone_id FROM subzone_keys)
+                      AND {type_filter}
+                      AND dic.issue_subtype_id IS NULL
+                      AND dic.date BETWEEN %s AND %s
+                    GROUP BY dic.date, dic.subzone_id, dic.issue_type_id
+                )
+                SELECT sk.subzone_name, tk.type_name,
+                       array_agg(COALESCE(c.count, 0) ORDER BY d.day) AS counts
+                FROM subzone_keys sk
+                CROSS JOIN type_keys tk
+                CROSS JOIN generate_series(%s::date, %s::date, interval '1 day') AS d(day)
+                LEFT JOIN counts c
+                       ON c.date = d.day::date
+                      AND c.subzone_id = sk.subzone_id
+                      AND c.issue_type_id IS NOT DISTINCT FROM tk.issue_type_id
+                GROUP BY sk.ord, sk.subzone_name, tk.ord, tk.type_name
+                ORDER BY sk.ord, tk.ord
+                """,
+                (subzone_names, *type_values, start_date, end_date, start_date, end_date)
+            )
+            rows = await cur.fetchall()
 
-    return result
+    unknown_subzones = set(subzone_names) - {row["subzone_name"] for row in rows}
+    if unknown_subzones:
+        raise ValueError(f"Unknown subzones: {', '.join(sorted(unknown_subzones))}")
+    if issue_types:
+        unknown_types = set(issue_types) - {row["type_name"] for row in rows}
+        if unknown_types:
+            raise ValueError(f"Unknown issue types: {', '.join(sorted(unknown_types))}")
 
+    days = (end_date - start_date).days + 1
+    return {
+        "dates": [(start_date + timedelta(days=offset)).isoformat() for offset in range(days)],
+        "series": rows
+    }
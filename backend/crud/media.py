@@ -1,34 +1,294 @@
 import io
+import asyncio
+import hashlib
+import functools
 import mimetypes
+from datetime import timedelta
+from typing import BinaryIO
+from urllib.parse import urlparse
+from minio.commonconfig import CopySource
+from minio.error import S3Error
 from backend.data_stores.resources import Resources
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
 from config.config import config
 
-async def map_media_to_issue(resources: Resources, issue_id: int, media_type: str, file_path: str, metadata: dict | None = None):
+OS_CONFIG = config.data_stores.object_storage
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+async def map_media_to_issue(resources: Resources, issue_id: int, media_type: str, file_path: str, metadata: dict | None = None, sha256: str | None = None):
+    """
+    Attach media to an issue. Content-addressed media (sha256 given) is attached once per
+    issue, attaching the same file again is a no-op.
+    """
     async with resources.db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
-                "INSERT INTO issue_media_assets (issue_id, media_type, file_path, metadata) VALUES (%s, %s, %s, %s)",
-                (issue_id, media_type, file_path, metadata)
+                """
+                INSERT INTO issue_media_assets (issue_id, media_type, file_path, metadata, sha256)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (issue_id, sha256) DO NOTHING
+                """,
+                (issue_id, media_type, file_path, Jsonb(metadata) if metadata is not None else None, sha256)
             )
 
-async def upload_file_to_os(resources: Resources, bucket_name: str, object_name: str, data: bytes) -> str: 
-    stream = io.BytesIO(data)
+# --------------------------------------------------------
+# Content-addressed media objects
+# --------------------------------------------------------
+
+def content_object_name(sha256: str, extension: str) -> str:
+    # Two-character fan-out keeps listings of the media prefix manageable
+    return f"media/{sha256[:2]}/{sha256}{extension}"
+
+def hash_stream(stream: BinaryIO) -> tuple[str, int]:
+    """
+    (sha256 hex digest, size) of a stream read from its current position in fixed-size chunks.
+    Blocking, run it through run_os_call.
+    """
+    digest, size = hashlib.sha256(), 0
+    while chunk := stream.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+async def get_media_object(resources: Resources, sha256: str) -> dict | None:
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute("SELECT * FROM media_objects WHERE sha256 = %s", (sha256,))
+            return await cur.fetchone()
+
+async def register_media_object(resources: Resources, sha256: str, bucket_name: str, object_name: str, content_type: str, size: int):
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO media_objects (sha256, bucket_name, object_name, content_type, size)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (sha256) DO NOTHING
+                """,
+                (sha256, bucket_name, object_name, content_type, size)
+            )
+
+async def set_media_derived(resources: Resources, sha256: str, key: str, value):
+    """
+    Cache the result of per-image work (variants, EXIF, VLM output...) under the image's content hash.
+    """
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "UPDATE media_objects SET derived = derived || jsonb_build_object(%s::text, %s::jsonb) WHERE sha256 = %s",
+                (key, Jsonb(value), sha256)
+            )
+
+async def store_media_stream(resources: Resources, bucket_name: str, stream: BinaryIO, content_type: str) -> dict:
+    """
+    {"sha256": <string>, "object_name": <string>, "file_path": <string>, "size": <integer>, "content_type": <string>, "deduplicated": <bool>}
+
+    Store a seekable stream under its SHA-256 content address. The stream is hashed in one pass,
+    and only uploaded (in a second pass) when no object with that content exists yet.
+    """
+    start = stream.tell()
+    sha256, size = await run_os_call(resources, hash_stream, stream)
+    stream.seek(start)
+
+    existing = await get_media_object(resources, sha256)
+    if existing:
+        return {
+            "sha256": sha256, "object_name": existing["object_name"], "size": existing["size"],
+            "file_path": object_url(resources, existing["bucket_name"], existing["object_name"]),
+            "content_type": existing["content_type"], "deduplicated": True
+        }
+
+    object_name = content_object_name(sha256, mimetypes.guess_extension(content_type) or "")
+    file_path = await upload_stream_to_os(resources, bucket_name, object_name, stream, length=size, content_type=content_type)
+    await register_media_object(resources, sha256, bucket_name, object_name, content_type, size)
+    return {
+        "sha256": sha256, "object_name": object_name, "file_path": file_path, "size": size,
+        "content_type": content_type, "deduplicated": False
+    }
+
+async def hash_object_in_os(resources: Resources, bucket_name: str, object_name: str) -> str:
+    def hash_object():
+        response = resources.os_client.get_object(bucket_name, object_name)
+        try:
+            return hash_stream(response)[0]
+        finally:
+            response.close()
+            response.release_conn()
+
+    return await run_os_call(resources, hash_object)
+
+def object_url(resources: Resources, bucket_name: str, object_name: str) -> str:
+    file_url = f"http://{resources.os_client._endpoint_url}/{bucket_name}/{object_name}"
+    return file_url
+
+def object_location(file_path: str) -> tuple[str, str]:
+    """
+    (bucket_name, object_name) of a file_path built by object_url.
+    """
+    bucket_name, _, object_name = urlparse(file_path).path.lstrip("/").partition("/")
+    return bucket_name, object_name
+
+# A claim older than this is assumed to belong to a worker that died mid-way
+DERIVATIVE_CLAIM_TIMEOUT_MINUTES = 10
+
+async def get_media_pending_derivatives(resources: Resources, limit: int) -> list[int]:
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT issue_media_id FROM issue_media_assets
+                WHERE media_type = 'image' AND (metadata IS NULL OR NOT metadata ? 'variants')
+                  AND (metadata->>'variants_claimed_at' IS NULL
+                       OR (metadata->>'variants_claimed_at')::timestamptz < NOW() - make_interval(mins => %s))
+                ORDER BY issue_media_id
+                LIMIT %s
+                """,
+                (DERIVATIVE_CLAIM_TIMEOUT_MINUTES, limit)
+            )
+            return [row[0] for row in await cur.fetchall()]
+
+async def claim_media_for_derivatives(resources: Resources, issue_media_id: int) -> dict | None:
+    """
+    Mark an image as being processed, so only one worker renders it. None if it already has
+    variants or another worker claimed it recently.
+    """
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                UPDATE issue_media_assets
+                SET metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('variants_claimed_at', NOW())
+                WHERE issue_media_id = %s
+                  AND media_type = 'image'
+                  AND (metadata IS NULL OR NOT metadata ? 'variants')
+                  AND (metadata->>'variants_claimed_at' IS NULL
+                       OR (metadata->>'variants_claimed_at')::timestamptz < NOW() - make_interval(mins => %s))
+                RETURNING issue_media_id, issue_id, file_path, metadata, sha256
+                """,
+                (issue_media_id, DERIVATIVE_CLAIM_TIMEOUT_MINUTES)
+            )
+            return await cur.fetchone()
+
+async def release_media_claim(resources: Resources, issue_media_id: int, error: str) -> int:
+    """
+    Give up a claim after a failed render so the image is picked up again, counting the attempt.
+    Returns the number of failed attempts so far.
+    """
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                UPDATE issue_media_assets
+                SET metadata = (COALESCE(metadata, '{}'::jsonb) - 'variants_claimed_at') || jsonb_build_object(
+                    'variants_attempts', COALESCE((metadata->>'variants_attempts')::integer, 0) + 1,
+                    'variants_last_error', %s::text
+                )
+                WHERE issue_media_id = %s
+                RETURNING (metadata->>'variants_attempts')::integer
+                """,
+                (error, issue_media_id)
+            )
+            row = await cur.fetchone()
+            return row[0] if row else 0
+
+async def record_media_variants(resources: Resources, issue_media_id: int, variants: dict, error: str | None = None):
+    """
+    Store the rendered variants ({<name>: {"file_path", "width", "height", "size", "content_type"}})
+    in the image's metadata. An error is recorded with empty variants so the image is not retried.
+    """
+    extra = {"variants": variants}
+    if error:
+        extra["variants_error"] = error
+    async with resources.db_client.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                UPDATE issue_media_assets
+                SET metadata = (COALESCE(metadata, '{}'::jsonb) - 'variants_claimed_at') || %s
+                WHERE issue_media_id = %s
+                """,
+                (Jsonb(extra), issue_media_id)
+            )
 
+async def run_os_call(resources: Resources, func, *args, **kwargs):
+    # Blocking MinIO calls go to the bounded object storage thread pool, never the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(resources.os_executor, functools.partial(func, *args, **kwargs))
+
+async def upload_stream_to_os(resources: Resources, bucket_name: str, object_name: str, stream: BinaryIO, length: int = -1, content_type: str | None = None) -> str:
+    """
+    Stream a file-like object (e.g. UploadFile.file) to object storage from its current position.
+
+    With length -1 MinIO reads upload_part_size bytes at a time and sends anything larger as a
+    multipart upload, so memory per upload stays at one part whatever the file size.
+    """
     # Automatically detect content_type from object_name
-    content_type, _ = mimetypes.guess_type(object_name)
+    if content_type is None:
+        content_type, _ = mimetypes.guess_type(object_name)
     if content_type is None:
         content_type = "application/octet-stream"  # fallback if unknown
 
-    resources.os_client.put_object(
+    await run_os_call(
+        resources,
+        resources.os_client.put_object,
         bucket_name,
         object_name,
-        data=stream,  
-        length=len(data),
-        content_type=content_type
+        data=stream,
+        length=length,
+        content_type=content_type,
+        part_size=OS_CONFIG.upload_part_size
     )
-    file_url = f"http://{resources.os_client._endpoint_url}/{bucket_name}/{object_name}"
-    return file_url
+    return object_url(resources, bucket_name, object_name)
+
+async def upload_file_to_os(resources: Resources, bucket_name: str, object_name: str, data: bytes) -> str: 
+    return await upload_stream_to_os(resources, bucket_name, object_name, io.BytesIO(data), length=len(data))
+
+async def copy_object_in_os(resources: Resources, bucket_name: str, source_name: str, object_name: str, source_etag: str | None = None):
+    """
+    Server-side copy within a bucket. With source_etag the copy fails unless the source is still
+    exactly that version.
+    """
+    source = CopySource(bucket_name, source_name, match_etag=source_etag)
+    await run_os_call(resources, resources.os_client.copy_object, bucket_name, object_name, source)
 
 async def delete_file_from_os(resources: Resources, bucket_name: str, object_name: str):
-    resources.os_client.remove_object(bucket_name, object_name)
+    await run_os_call(resources, resources.os_client.remove_object, bucket_name, object_name)
+
+def presign_upload_url(resources: Resources, bucket_name: str, object_name: str, expires: timedelta) -> str:
+    # Signed locally for the public endpoint, see object_storage.py
+    return resources.os_presign_client.presigned_put_object(bucket_name, object_name, expires=expires)
+
+async def stat_object_in_os(resources: Resources, bucket_name: str, object_name: str):
+    """
+    The stored object's metadata (size, content_type, etag...), or None if it does not exist.
+    """
+    try:
+        return await run_os_call(resources, resources.os_client.stat_object, bucket_name, object_name)
+    except S3Error as e:
+        if e.code in {"NoSuchKey", "NoSuchObject"}:
+            return None
+        raise
+
+async def read_object_from_os(resources: Resources, bucket_name: str, object_name: str) -> bytes:
+    def read_object():
+        response = resources.os_client.get_object(bucket_name, object_name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    return await run_os_call(resources, read_object)
+
+async def read_object_head_from_os(resources: Resources, bucket_name: str, object_name: str, length: int) -> bytes:
+    def read_head():
+        response = resources.os_client.get_object(bucket_name, object_name, offset=0, length=length)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    return await run_os_call(resources, read_head)
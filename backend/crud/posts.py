@@ -6,7 +6,10 @@ async def like_post(resources: Resources, user_id: int, post_id: int):
     async with resources.db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
-                "INSERT INTO post_votes (user_id, post_id) VALUES (%s, %s)",
+                """
+                INSERT INTO post_votes (user_id, post_id, vote_type) VALUES (%s, %s, 1)
+                ON CONFLICT (user_id, post_id) DO UPDATE SET vote_type = EXCLUDED.vote_type
+                """,
                 (user_id, post_id)
             )
 
@@ -19,17 +22,17 @@ async def create_post(resources: Resources, user_id: int, issue_id: int):
             )
 
 async def count_post_likes(resources: Resources, post_id: int):
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
-                "SELECT COUNT(*) FROM post_votes WHERE post_id = %s",
+                "SELECT like_count FROM forum_posts WHERE post_id = %s",
                 (post_id,)
             )
             result = await cur.fetchone()
-            return result["count"]
+            return result["like_count"] if result else 0
 
 async def get_forum_posts(resources: Resources, user_lat: float, user_lon: float, radius_meters: int = 2000):
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute("""
                 SELECT 
@@ -38,6 +41,9 @@ async def get_forum_posts(resources: Resources, user_lat: float, user_lon: float
                     fp.user_id,
                     fp.title,
                     fp.created_at,
+                    fp.like_count,
+                    fp.dislike_count,
+                    fp.comment_count,
                     i.latitude,
                     i.longitude,
                     i.severity,
@@ -47,7 +53,8 @@ async def get_forum_posts(resources: Resources, user_lat: float, user_lon: float
                 FROM forum_posts fp
                 JOIN issues i ON fp.issue_id = i.issue_id
                 LEFT JOIN LATERAL (
-                    SELECT file_path
+                    -- The list thumbnail once rendered (services/media/derivatives.py), the original until then
+                    SELECT COALESCE(metadata #>> '{variants,thumb,file_path}', file_path) AS file_path
                     FROM issue_media_assets
                     WHERE issue_id = i.issue_id AND media_type = 'image'
                     ORDER BY issue_media_id ASC
@@ -62,5 +69,5 @@ async def get_forum_posts(resources: Resources, user_lat: float, user_lon: float
                         ST_MakePoint(%s, %s)::geography,
                         %s
                     )
-            """, (user_lon, user_lat, radius_meters))
+            """, (user_lon, user_lat, radius_meters), prepare=True)
             return await cur.fetchall()
@@ -2,7 +2,7 @@ from backend.data_stores.resources import Resources
 from psycopg.rows import dict_row
 
 async def get_region_from_lat_lng(resources: Resources, lat: float, lng: float) -> dict | None:
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 """
@@ -30,7 +30,7 @@ async def get_planning_area_info_from_subzone(resources: Resources, params: dict
     {
         "planning_area_id": <integer>,
         "planning_area_name": <string>,
-        "description": <string or None>
+        "planning_area_area_sq_m": <float>
     }
     """
     filters, values = [], []
@@ -40,23 +40,22 @@ async def get_planning_area_info_from_subzone(resources: Resources, params: dict
         values.append(value)
 
     if "subzone_id" in params:
-        add_filter("sz.subzone_id = {}", params["subzone_id"])
+        add_filter("rm.subzone_id = {}", params["subzone_id"])
     elif "subzone_name" in params:
-        add_filter("sz.name = {}", params["subzone_name"])
+        add_filter("rm.subzone_name = {}", params["subzone_name"])
     else:
         raise ValueError("Must provide either 'subzone_id' or 'subzone_name'.")
 
     where_clause = f"WHERE {' AND '.join(filters)}"
 
     query = f"""
-        SELECT pa.planning_area_id, pa.name AS planning_area_name, pa.description
-        FROM subzones sz
-        JOIN planning_areas pa ON sz.planning_area_id = pa.planning_area_id
+        SELECT rm.planning_area_id, rm.planning_area_name, rm.planning_area_area_sq_m
+        FROM region_metadata rm
         {where_clause}
         LIMIT 1
     """
 
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(query, values)
             return await cur.fetchone()
@@ -72,20 +71,20 @@ async def get_planning_area_centroid(resources: Resources, params: dict):
     if "planning_area_id" in params:
         add_filter("planning_area_id = {}", params["planning_area_id"])
     elif "planning_area_name" in params:
-        add_filter("name = {}", params["planning_area_name"])
+        add_filter("planning_area_name = {}", params["planning_area_name"])
     else:
         raise ValueError("Must provide either 'planning_area_id' or 'planning_area_name'.")
 
     where_clause = f"WHERE {' AND '.join(filters)}"
 
     query = f"""
-        SELECT ST_Y(ST_Centroid(geom::geometry)) AS latitude,
-               ST_X(ST_Centroid(geom::geometry)) AS longitude
-        FROM planning_areas
+        SELECT planning_area_latitude AS latitude, planning_area_longitude AS longitude
+        FROM region_metadata
         {where_clause}
+        LIMIT 1
     """
 
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(query, values)
             return await cur.fetchone()
@@ -107,20 +106,19 @@ async def get_subzone_centroid(resources: Resources, params: dict):
     if "subzone_id" in params:
         add_filter("subzone_id = {}", params["subzone_id"])
     elif "subzone_name" in params:
-        add_filter("name = {}", params["subzone_name"])
+        add_filter("subzone_name = {}", params["subzone_name"])
     else:
         raise ValueError("Must provide either 'subzone_id' or 'subzone_name'.")
 
     where_clause = f"WHERE {' AND '.join(filters)}"
 
     query = f"""
-        SELECT ST_Y(ST_Centroid(geom::geometry)) AS latitude,
-               ST_X(ST_Centroid(geom::geometry)) AS longitude
-        FROM subzones
+        SELECT subzone_latitude AS latitude, subzone_longitude AS longitude
+        FROM region_metadata
         {where_clause}
     """
 
-    async with resources.db_client.connection() as conn:
+    async with resources.read_db_client.connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(query, values)
             return await cur.fetchone()
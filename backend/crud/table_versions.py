@@ -0,0 +1,21 @@
+from backend.data_stores.resources import Resources
+from psycopg.rows import dict_row
+
+async def get_table_versions(resources: Resources, table_names: list[str]) -> dict[str, dict]:
+    """
+    {
+        <table_name>: {"table_name": <string>, "version": <integer>, "changed_at": <datetime>},
+        ...
+    }
+
+    Statement-level change counters summed from the table_changes log written by bump_table_version(),
+    missing tables are omitted.
+    """
+    async with resources.read_db_client.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                "SELECT table_name, version, changed_at FROM table_versions WHERE table_name = ANY(%s)",
+                (table_names,),
+                prepare=True
+            )
+            return {row["table_name"]: row for row in await cur.fetchall()}
@@ -1,9 +1,130 @@
+import os
+import time
+import asyncio
+import itertools
+from collections import deque
+from psycopg import AsyncConnection
 from psycopg_pool import AsyncConnectionPool
 from config.config import config
 
 DB_CONFIG = config.data_stores.relational_db
+POOL_CONFIG = DB_CONFIG.pool
 
 dsn = f"postgresql://{DB_CONFIG.user}:{DB_CONFIG.password}@{DB_CONFIG.host}:{DB_CONFIG.port}/{DB_CONFIG.database}"
 
-# Create the AsyncConnectionPool immediately
-db_client = AsyncConnectionPool(conninfo=dsn)
+replica_dsns = [
+    f"postgresql://{replica.user or DB_CONFIG.user}:{replica.password or DB_CONFIG.password}"
+    f"@{replica.host}:{replica.port}/{replica.database or DB_CONFIG.database}"
+    for replica in DB_CONFIG.replicas
+]
+
+# Recent checkouts kept for the latency percentiles in metrics()
+CHECKOUT_SAMPLES = 1024
+
+
+class InstrumentedConnectionPool(AsyncConnectionPool):
+    """
+    AsyncConnectionPool that also times every checkout, so pool sizing can be judged from
+    the latency requests actually see rather than only from the pool's own counters.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.checkout_ms: deque[float] = deque(maxlen=CHECKOUT_SAMPLES)
+        super().__init__(*args, **kwargs)
+
+    async def getconn(self, timeout: float | None = None) -> AsyncConnection:
+        start = time.perf_counter()
+        conn = await super().getconn(timeout)
+        self.checkout_ms.append((time.perf_counter() - start) * 1000)
+        return conn
+
+    def metrics(self) -> dict:
+        """
+        Pool state and cumulative counters for this worker process. Every uvicorn worker has
+        its own pool, so sum in_use/pool_size across workers to size max_connections.
+        """
+        stats = self.get_stats()
+        samples = sorted(self.checkout_ms)
+
+        def percentile(p: float) -> float | None:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3) if samples else None
+
+        requests_num = stats.get("requests_num", 0)
+        return {
+            "pid": os.getpid(),
+            "pool_min": stats.get("pool_min"),
+            "pool_max": stats.get("pool_max"),
+            "pool_size": stats.get("pool_size", 0),
+            "available": stats.get("pool_available", 0),
+            "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+            "requests_waiting": stats.get("requests_waiting", 0),
+            "requests_num": requests_num,
+            "requests_queued": stats.get("requests_queued", 0),
+            "requests_errors": stats.get("requests_errors", 0),
+            "wait_ms_total": stats.get("requests_wait_ms", 0),
+            "wait_ms_avg": round(stats.get("requests_wait_ms", 0) / requests_num, 3) if requests_num else None,
+            "checkout_ms": {
+                "samples": len(samples),
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(samples[-1], 3) if samples else None
+            },
+            "connections_num": stats.get("connections_num", 0),
+            "connections_errors": stats.get("connections_errors", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+            "usage_ms_total": stats.get("usage_ms", 0)
+        }
+
+
+async def configure_connection(conn: AsyncConnection) -> None:
+    # Queries run prepare_threshold times are prepared server-side; hot queries pass prepare=True
+    conn.prepare_threshold = POOL_CONFIG.prepare_threshold
+    conn.prepared_max = POOL_CONFIG.prepared_max
+
+
+class ReplicaPools:
+    """
+    One pool per read replica, checkouts spread round-robin. Quacks like the parts of
+    AsyncConnectionPool the CRUD layer and the lifespan use.
+    """
+
+    def __init__(self, pools: list[InstrumentedConnectionPool]):
+        self.pools = pools
+        self.next_pool = itertools.cycle(pools)
+
+    def connection(self, timeout: float | None = None):
+        return next(self.next_pool).connection(timeout)
+
+    async def open(self, wait: bool = False, timeout: float = 30.0) -> None:
+        await asyncio.gather(*(pool.open(wait=wait, timeout=timeout) for pool in self.pools))
+
+    async def wait(self, timeout: float = 30.0) -> None:
+        await asyncio.gather(*(pool.wait(timeout=timeout) for pool in self.pools))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(pool.close() for pool in self.pools))
+
+    def metrics(self) -> list[dict]:
+        return [pool.metrics() for pool in self.pools]
+
+
+def create_pool(conninfo: str) -> InstrumentedConnectionPool:
+    return InstrumentedConnectionPool(
+        conninfo=conninfo,
+        open=False,
+        configure=configure_connection,
+        min_size=POOL_CONFIG.min_size,
+        max_size=POOL_CONFIG.max_size,
+        timeout=POOL_CONFIG.timeout,
+        max_waiting=POOL_CONFIG.max_waiting,
+        max_lifetime=POOL_CONFIG.max_lifetime,
+        max_idle=POOL_CONFIG.max_idle
+    )
+
+
+def create_replica_client(db_client: InstrumentedConnectionPool) -> ReplicaPools | InstrumentedConnectionPool:
+    # Without replicas, reads share the primary pool
+    if not replica_dsns:
+        return db_client
+    return ReplicaPools([create_pool(replica_dsn) for replica_dsn in replica_dsns])
@@ -1,15 +1,90 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from minio import Minio
+from minio.commonconfig import ENABLED
+from minio.lifecycleconfig import LifecycleConfig, Rule, Expiration, Filter
 from config.config import config
 
+logger = logging.getLogger(__name__)
+
 OS_CONFIG = config.data_stores.object_storage
 
-os_client = Minio(
-    endpoint=OS_CONFIG.endpoint,
-    access_key=OS_CONFIG.access_key,
-    secret_key=OS_CONFIG.secret_key,
-    secure=False
-)
+RECONNECT_DELAY_SECONDS = 5
+
+# Staged media uploads (backend/services/media/service.py) are deleted once completed. Ones never
+# completed are expired by the bucket. One day is the finest expiry S3 lifecycle rules allow,
+# well past the upload URL expiry.
+STAGED_UPLOADS_PREFIX = "uploads/"
+STAGED_UPLOADS_RULE_ID = "expire-staged-uploads"
+STAGED_UPLOADS_EXPIRY_DAYS = 1
+
+
+# Clients are created by Resources.open() in the app lifespan, importing this module touches no network.
+
+def create_os_client() -> Minio:
+    return Minio(
+        endpoint=OS_CONFIG.endpoint,
+        access_key=OS_CONFIG.access_key,
+        secret_key=OS_CONFIG.secret_key,
+        secure=False
+    )
+
+
+def create_os_presign_client() -> Minio:
+    # Presigned URLs are signed for the host clients use, so they come from a client on the public endpoint.
+    # With the region given, presigning is a local computation and never touches the network.
+    return Minio(
+        endpoint=OS_CONFIG.public_endpoint or OS_CONFIG.endpoint,
+        access_key=OS_CONFIG.access_key,
+        secret_key=OS_CONFIG.secret_key,
+        region=OS_CONFIG.region,
+        secure=False
+    )
+
+
+def create_os_executor() -> ThreadPoolExecutor:
+    # The MinIO client is blocking, its calls run here instead of on the event loop.
+    # The pool size bounds concurrent transfers per worker, further uploads queue.
+    return ThreadPoolExecutor(max_workers=OS_CONFIG.max_concurrent_uploads, thread_name_prefix="object-storage")
+
+
+async def ensure_bucket(os_client: Minio, executor: ThreadPoolExecutor) -> None:
+    """
+    Create the bucket if it does not exist, and make sure it expires abandoned staged uploads.
+    """
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(executor, os_client.bucket_exists, OS_CONFIG.bucket_name):
+        await loop.run_in_executor(executor, os_client.make_bucket, OS_CONFIG.bucket_name)
+    await loop.run_in_executor(executor, ensure_staged_uploads_expiry, os_client)
+
+
+def ensure_staged_uploads_expiry(os_client: Minio) -> None:
+    """
+    Add the lifecycle rule expiring STAGED_UPLOADS_PREFIX, keeping any other rules on the bucket.
+    """
+    lifecycle = os_client.get_bucket_lifecycle(OS_CONFIG.bucket_name)
+    rules = [rule for rule in (lifecycle.rules if lifecycle else []) if rule.rule_id != STAGED_UPLOADS_RULE_ID]
+    rules.append(Rule(
+        ENABLED,
+        rule_filter=Filter(prefix=STAGED_UPLOADS_PREFIX),
+        rule_id=STAGED_UPLOADS_RULE_ID,
+        expiration=Expiration(days=STAGED_UPLOADS_EXPIRY_DAYS),
+    ))
+    os_client.set_bucket_lifecycle(OS_CONFIG.bucket_name, LifecycleConfig(rules))
+
 
-# Create the bucket if it does not exist
-if not os_client.bucket_exists(OS_CONFIG.bucket_name):
-    os_client.make_bucket(OS_CONFIG.bucket_name)
+async def ensure_bucket_until_ready(os_client: Minio, executor: ThreadPoolExecutor) -> None:
+    """
+    Retry ensure_bucket until it succeeds, for when storage was not reachable at startup.
+    """
+    while True:
+        try:
+            await ensure_bucket(os_client, executor)
+            logger.info(f"Object storage bucket {OS_CONFIG.bucket_name} ready.")
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Object storage not ready: {str(e)}. Retrying in {RECONNECT_DELAY_SECONDS}s.")
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
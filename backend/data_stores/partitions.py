@@ -0,0 +1,38 @@
+import asyncio
+import logging
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# ensure_monthly_partitions() keeps three months ahead, so a daily run leaves ample slack
+MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+RETRY_DELAY_SECONDS = 60
+
+
+async def ensure_partitions(db_client: AsyncConnectionPool) -> None:
+    async with db_client.connection() as conn:
+        await conn.execute("SELECT ensure_monthly_partitions()")
+
+
+async def compact_table_changes(db_client: AsyncConnectionPool) -> None:
+    async with db_client.connection() as conn:
+        await conn.execute("SELECT compact_table_changes()")
+
+
+async def maintain_partitions(db_client: AsyncConnectionPool) -> None:
+    """
+    Create upcoming monthly partitions of the time-partitioned tables at startup and then
+    daily until cancelled, so new rows never fall into the unpruned default partitions.
+    The same daily run folds the table_changes log behind the ETag versions.
+    """
+    while True:
+        try:
+            await ensure_partitions(db_client)
+            logger.info("Monthly partitions ensured.")
+            await compact_table_changes(db_client)
+            await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {str(e)}. Retrying in {RETRY_DELAY_SECONDS}s.")
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
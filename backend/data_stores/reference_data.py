@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the notify_reference_data_changed() trigger function
+CHANNEL = "reference_data_changed"
+RECONNECT_DELAY_SECONDS = 5
+
+# Tables whose table_versions rows are cached alongside their contents
+VERSIONED_TABLES = ["issue_types", "issue_subtypes", "authorities", "subzones", "planning_areas"]
+
+
+class ReferenceDataCache:
+    """
+    In-process copy of the small, rarely-changing lookup tables (issue types, subtypes,
+    authorities, subzones, planning areas and the precomputed region metadata), indexed by id and by name.
+
+    Loaded once at startup and reloaded whenever Postgres sends a NOTIFY on CHANNEL.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.issue_types_by_id: dict[int, dict] = {}
+        self.issue_types_by_name: dict[str, dict] = {}
+        self.issue_subtypes_by_id: dict[int, dict] = {}
+        self.issue_subtypes_by_name: dict[str, dict] = {}
+        self.authorities_by_id: dict[int, dict] = {}
+        self.authorities_by_type_and_name: dict[tuple[str, str], dict] = {}
+        self.subzones_by_id: dict[int, dict] = {}
+        self.subzones_by_name: dict[str, dict] = {}
+        self.planning_areas_by_id: dict[int, dict] = {}
+        self.planning_areas_by_name: dict[str, dict] = {}
+        self.regions_by_subzone_id: dict[int, dict] = {}
+        self.regions_by_subzone_name: dict[str, dict] = {}
+        self.table_versions: dict[str, dict] = {}
+
+    async def load(self, db_client: AsyncConnectionPool) -> None:
+        async with db_client.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute("SELECT issue_type_id, name, description FROM issue_types ORDER BY issue_type_id")
+                issue_types = await cur.fetchall()
+                await cur.execute("SELECT issue_subtype_id, issue_type_id, name, description FROM issue_subtypes ORDER BY issue_type_id, issue_subtype_id")
+                issue_subtypes = await cur.fetchall()
+                await cur.execute("SELECT authority_id, authority_type, authority_ref_id, name, description FROM authorities ORDER BY name")
+                authorities = await cur.fetchall()
+                await cur.execute("SELECT subzone_id, planning_area_id, name, area_sq_m FROM subzones ORDER BY subzone_id")
+                subzones = await cur.fetchall()
+                await cur.execute("SELECT planning_area_id, name, area_sq_m FROM planning_areas ORDER BY planning_area_id")
+                planning_areas = await cur.fetchall()
+                await cur.execute("SELECT * FROM region_metadata ORDER BY subzone_id")
+                regions = await cur.fetchall()
+                await cur.execute(
+                    "SELECT table_name, version, changed_at FROM table_versions WHERE table_name = ANY(%s)",
+                    (VERSIONED_TABLES,)
+                )
+                table_versions = await cur.fetchall()
+
+        # Swap every index in one step so readers never see a half-loaded cache
+        self.issue_types_by_id = {row["issue_type_id"]: row for row in issue_types}
+        self.issue_types_by_name = {row["name"]: row for row in issue_types}
+        self.issue_subtypes_by_id = {row["issue_subtype_id"]: row for row in issue_subtypes}
+        self.issue_subtypes_by_name = {row["name"]: row for row in issue_subtypes}
+        self.authorities_by_id = {row["authority_id"]: row for row in authorities}
+        self.authorities_by_type_and_name = {(row["authority_type"], row["name"]): row for row in authorities}
+        self.subzones_by_id = {row["subzone_id"]: row for row in subzones}
+        self.subzones_by_name = {row["name"]: row for row in subzones}
+        self.planning_areas_by_id = {row["planning_area_id"]: row for row in planning_areas}
+        self.planning_areas_by_name = {row["name"]: row for row in planning_areas}
+        self.regions_by_subzone_id = {row["subzone_id"]: row for row in regions}
+        self.regions_by_subzone_name = {row["subzone_name"]: row for row in regions}
+        self.table_versions = {row["table_name"]: row for row in table_versions}
+        self.loaded = True
+
+        logger.info(
+            f"Reference data loaded: {len(issue_types)} issue types, {len(issue_subtypes)} subtypes, "
+            f"{len(authorities)} authorities, {len(subzones)} subzones, {len(planning_areas)} planning areas."
+        )
+
+    async def listen(self, db_client: AsyncConnectionPool, dsn: str) -> None:
+        """
+        Reload on every NOTIFY until cancelled. Runs on its own connection since LISTEN
+        must stay on one session, and reloads after a reconnect to catch missed changes.
+        """
+        reconnecting = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    if reconnecting or not self.loaded:
+                        await self.load(db_client)
+                    async for notify in conn.notifies():
+                        logger.info(f"Reference data changed ({notify.payload}), reloading...")
+                        await self.load(db_client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Reference data listener failed: {str(e)}. Retrying in {RECONNECT_DELAY_SECONDS}s.")
+                reconnecting = True
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    # --------------------------------------------------------
+    # Lookups
+    # --------------------------------------------------------
+
+    def issue_type_ids_from_names(self, names: list[str]) -> list[int]:
+        return [self.issue_types_by_name[name]["issue_type_id"] for name in names if name in self.issue_types_by_name]
+
+    def issue_subtype_ids_from_names(self, names: list[str]) -> list[int]:
+        return [self.issue_subtypes_by_name[name]["issue_subtype_id"] for name in names if name in self.issue_subtypes_by_name]
+
+    def authority_ref_id_from_name(self, authority_type: str, name: str) -> int | None:
+        authority = self.authorities_by_type_and_name.get((authority_type, name))
+        return authority["authority_ref_id"] if authority else None
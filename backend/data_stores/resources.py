@@ -1,9 +1,111 @@
-from backend.data_stores.database import db_client
-from backend.data_stores.object_storage import os_client
+import time
+import asyncio
+import logging
+import httpx
+from contextvars import ContextVar
+from config.config import config
+from backend.data_stores.database import dsn, POOL_CONFIG, create_pool, create_replica_client
+from backend.data_stores.object_storage import (
+    create_os_client, create_os_presign_client, create_os_executor, ensure_bucket, ensure_bucket_until_ready
+)
+from backend.data_stores.reference_data import ReferenceDataCache
+from backend.data_stores.response_cache import create_response_cache
+from backend.data_stores.subzone_locator import SubzoneLocator
+
+logger = logging.getLogger(__name__)
+
+DS_CONFIG = config.data_stores
+
+# Set per request by the read routing middleware (main.py) when the request must see recent writes
+read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
 
 class Resources:
+    """
+    Data-store clients shared by the whole app. Nothing is created or connected at import:
+    open() builds the clients and runs the readiness checks in parallel from the app lifespan,
+    close() releases them.
+    """
+
     def __init__(self):
-        self.db_client = db_client
-        self.os_client = os_client
+        self.db_client = None
+        self.replica_db_client = None
+        self.os_client = None
+        self.os_presign_client = None
+        self.os_executor = None
+        self.feed_cache = None
+        self.reference_data = ReferenceDataCache()
+        self.subzone_locator = SubzoneLocator()
+        # name -> {"ready": <bool>, "ms": <float>, "error": <string or None>} from the last open()
+        self.readiness: dict[str, dict] = {}
+        self.background_tasks: list[asyncio.Task] = []
+
+    @property
+    def read_db_client(self):
+        """
+        Pool for read-only CRUD: the replicas, or the primary for a request that has to read
+        its own writes. Anything that writes keeps using db_client.
+        """
+        return self.db_client if read_from_primary.get() else self.replica_db_client
+
+    async def open(self) -> None:
+        """
+        Create every client, then check each data store concurrently, each bounded by
+        readiness_timeout, so startup takes as long as the slowest check rather than their sum.
+
+        Only the primary database is required. The pools keep connecting in the background and
+        a missing bucket is retried until storage answers, so a slow optional dependency is
+        logged and reported in readiness instead of failing the worker.
+        """
+        self.db_client = create_pool(dsn)
+        self.replica_db_client = create_replica_client(self.db_client)
+        self.os_client = create_os_client()
+        self.os_presign_client = create_os_presign_client()
+        self.os_executor = create_os_executor()
+        self.feed_cache = create_response_cache(self.db_client, DS_CONFIG.response_cache)
+
+        await self.db_client.open(wait=False)
+        checks = {
+            "relational_db": self.db_client.wait(timeout=POOL_CONFIG.timeout),
+            "object_storage": ensure_bucket(self.os_client, self.os_executor),
+            "vectorstore": self.check_vectorstore(),
+        }
+        if self.replica_db_client is not self.db_client:
+            await self.replica_db_client.open(wait=False)
+            checks["relational_db_replicas"] = self.replica_db_client.wait(timeout=POOL_CONFIG.timeout)
+
+        results = await asyncio.gather(*(self.check(name, check) for name, check in checks.items()))
+        self.readiness = dict(zip(checks, results))
+
+        if not self.readiness["relational_db"]["ready"]:
+            await self.close()
+            raise RuntimeError(f"Relational database not ready: {self.readiness['relational_db']['error']}")
+        if not self.readiness["object_storage"]["ready"]:
+            self.background_tasks.append(asyncio.create_task(ensure_bucket_until_ready(self.os_client, self.os_executor)))
+
+    async def check(self, name: str, check) -> dict:
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(check, timeout=DS_CONFIG.readiness_timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logger.warning(f"{name} not ready after {time.perf_counter() - start:.2f}s: {error}")
+        return {"ready": error is None, "ms": round((time.perf_counter() - start) * 1000, 3), "error": error}
+
+    async def check_vectorstore(self) -> None:
+        # Any HTTP answer means the vector store is up, the chatbot connects on demand
+        async with httpx.AsyncClient(timeout=DS_CONFIG.readiness_timeout) as client:
+            await client.get(DS_CONFIG.vectorstore.url)
+
+    async def close(self) -> None:
+        for task in self.background_tasks:
+            task.cancel()
+        self.background_tasks = []
+        if self.replica_db_client is not None and self.replica_db_client is not self.db_client:
+            await self.replica_db_client.close()
+        if self.db_client is not None:
+            await self.db_client.close()
+        if self.os_executor is not None:
+            self.os_executor.shutdown(wait=True)
 
 resources = Resources()
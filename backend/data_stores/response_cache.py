@@ -0,0 +1,154 @@
+import math
+import time
+import asyncio
+import logging
+import psycopg
+from collections import OrderedDict
+from typing import Any, Optional
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the notify_feed_cache_invalidated() trigger function, payload "<lat>,<lon>"
+CHANNEL = "feed_cache_invalidated"
+RECONNECT_DELAY_SECONDS = 5
+
+# Feed requests are snapped to ~200 m cells (twice the issue grid cell) so nearby users share entries
+FEED_CELL_DEGREES = 0.0018
+
+# Slack on top of the radius when deciding whether a change touches a cached feed,
+# since ST_DWithin measures on the spheroid and haversine on a sphere
+INVALIDATION_MARGIN_M = 50
+EARTH_RADIUS_M = 6371008.8
+
+
+def snap_to_cell(lat: float, lon: float) -> tuple[int, int, float, float]:
+    """
+    Snap a coordinate to its feed cell, returning (cell_y, cell_x, centre_lat, centre_lon).
+    """
+    cell_y, cell_x = math.floor(lat / FEED_CELL_DEGREES), math.floor(lon / FEED_CELL_DEGREES)
+    return cell_y, cell_x, (cell_y + 0.5) * FEED_CELL_DEGREES, (cell_x + 0.5) * FEED_CELL_DEGREES
+
+
+def feed_cache_key(cell_y: int, cell_x: int, radius: int) -> str:
+    return f"forum-posts:{cell_y}:{cell_x}:{radius}"
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class LocalResponseCache:
+    """
+    In-process LRU with a TTL, for single-worker deployments.
+
+    Each entry remembers the centre and radius it was computed for, so a change at a point
+    evicts exactly the entries whose feed area covers it. Every worker runs listen() to
+    receive those points from Postgres.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[float, float, float, int, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, _, _, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, lat: float, lon: float, radius: int, value: Any) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, lat, lon, radius, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate_near(self, lat: float, lon: float) -> None:
+        stale = [
+            key for key, (_, entry_lat, entry_lon, radius, _) in self.entries.items()
+            if haversine_m(lat, lon, entry_lat, entry_lon) <= radius + INVALIDATION_MARGIN_M
+        ]
+        for key in stale:
+            del self.entries[key]
+
+    async def listen(self, dsn: str) -> None:
+        """
+        Evict on every NOTIFY until cancelled. Everything is dropped after a reconnect
+        since invalidations may have been missed while disconnected.
+        """
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    self.entries.clear()
+                    async for notify in conn.notifies():
+                        try:
+                            lat, lon = (float(v) for v in notify.payload.split(","))
+                        except ValueError:
+                            self.entries.clear()
+                            continue
+                        self.invalidate_near(lat, lon)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Feed cache listener failed: {str(e)}. Retrying in {RECONNECT_DELAY_SECONDS}s.")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+class PostgresResponseCache:
+    """
+    Shared cache in the UNLOGGED feed_cache table, for multi-worker deployments.
+
+    Stands in for a dedicated cache server: every worker sees the same entries, and the
+    invalidation triggers delete affected rows directly, so there is nothing to listen for.
+    """
+
+    def __init__(self, db_client: AsyncConnectionPool, ttl_seconds: int):
+        self.db_client = db_client
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self.db_client.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    "SELECT body FROM feed_cache WHERE key = %s AND expires_at > NOW()",
+                    (key,)
+                )
+                row = await cur.fetchone()
+                return row["body"] if row else None
+
+    async def set(self, key: str, lat: float, lon: float, radius: int, value: Any) -> None:
+        async with self.db_client.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO feed_cache (key, latitude, longitude, radius, body, expires_at)
+                    VALUES (%s, %s, %s, %s, %s, NOW() + make_interval(secs => %s))
+                    ON CONFLICT (key) DO UPDATE
+                    SET latitude = EXCLUDED.latitude, longitude = EXCLUDED.longitude, radius = EXCLUDED.radius,
+                        body = EXCLUDED.body, expires_at = EXCLUDED.expires_at
+                    """,
+                    (key, lat, lon, radius, Jsonb(value), self.ttl_seconds)
+                )
+
+    async def listen(self, dsn: str) -> None:
+        return None
+
+
+def create_response_cache(db_client: AsyncConnectionPool, cache_config) -> LocalResponseCache | PostgresResponseCache:
+    if cache_config.backend == "postgres":
+        return PostgresResponseCache(db_client, cache_config.ttl_seconds)
+    if cache_config.backend == "local":
+        return LocalResponseCache(cache_config.ttl_seconds, cache_config.max_entries)
+    raise ValueError(f"Unknown response cache backend: {cache_config.backend}")
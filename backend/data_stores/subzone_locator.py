@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import psycopg
+import numpy as np
+import shapely
+from typing import Sequence
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Same channel as the reference data cache, payload is the changed table name
+CHANNEL = "reference_data_changed"
+RELOAD_ON_TABLES = {"subzones", "planning_areas"}
+RECONNECT_DELAY_SECONDS = 5
+
+# ~1 m, well below address precision, shrinks the polygons several-fold
+SIMPLIFY_TOLERANCE_DEGREES = 0.00001
+
+# ~10 m, points in slivers opened between neighbours by simplification snap to the nearest subzone
+SNAP_DISTANCE_DEGREES = 0.0001
+
+
+class SubzoneLocator:
+    """
+    Point-in-subzone lookups against simplified subzone polygons held in a Shapely STRtree,
+    so geo-tagging an issue needs no database round trip.
+
+    Loaded once at startup and reloaded whenever subzones or planning_areas change.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.tree: shapely.STRtree | None = None
+        self.subzone_ids = np.empty(0, dtype=np.int64)
+        self.planning_area_ids = np.empty(0, dtype=np.int64)
+
+    async def load(self, db_client: AsyncConnectionPool) -> None:
+        async with db_client.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    """
+                    SELECT subzone_id, planning_area_id,
+                           ST_AsBinary(ST_SimplifyPreserveTopology(geom::geometry, %s)) AS geom
+                    FROM subzones
+                    WHERE geom IS NOT NULL
+                    ORDER BY subzone_id
+                    """,
+                    (SIMPLIFY_TOLERANCE_DEGREES,)
+                )
+                rows = await cur.fetchall()
+
+        geoms = shapely.from_wkb([bytes(row["geom"]) for row in rows])
+        tree = shapely.STRtree(geoms)
+        subzone_ids = np.array([row["subzone_id"] for row in rows], dtype=np.int64)
+        planning_area_ids = np.array([row["planning_area_id"] or -1 for row in rows], dtype=np.int64)
+
+        # Swap in one step so concurrent lookups never see a mismatched tree and id arrays
+        self.tree, self.subzone_ids, self.planning_area_ids = tree, subzone_ids, planning_area_ids
+        self.loaded = True
+
+        logger.info(f"Subzone locator loaded: {len(rows)} subzones.")
+
+    async def listen(self, db_client: AsyncConnectionPool, dsn: str) -> None:
+        """
+        Reload on every subzones/planning_areas NOTIFY until cancelled, and after a reconnect
+        to catch changes missed while disconnected.
+        """
+        reconnecting = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    if reconnecting or not self.loaded:
+                        await self.load(db_client)
+                    async for notify in conn.notifies():
+                        if notify.payload in RELOAD_ON_TABLES:
+                            logger.info(f"Subzone geometry changed ({notify.payload}), reloading...")
+                            await self.load(db_client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Subzone locator listener failed: {str(e)}. Retrying in {RECONNECT_DELAY_SECONDS}s.")
+                reconnecting = True
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    # --------------------------------------------------------
+    # Lookups
+    # --------------------------------------------------------
+
+    def locate(self, lats: Sequence[float], lons: Sequence[float]) -> list[dict | None]:
+        """
+        Vectorised lookup for a batch of points. Returns one
+        {"subzone_id": <int>, "planning_area_id": <int or None>} per point, or None where
+        the point lies in no subzone. Points on a shared boundary go to the lowest subzone_id.
+        """
+        tree, subzone_ids, planning_area_ids = self.tree, self.subzone_ids, self.planning_area_ids
+        lats = np.asarray(lats, dtype=float).ravel()
+        lons = np.asarray(lons, dtype=float).ravel()
+        if lats.shape != lons.shape:
+            raise ValueError("lats and lons must have the same length.")
+        if tree is None or len(lats) == 0:
+            return [None] * len(lats)
+
+        points = shapely.points(lons, lats)
+        not_found = len(subzone_ids)
+        matches = np.full(len(points), not_found, dtype=np.int64)
+
+        point_idx, geom_idx = tree.query(points, predicate="intersects")
+        np.minimum.at(matches, point_idx, geom_idx)
+
+        unmatched = np.flatnonzero(matches == not_found)
+        if len(unmatched):
+            near_idx, geom_idx = tree.query_nearest(points[unmatched], max_distance=SNAP_DISTANCE_DEGREES)
+            np.minimum.at(matches, unmatched[near_idx], geom_idx)
+
+        results = []
+        for match in matches:
+            if match == not_found:
+                results.append(None)
+                continue
+            planning_area_id = int(planning_area_ids[match])
+            results.append({
+                "subzone_id": int(subzone_ids[match]),
+                "planning_area_id": planning_area_id if planning_area_id >= 0 else None
+            })
+        return results
+
+    def locate_point(self, lat: float, lon: float) -> dict | None:
+        return self.locate([lat], [lon])[0]
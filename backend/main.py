@@ -1,20 +1,75 @@
-from fastapi import FastAPI
+import time
+import asyncio
+from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
-from backend.data_stores.resources import resources  
-from backend.api.v1.endpoints import auth, posts, users, comments, issues, chatbot
+from backend.data_stores.resources import resources, read_from_primary
+from backend.data_stores.database import dsn, DB_CONFIG
+from backend.data_stores.partitions import maintain_partitions
+from backend.services.media.derivatives import MediaDerivativeWorker
+from backend.api.v1.endpoints import auth, posts, users, comments, issues, chatbot, metrics
 
 @asynccontextmanager
 async def lifespan(app):
     app.state.resources = resources
+    await resources.open()
+    await asyncio.gather(
+        resources.reference_data.load(resources.db_client),
+        resources.subzone_locator.load(resources.db_client)
+    )
+    reference_data_listener = asyncio.create_task(resources.reference_data.listen(resources.db_client, dsn))
+    subzone_locator_listener = asyncio.create_task(resources.subzone_locator.listen(resources.db_client, dsn))
+    feed_cache_listener = asyncio.create_task(resources.feed_cache.listen(dsn))
+    partition_maintenance = asyncio.create_task(maintain_partitions(resources.db_client))
+    media_derivatives = asyncio.create_task(MediaDerivativeWorker().run(resources, dsn))
     yield
-    await resources.db_client.close()
+    reference_data_listener.cancel()
+    subzone_locator_listener.cancel()
+    feed_cache_listener.cancel()
+    partition_maintenance.cancel()
+    media_derivatives.cancel()
+    await resources.close()
 
 app = FastAPI(lifespan=lifespan)
 
+# --------------------------------------------------------
+# Read Routing
+# --------------------------------------------------------
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "x-read-primary"
+
+@app.middleware("http")
+async def route_reads(request: Request, call_next):
+    """
+    Read-only CRUD goes to the replicas except for requests that could otherwise miss a write:
+    writes themselves, requests sending "X-Read-Primary: true", and requests from a client that
+    wrote within the last read_your_writes_seconds (tracked in a cookie set after the write).
+    """
+    is_write = request.method in WRITE_METHODS
+    try:
+        primary_until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    if is_write or request.headers.get(READ_PRIMARY_HEADER) == "true" or primary_until > time.time():
+        read_from_primary.set(True)
+
+    response = await call_next(request)
+
+    if is_write and response.status_code < 400:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + DB_CONFIG.read_your_writes_seconds),
+            max_age=DB_CONFIG.read_your_writes_seconds,
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
 app.include_router(auth.router, prefix="/v1/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/v1/users", tags=["Users"])
 app.include_router(posts.router, prefix="/v1/posts", tags=["Posts"])
 app.include_router(comments.router, prefix="/v1/comments", tags=["Comments"])
 app.include_router(issues.router, prefix="/v1/issues", tags=["Issues"])
 app.include_router(chatbot.router, prefix="/v1/ai_models/chatbot", tags=["AI Models - Chatbot"])
-
+app.include_router(metrics.router, prefix="/v1/metrics", tags=["Metrics"])
@@ -7,6 +7,7 @@ class Comment(BaseModel):
     content: str
     comment_created_at: str
     comment_likes: int
+    comment_dislikes: int
     
 class CommentRequest(BaseModel):
     content: str
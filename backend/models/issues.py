@@ -1,6 +1,7 @@
 
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
+from datetime import datetime, timezone
 from fastapi import UploadFile
 
 class IssueReport(BaseModel):
@@ -9,7 +10,7 @@ class IssueReport(BaseModel):
     longitude: float
     address: Optional[str]
     description: str
-    severity: Optional[int]
+    severity: Optional[str]
     status: str
     datetime_reported: str
     datetime_acknowledged: Optional[str]
@@ -33,6 +34,44 @@ class IssueReport(BaseModel):
         return v
 
 
+INT4_MAX = 2**31 - 1
+
+class IssueBulkRow(IssueReport):
+    # Typed and bounded like the staging table columns, so a bad value is a row error rather than a failed COPY.
+    # Omitted optional values fall back to the column defaults (status 'Reported', public, reported/updated now).
+    address: Optional[str] = None
+    severity: Optional[str] = Field(None, max_length=50)
+    status: Optional[str] = Field(None, max_length=50)
+    datetime_reported: Optional[datetime] = None
+    datetime_acknowledged: Optional[datetime] = None
+    datetime_closed: Optional[datetime] = None
+    datetime_updated: Optional[datetime] = None
+    subzone_id: Optional[int] = None
+    planning_area_id: Optional[int] = None
+    is_public: Optional[bool] = None
+    issue_type_ids: List[int] = []
+    issue_subtype_ids: List[int] = []
+
+    @validator('datetime_reported', 'datetime_acknowledged', 'datetime_closed', 'datetime_updated')
+    def to_naive_utc(cls, v):
+        # Columns are TIMESTAMP without time zone, which would silently drop an offset
+        if v is not None and v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+    @validator('user_id', 'authority_id', 'subzone_id', 'planning_area_id')
+    def validate_id(cls, v):
+        if v is not None and not 0 < v <= INT4_MAX:
+            raise ValueError('Id out of range')
+        return v
+
+    @validator('issue_type_ids', 'issue_subtype_ids')
+    def validate_ids(cls, v):
+        if any(not 0 < i <= INT4_MAX for i in v):
+            raise ValueError('Id out of range')
+        return v
+
+
 class Location(BaseModel):
     latitude: float
     longitude: float
@@ -77,6 +116,11 @@ class IssueFilter(BaseModel):
     severity: Optional[str] = None
     status: Optional[str] = None
     subzone_name: Optional[str] = None
-    page: Optional[int] = 1
-    limit: Optional[int] = 10000
-    proximity: Optional[Proximity] = None
\ No newline at end of file
+    page: Optional[int] = None      # Legacy offset paging, prefer cursor
+    cursor: Optional[str] = None    # Opaque keyset cursor returned as next_cursor
+    limit: Optional[int] = 100
+    proximity: Optional[Proximity] = None
+    order: Optional[str] = None     # "updated" (default) or "distance", which needs proximity
+
+    class Config:
+        populate_by_name = True
\ No newline at end of file
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class MediaUploadRequest(BaseModel):
+    content_type: str
+    size: int = Field(..., gt=0)        # declared by the client, checked again on completion
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$")      # hex digest of the file, checked again on completion
+
+class MediaUploadsRequest(BaseModel):
+    files: List[MediaUploadRequest] = Field(..., min_length=1)
+
+class MediaUploadComplete(BaseModel):
+    object_name: str
@@ -4,27 +4,28 @@ from backend.models.comments import Comment
 
 class Post(BaseModel):
     issue_id: int
-    user_id: int
-    issue_type_id: List[int]
-    issue_subcategory_id: Optional[List[int]]
+    user_id: Optional[int]
+    issue_type_ids: List[int]
+    issue_subtype_ids: List[int]
     latitude: float
     longitude: float
     address: Optional[str]
-    location: str
     description: Optional[str]
-    severity: Optional[int]
+    severity: Optional[str]
     status: str
     datetime_reported: str
     datetime_acknowledged: Optional[str]
     datetime_closed: Optional[str]
-    datetime_updated: str
-    agency_id: Optional[int]
-    town_council_id: Optional[int]
+    datetime_updated: Optional[str]
+    authority_id: Optional[int]
     subzone_id: Optional[int]
     planning_area_id: Optional[int]
     is_public: bool
     post_id: Optional[int]
-    created_at: str
+    created_at: Optional[str]
     comment_count: int
     post_likes: int
-    comments: List[Comment] = []
\ No newline at end of file
+    post_dislikes: int
+    image_url: Optional[str] = None         # First image, medium WebP variant when available
+    comments: List[Comment] = []            # First page of comments, oldest first
+    next_comment_after: Optional[int]       # Pass as `after` to /v1/comments/post/{post_id}/comments for more
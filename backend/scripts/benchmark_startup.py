@@ -0,0 +1,62 @@
+"""
+benchmark_startup.py
+
+Measures backend worker cold start: the time to import backend.main (in fresh interpreters,
+so nothing is cached in sys.modules) and the time the app lifespan takes to become ready,
+with the duration of each data store's readiness check.
+
+Import must not touch the network, so the import figures should be unaffected by whether
+Postgres, MinIO or the vector store are up. Startup needs the primary database.
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_startup --runs 5
+    python -m backend.scripts.benchmark_startup --import-only
+"""
+
+import sys
+import time
+import json
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import backend.main; print(time.perf_counter() - start)"
+
+
+def benchmark_import(runs: int) -> dict:
+    timings_ms = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+        timings_ms.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(timings_ms), 1),
+        "max_ms": round(max(timings_ms), 1)
+    }
+
+
+async def benchmark_startup() -> dict:
+    from backend.main import app
+
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        startup_ms = (time.perf_counter() - start) * 1000
+        readiness = app.state.resources.readiness
+    return {"startup_ms": round(startup_ms, 1), "readiness": readiness}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend import and startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time the import in.")
+    parser.add_argument("--import-only", action="store_true", help="Skip the lifespan startup, which needs the data stores.")
+    args = parser.parse_args()
+
+    report = {"import": benchmark_import(args.runs)}
+    if not args.import_only:
+        report["startup"] = asyncio.run(benchmark_startup())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,15 +13,16 @@ Date: 3rd May 2025
 # Imports
 # --------------------------------------------------------
 
+import asyncio
 import logging
 import uuid
 from config.config import config
+from backend.data_stores.resources import Resources
 from backend.services.vlm_issue_categoriser.service import VLMIssueCategoriserService
 from backend.crud import posts as crud_posts
 from backend.crud import issues as crud_issues
-from backend.crud import authorities as crud_authorities
-from backend.crud import regions as crud_regions
 from backend.crud import media as crud_media
+from backend.services.media import service as media_service
 
 # --------------------------------------------------------
 # Logger Setup
@@ -35,7 +36,8 @@ logger = logging.getLogger(__name__)
 # --------------------------------------------------------
 
 vlm_pipeline = VLMIssueCategoriserService()
-vlm_pipeline.setup()
+
+OS_CONFIG = config.data_stores.object_storage
 
 # --------------------------------------------------------
 # Form Manager
@@ -94,13 +96,14 @@ class ReportFormManager:
         """
         self.__init__()
 
-    async def receive_input(self, input_text: str, input_images: list = None) -> str:
+    async def receive_input(self, input_text: str, input_images: list = None, resources: Resources = None) -> str:
         """
         Process user input and advance the form state.
 
         Args:
             input_text (str): Text input from user.
             input_images (list, optional): List of image inputs.
+            resources (Resources, optional): Shared resources, needed once images are provided.
 
         Returns:
             str: Status string ("updated", "next").
@@ -112,21 +115,26 @@ class ReportFormManager:
 
         if self.awaiting_image:
             if input_images:
-                for image in input_images:
-                    self.fields["images"].append(image)
+                # Store the images while the request (and its upload files) is still open, the report is saved later
+                stored_images = await asyncio.gather(*(self._upload_image(resources, image) for image in input_images))
+                self.fields["images"].extend(image for image in stored_images if image is not None)
 
-                predictions = await vlm_pipeline.run({"text": input_text, "locaation": { }, "images": input_images})
+                predictions = await vlm_pipeline.run(resources=resources, description=input_text, images=input_images)
 
                 self.fields["severity"] = predictions.get("severity")
 
+                # Resolve names to ids against the categories the model was just offered
+                reference_data = resources.reference_data
+                subtypes_by_name = vlm_pipeline.query_service.subtypes_by_name
                 self.fields["categories"] = predictions.get("categories", [])
-                self.fields["issue_subtype_ids"] = [crud_issues.fetch_issue_subtype_info_from_name(i)["issue_subtype_id"] for i in self.fields["categories"]]
-                self.fields["issue_type_ids"] = list(set(crud_issues.fetch_issue_subtype(i)["issue_type_id"] for i in self.fields["issue_subtype_ids"]))
+                subtypes = [subtypes_by_name[name] for name in self.fields["categories"] if name in subtypes_by_name]
+                self.fields["issue_subtype_ids"] = [subtype["issue_subtype_id"] for subtype in subtypes]
+                self.fields["issue_type_ids"] = list(set(subtype["issue_type_id"] for subtype in subtypes))
 
                 self.fields["title"] = predictions.get("title") or None
 
-                self.fields["agency_id"] = crud_authorities.fetch_agency_id_from_name(predictions.get("agency")) or None
-                self.fields["town_council_id"] = crud_authorities.fetch_town_council_id_from_name(predictions.get("town_council")) or None
+                self.fields["agency_id"] = reference_data.authority_ref_id_from_name("agency", predictions.get("agency"))
+                self.fields["town_council_id"] = reference_data.authority_ref_id_from_name("town_council", predictions.get("town_council"))
                 
             self.awaiting_image = False
             self.current_step += 1
@@ -210,7 +218,8 @@ class ReportFormManager:
 
     async def finalise_submission(self, resources) -> dict:
         """
-        Finalize the collected report and reset the form.
+        Finalize the collected report and reset the form. If saving fails the error is raised
+        and the form is left as it was.
 
         Returns:
             dict: Report submission payload.
@@ -229,28 +238,58 @@ class ReportFormManager:
     # --------------------------------------------------------
 
     async def _save_to_db(self, resources) -> None:
+        """
+        Save the report and map its stored images to it. Failures are logged and re-raised, so the
+        caller can tell the user and the form is kept for another attempt.
+        """
 
         # Determine planning area and subzone from lat, lng
-        region = crud_regions.fetch_region_from_lat_lng(lat=self.fields["latitude"], lng=self.fields["longitude"])
-        self.fields["planning_area_id"] = region.planning_area_id
-        self.fields["subzone_id"] = region.subzone_id
+        if self.fields["latitude"] is not None and self.fields["longitude"] is not None:
+            region = resources.subzone_locator.locate_point(float(self.fields["latitude"]), float(self.fields["longitude"]))
+            if region:
+                self.fields["planning_area_id"] = region["planning_area_id"]
+                self.fields["subzone_id"] = region["subzone_id"]
 
         # Make a copy of the user's submission in case
         payload = self.fields.copy()
+        payload["user_id"] = self.user_id
 
         try:
-           issue_id = crud_issues.create_issue(resources=resources, issue=payload).issue_id
-
-           if payload.get("images"):
-                
-                image_urls = []
-                for image in payload["images"]:
-                    # Upload image to storage and retrieve url
-                    image_url = crud_media.upload_file_to_os(resources=resources, bucket_name="hualaowei", object_name=f"/reports/{str(uuid.uuid4())}.jpg", image_data=image)
-                    image_urls.append(image_url)
-
-                    # Map the image to the corresponding issue in db
-                    await crud_media.map_media_to_issue(resources=resources, issue_id=issue_id, media_type="image", file_path=image_url)
+           issue_id = (await crud_issues.create_issue(resources=resources, issue=payload))["issue_id"]
+
+           # Images were stored on receipt, map them to the corresponding issue in db
+           for image in payload.get("images") or []:
+                await crud_media.map_media_to_issue(
+                    resources=resources,
+                    issue_id=issue_id,
+                    media_type="image",
+                    file_path=image["file_path"],
+                    metadata={"object_name": image["object_name"], "size": image["size"], "content_type": image["content_type"]},
+                    sha256=image["sha256"]
+                )
                     
         except Exception as e:
-            logger.error(f"Failed to save issue report to data stores: {str(e)}")
\ No newline at end of file
+            logger.error(f"Failed to save issue report to data stores: {str(e)}")
+            raise
+
+    async def _upload_image(self, resources: Resources, image) -> dict | None:
+        """
+        Store an uploaded image under its content hash off the event loop (skipped if the same
+        photo was stored before) and rewind it for the VLM. The type is taken from the file's
+        leading bytes, anything that is not an allowed image type is skipped (None).
+        """
+        await image.seek(0)
+        content_type = media_service.sniff_content_type(await image.read(media_service.MAGIC_BYTES_LENGTH))
+        await image.seek(0)
+        if content_type is None:
+            logger.warning(f"Skipping upload {image.filename}: not a supported image type ({image.content_type}).")
+            return None
+
+        stored_image = await crud_media.store_media_stream(
+            resources=resources,
+            bucket_name=OS_CONFIG.bucket_name,
+            stream=image.file,
+            content_type=content_type
+        )
+        await image.seek(0)
+        return stored_image
@@ -87,15 +87,15 @@ class ChatSessionLogger:
         """
         logger.debug(f"Structuring last {max_messages} messages for session {session_id}")
 
-        messages = self._get_session_messages(resources, session_id, user_id)
+        messages = await self._get_session_messages(resources, session_id, user_id)
         messages = messages[-max_messages:] if messages else []
 
         chat_log = []
-        for sender, message, message_type, created_at, metadata in messages:
-            if message_type != "text":
+        for row in messages:
+            if row["message_type"] != "text":
                 continue
-            role = "user" if sender == "user" else "assistant"
-            chat_log.append({"role": role, "content": message})
+            role = "user" if row["sender"] == "user" else "assistant"
+            chat_log.append({"role": role, "content": row["message"]})
 
         return chat_log
 
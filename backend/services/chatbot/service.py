@@ -85,7 +85,7 @@ class ChatbotService:
 
         logger.info("\nPIPELINE INITIALISED")
 
-    def run(self, resources: Resources, text: str = None, audio: Optional[UploadFile] = None, user_id: str = None, session_id: str = None, files: Optional[List[UploadFile]] = None):
+    async def run(self, resources: Resources, text: str = None, audio: Optional[UploadFile] = None, user_id: str = None, session_id: str = None, files: Optional[List[UploadFile]] = None):
         """
         Process user input (text or audio) through the chatbot pipeline
         and return the chatbot's response.
@@ -132,42 +132,45 @@ class ChatbotService:
 
             # If user presses the cancel button, terminate the process
             if text == "cancel":
-                self.report_form_manager.cancel()
+                await self.report_form_manager.cancel()
                 return self._finalise_response("Okay, I have cancelled your report submission.", original_lang, session_id, user_id)
             # If user presses the manual button, direct them to the manual form instead
             if text == "manual":
-                self.report_form_manager.cancel()
+                await self.report_form_manager.cancel()
                 return self._finalise_response("Sure, you can fill out the form manually at your convenience, by clicking the button below.", original_lang, session_id, user_id)
             # If user presses the submit button, submit their report and end the process
             if text == "submit":
-                self.report_form_manager.finalise_submission(resources)
+                try:
+                    await self.report_form_manager.finalise_submission(resources)
+                except Exception:
+                    return self._finalise_response("Sorry, I could not submit your report. Please try again, or fill out the form manually.", original_lang, session_id, user_id)
                 return self._finalise_response("Thanks for the submission! Please wait patiently as we review your issue report.", original_lang, session_id, user_id)
             # If user presses the change button, redirect them to the respective stage, at which the change was requested
             if text.startswith("change"):
                 field = text.replace("change ", "").strip()
-                if self.report_form_manager.start_change_field(field):
+                if await self.report_form_manager.start_change_field(field):
                     return self._finalise_response(f"Sure! Please provide the new {field}.", original_lang, session_id, user_id)
                 return self._finalise_response("Sorry, I did not understand what you want to change.", original_lang, session_id, user_id)
 
             # A button was not pressed (not a fixed input), so the input needs to be processed
-            form_response = self.report_form_manager.receive_input(text, files)
+            form_response = await self.report_form_manager.receive_input(text, files, resources=resources)
 
             # If the user provides the updated data after requesting for a change
             if form_response == "updated":
-                summary = self.report_form_manager.generate_summary()
+                summary = await self.report_form_manager.generate_summary()
                 return self._finalise_response(f"Got it! Here is the updated information:\n\n{summary}\n\nYou can 'Change' a field, 'Submit' to submit, or 'Cancel' to abort.", original_lang, session_id, user_id)
             # If the user has finished the report form, but has not submitted yet
-            if self.report_form_manager.is_complete():
-                summary = self.report_form_manager.generate_summary()
+            if await self.report_form_manager.is_complete():
+                summary = await self.report_form_manager.generate_summary()
                 return self._finalise_response(f"Thanks for the information! Here is what I have gathered:\n\n{summary}\n\nWould you like to change anything? You can 'Change' a field, 'Submit' to submit, or 'Cancel' to abort.", original_lang, session_id, user_id)
             
             # Otherwise, user has not finished the form report process, so they proceed to the next question
-            return self._finalise_response(self.report_form_manager.next_question(), original_lang, session_id, user_id)
+            return self._finalise_response(await self.report_form_manager.next_question(), original_lang, session_id, user_id)
 
         # --------------------------------------------------------
         # CHAT SESSION RETRIEVAL: Fetch existing structured chat history (based on session_id and user_id)
         # --------------------------------------------------------
-        chat_messages = self.session.get_structured_messages(resources=resources, session_id=session_id, user_id=user_id)
+        chat_messages = await self.session.get_structured_messages(resources=resources, session_id=session_id, user_id=user_id)
         chat_messages.append({"role": "user", "content": text})
 
         # --------------------------------------------------------
@@ -191,7 +194,7 @@ class ChatbotService:
         # --------------------------------------------------------
         # CHAT SESSION LOGGING: If input is valid (related or a follow-up), log the user message
         # --------------------------------------------------------
-        self.session.log_message(resources=resources, session_id=session_id, user_id=user_id, sender="user", message=text)
+        await self.session.log_message(resources=resources, session_id=session_id, user_id=user_id, sender="user", message=text)
 
         # --------------------------------------------------------
         # LAYER 3 [INTENT CLASSIFICATION]: Classifies and routes the intent of the input text
@@ -231,7 +234,7 @@ class ChatbotService:
         # --------------------------------------------------------
         # CHAT SESSION LOGGING: Log the bot's message
         # --------------------------------------------------------
-        self.session.log_message(resources=resources, session_id=session_id, user_id=user_id, sender="bot", message=response)
+        await self.session.log_message(resources=resources, session_id=session_id, user_id=user_id, sender="bot", message=response)
 
         return self._finalise_response(response, original_lang, session_id, user_id)
 
@@ -1,7 +1,54 @@
+import io
+import csv
+import json
+import codecs
+import logging
+import httpx
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, BinaryIO, Iterator
+from pydantic import ValidationError
+from psycopg.errors import DataError
 from backend.data_stores.resources import Resources
 from backend.crud import issues as crud_issues
+from backend.crud import table_versions as crud_table_versions
 from backend.models.posts import Post
-from backend.models.issues import IssueReport, IssueFilter
+from backend.models.issues import IssueReport, IssueBulkRow, IssueFilter
+
+logger = logging.getLogger(__name__)
+
+# Tables each cacheable response is built from, their change versions make up its ETag
+CATEGORY_TABLES = ["issue_types", "issue_subtypes"]
+ISSUE_LIST_TABLES = ["issues", "issue_types", "issue_subtypes", "authorities", "subzones", "planning_areas"]
+
+# (tables) -> (version token, when this worker first read it), see fetch_data_version
+token_first_seen: dict[tuple[str, ...], tuple[str, datetime]] = {}
+
+
+async def fetch_data_version(resources: Resources, table_names: list[str]) -> tuple[str, datetime | None]:
+    """
+    (version token, last modified) for a response built from `table_names`. Served from the
+    reference data cache when it holds every table, otherwise one lookup in table_versions.
+
+    changed_at is stamped when a statement runs, and a long transaction can commit after
+    responses stamped later were served. So last modified is never earlier than the moment
+    this worker first read the token, which is after the change became visible.
+    """
+    reference_data = resources.reference_data
+    if reference_data.loaded and all(name in reference_data.table_versions for name in table_names):
+        versions = reference_data.table_versions
+    else:
+        versions = await crud_table_versions.get_table_versions(resources, table_names)
+
+    token = ",".join(f"{name}:{versions[name]['version'] if name in versions else '-'}" for name in table_names)
+    changed_at = [versions[name]["changed_at"] for name in table_names if name in versions]
+
+    key = tuple(table_names)
+    seen_token, first_seen = token_first_seen.get(key, (None, None))
+    if seen_token != token:
+        first_seen = datetime.now(timezone.utc)
+        token_first_seen[key] = (token, first_seen)
+    return token, max(changed_at + [first_seen])
+
 
 async def fetch_issue_types_and_subtypes(resources: Resources):
 
@@ -27,35 +74,254 @@ async def fetch_issue_types_and_subtypes(resources: Resources):
     return list(result.values())
 
 
-async def fetch_issues_nearby_for_forum_post(resources: Resources, lat: float, lon: float, radius: int = 100):
+async def fetch_issues_nearby_for_forum_post(resources: Resources, lat: float, lon: float, radius: int = 100, comment_limit: int = 20):
 
-    rows = await crud_issues.get_issues_nearby(resources=resources, lat=lat, lon=lon, radius=radius)
-
-    issues = {}
-    for row in rows:
-        issue_id = row["issue_id"]
-        if issue_id not in issues:
-            issues[issue_id] = {
-                **{k: row[k] for k in Post.__fields__ if k not in {"comments"}},
-                "comments": []
-            }
-        if row["comment_id"]:
-            issues[issue_id]["comments"].append({
-                "comment_id": row["comment_id"],
-                "parent_comment_id": row["parent_comment_id"],
-                "content": row["comment_content"],
-                "comment_created_at": row["comment_created_at"],
-                "comment_likes": row["comment_likes"],
-            })
-            
-    return list(issues.values())
+    # Rows are already one per issue with comments nested, see crud.issues.get_issues_nearby
+    return await crud_issues.get_issues_nearby(resources=resources, lat=lat, lon=lon, radius=radius, comment_limit=comment_limit)
 
 
 async def fetch_issue_reports(resources: Resources, filters: IssueFilter):
 
-    rows = await crud_issues.get_issues(resources=resources, filters=filters)
+    page = await crud_issues.get_issues(resources=resources, params=filters.dict(by_alias=True))
             
-    return list(issues.values())
+    return page
+
+
+async def search_issue_reports(resources: Resources, query: str, filters: IssueFilter):
+
+    return await crud_issues.search_issues(resources=resources, query=query, params=filters.dict(by_alias=True))
+
+
+EXPORT_COLUMNS = [
+    "issue_id", "description", "severity", "latitude", "longitude", "address", "status",
+    "subzone_name", "datetime_reported", "datetime_acknowledged", "datetime_closed", "datetime_updated",
+    "issue_types", "issue_subtypes", "authority_name", "authority_type", "authority_ref_id"
+]
+EXPORT_CHUNK_ROWS = 500
+
+
+async def export_issue_reports(resources: Resources, filters: IssueFilter, fmt: str = "ndjson") -> AsyncIterator[str]:
+
+    if fmt not in {"ndjson", "csv"}:
+        raise ValueError("Invalid format value. Must be one of: 'ndjson' or 'csv'.")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS) if fmt == "csv" else None
+    if writer:
+        writer.writeheader()
+
+    pending = 0
+    async for row in crud_issues.stream_issues(resources=resources, params=filters.dict(by_alias=True)):
+        if writer:
+            writer.writerow({
+                **row,
+                "issue_types": ";".join(row["issue_types"]),
+                "issue_subtypes": ";".join(row["issue_subtypes"])
+            })
+        else:
+            buffer.write(json.dumps(row, default=str))
+            buffer.write("\n")
+
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def fetch_issue_tile(resources: Resources, z: int, x: int, y: int, filters: IssueFilter) -> bytes:
+
+    if not 0 <= z <= 22 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        raise ValueError("Invalid tile coordinates.")
+
+    return await crud_issues.get_issue_tile(resources=resources, z=z, x=x, y=y, params=filters.dict(by_alias=True))
+
+
+async def fetch_issue_grid_aggregation(resources: Resources, cell_size: int, filters: IssueFilter, bbox: dict | None = None):
+
+    rows = await crud_issues.get_issue_grid_counts(resources=resources, cell_size=cell_size, params=filters.dict(by_alias=True), bbox=bbox)
+
+    cell_degrees = crud_issues.GRID_CELL_FACTORS[cell_size] * crud_issues.GRID_BASE_DEGREES
+    cells = []
+    for row in rows:
+        min_lon, min_lat = row["cell_x"] * cell_degrees, row["cell_y"] * cell_degrees
+        cells.append({
+            "cell_id": f"{cell_size}:{row['cell_x']}:{row['cell_y']}",
+            "latitude": min_lat + cell_degrees / 2,
+            "longitude": min_lon + cell_degrees / 2,
+            "bounds": [min_lon, min_lat, min_lon + cell_degrees, min_lat + cell_degrees],
+            "count": row["count"],
+            "severity_counts": row["severity_counts"]
+        })
+
+    return {"cell_size": cell_size, "cells": cells}
+
+
+async def fetch_daily_issue_counts(resources: Resources, days: int, subzone_name: str | None = None, types: str | None = None, subtypes: str | None = None, authority_name: str | None = None):
+
+    return await crud_issues.get_daily_issue_counts_by_subzone(
+        resources=resources,
+        days=days,
+        issue_types=types.split(",") if types else None,
+        issue_subtypes=subtypes.split(",") if subtypes else None,
+        authority_name=authority_name,
+        subzone_name=subzone_name
+    )
+
+
+DAILY_MATRIX_DEFAULT_DAYS = 14
+
+
+async def fetch_daily_issue_count_matrix(resources: Resources, subzones: str, types: str | None = None, start_date: date | None = None, end_date: date | None = None):
+
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=DAILY_MATRIX_DEFAULT_DAYS - 1)
+
+    return await crud_issues.get_daily_issue_count_matrix(
+        resources=resources,
+        subzone_names=[name.strip() for name in subzones.split(",") if name.strip()],
+        start_date=start_date,
+        end_date=end_date,
+        issue_types=[name.strip() for name in types.split(",") if name.strip()] if types else None
+    )
+
+
+BULK_BATCH_ROWS = 5000
+BULK_MAX_REPORTED_ERRORS = 1000
+BULK_INDEX_TIMEOUT_SECONDS = 300
+BULK_DECODE_CHUNK_SIZE = 1024 * 1024
+
+
+def _check_utf8(file: BinaryIO) -> None:
+    """
+    Decode the whole upload once before importing anything, so a file that is not UTF-8 is
+    rejected outright instead of failing halfway with some batches already committed.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        while chunk := file.read(BULK_DECODE_CHUNK_SIZE):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"File is not valid UTF-8: {str(e)}")
+    finally:
+        file.seek(0)
+
+
+def _read_bulk_rows(file: BinaryIO, fmt: str) -> Iterator[tuple[int, str | dict]]:
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        try:
+            yield from enumerate(reader, start=1)
+        except csv.Error as e:
+            # The reader cannot resume after a malformed record
+            raise ValueError(f"Malformed CSV at line {reader.line_num}: {str(e)}")
+    else:
+        for row_no, line in enumerate(text, start=1):
+            if line.strip():
+                yield row_no, line
+
+
+def _decode_bulk_row(raw: str | dict) -> dict:
+    if isinstance(raw, str):
+        row = json.loads(raw)
+        if not isinstance(row, dict):
+            raise ValueError("Row must be a JSON object.")
+        return row
+
+    # DictReader files cells beyond the header under the None key
+    if None in raw:
+        raise ValueError("Row has more cells than the header.")
+
+    # CSV cells are strings, empty means null and id lists are ';'-separated
+    row = {k: (v if v != "" else None) for k, v in raw.items()}
+    for key in ("issue_type_ids", "issue_subtype_ids"):
+        row[key] = [int(v) for v in row[key].split(";")] if row.get(key) else []
+    return row
+
+
+async def _index_issues(resources: Resources, issue_ids: list[int]) -> bool:
+    """
+    Send one batch of new issues to the vectorstore indexing webhook, which bulk imports skip row by row.
+    False if the webhook is configured but the call failed.
+    """
+    webhook_url = await crud_issues.get_issue_webhook_url(resources)
+    if not webhook_url or not issue_ids:
+        return True
+    try:
+        async with httpx.AsyncClient(timeout=BULK_INDEX_TIMEOUT_SECONDS) as client:
+            response = await client.post(webhook_url, json={"issue_ids": issue_ids})
+            response.raise_for_status()
+        return True
+    except httpx.HTTPError as e:
+        logger.error(f"Indexing {len(issue_ids)} bulk imported issues failed: {str(e)}")
+        return False
+
+
+async def ingest_issue_reports(resources: Resources, file: BinaryIO, fmt: str = "ndjson") -> dict:
+
+    if fmt not in {"ndjson", "csv"}:
+        raise ValueError("Invalid format value. Must be one of: 'ndjson' or 'csv'.")
+    _check_utf8(file)
+
+    inserted, not_indexed, errors, batch = 0, 0, [], []
+
+    async def flush():
+        nonlocal inserted, not_indexed, batch
+        if batch:
+            # Geo-tag in process, rows the locator misses fall back to ST_Covers in the staging table
+            locator = resources.subzone_locator
+            untagged = [row for row in batch if row["subzone_id"] is None]
+            if untagged and locator.loaded:
+                regions = locator.locate([row["latitude"] for row in untagged], [row["longitude"] for row in untagged])
+                for row, region in zip(untagged, regions):
+                    if region:
+                        row["subzone_id"] = region["subzone_id"]
+                        row["planning_area_id"] = row["planning_area_id"] or region["planning_area_id"]
+
+            try:
+                result = await crud_issues.bulk_create_issues(resources=resources, rows=batch)
+            except DataError as e:
+                # A value validation did not catch, the batch was rolled back as a whole
+                errors.extend({"row": row["row_no"], "error": f"Batch rejected by the database: {str(e)}"} for row in batch)
+                batch = []
+                return
+            inserted += result["inserted"]
+            errors.extend(result["errors"])
+            if not await _index_issues(resources, result["issue_ids"]):
+                not_indexed += result["inserted"]
+            batch = []
+
+    for row_no, raw in _read_bulk_rows(file, fmt):
+        try:
+            row = IssueBulkRow(**_decode_bulk_row(raw))
+        except ValidationError as e:
+            errors.append({"row": row_no, "error": "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())})
+            continue
+        except (ValueError, TypeError) as e:
+            errors.append({"row": row_no, "error": str(e)})
+            continue
+
+        batch.append({"row_no": row_no, **row.dict()})
+        if len(batch) >= BULK_BATCH_ROWS:
+            await flush()
+
+    await flush()
+
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "inserted": inserted,
+        "not_indexed": not_indexed,
+        "failed": len(errors),
+        "errors": errors[:BULK_MAX_REPORTED_ERRORS],
+        "errors_truncated": len(errors) > BULK_MAX_REPORTED_ERRORS
+    }
 
 
 async def submit_issue_report(resources: Resources, issue: IssueReport):
@@ -0,0 +1,168 @@
+import io
+import os
+import asyncio
+import logging
+import psycopg
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+from backend.data_stores.resources import Resources
+from backend.crud import media as crud_media
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the notify_media_derivatives_requested() trigger function, payload issue_media_id
+CHANNEL = "media_derivatives_requested"
+RECONNECT_DELAY_SECONDS = 5
+
+# Images left without variants (inserted while no worker was listening, released after a failed
+# render, or claimed by a worker that died) are picked up on (re)connect and by a periodic sweep
+CATCH_UP_BATCH = 500
+CATCH_UP_INTERVAL_SECONDS = 5 * 60
+
+# Failed renders after which an image is recorded as failed instead of retried
+MAX_RENDER_ATTEMPTS = 5
+
+# name -> (longest side in pixels, WebP quality). Feed lists show "thumb", detail views "medium".
+VARIANTS = {
+    "thumb": (320, 70),
+    "medium": (1080, 80),
+}
+
+
+def variant_object_name(object_name: str, variant: str) -> str:
+    # Stored next to the original: reports/1/abc.jpg -> reports/1/abc.thumb.webp
+    base, _ = os.path.splitext(object_name)
+    return f"{base}.{variant}.webp"
+
+
+def render_variants(original: bytes) -> dict[str, tuple[bytes, int, int]]:
+    """
+    {<variant>: (webp bytes, width, height)}. CPU bound, runs off the event loop.
+    Images already smaller than a variant are re-encoded at their own size, never upscaled.
+    """
+    with Image.open(io.BytesIO(original)) as image:
+        # Phone photos carry their rotation in EXIF, bake it in since WebP variants drop it
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        rendered = {}
+        for name, (max_side, quality) in VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            variant.save(buffer, format="WEBP", quality=quality, method=4)
+            rendered[name] = (buffer.getvalue(), variant.width, variant.height)
+        return rendered
+
+
+class MediaDerivativeWorker:
+    """
+    Renders resized WebP variants of every newly inserted image, stores them next to the
+    original and records them in issue_media_assets.metadata["variants"]. Content-addressed
+    images are rendered once per file, later attachments reuse media_objects.derived["variants"].
+
+    Every backend worker listens, rows are claimed in the database so each image is rendered once.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue[int] = asyncio.Queue()
+        # One rendering thread per process keeps resizing from competing with request handling
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-derivatives")
+
+    async def run(self, resources: Resources, dsn: str) -> None:
+        consumer = asyncio.create_task(self.consume(resources))
+        sweeper = asyncio.create_task(self.sweep(resources))
+        try:
+            await self.listen(resources, dsn)
+        finally:
+            consumer.cancel()
+            sweeper.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def listen(self, resources: Resources, dsn: str) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    for issue_media_id in await crud_media.get_media_pending_derivatives(resources, CATCH_UP_BATCH):
+                        self.queue.put_nowait(issue_media_id)
+                    async for notify in conn.notifies():
+                        try:
+                            self.queue.put_nowait(int(notify.payload))
+                        except ValueError:
+                            continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Media derivative listener failed: {str(e)}. Retrying in {RECONNECT_DELAY_SECONDS}s.")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def sweep(self, resources: Resources) -> None:
+        while True:
+            await asyncio.sleep(CATCH_UP_INTERVAL_SECONDS)
+            try:
+                for issue_media_id in await crud_media.get_media_pending_derivatives(resources, CATCH_UP_BATCH):
+                    self.queue.put_nowait(issue_media_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Media derivative sweep failed: {str(e)}")
+
+    async def consume(self, resources: Resources) -> None:
+        while True:
+            issue_media_id = await self.queue.get()
+            try:
+                await self.process(resources, issue_media_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Rendering variants of media {issue_media_id} failed: {str(e)}")
+                await self.release(resources, issue_media_id, str(e))
+
+    async def release(self, resources: Resources, issue_media_id: int, error: str) -> None:
+        """
+        Release the claim so the next sweep retries the image, or record it as failed once it
+        has used up its attempts. If the database is what failed, the claim simply expires.
+        """
+        try:
+            attempts = await crud_media.release_media_claim(resources, issue_media_id, error)
+            if attempts >= MAX_RENDER_ATTEMPTS:
+                await crud_media.record_media_variants(resources, issue_media_id, {}, error=error)
+        except Exception as e:
+            logger.error(f"Releasing media {issue_media_id} failed: {str(e)}")
+
+    async def process(self, resources: Resources, issue_media_id: int) -> None:
+        media = await crud_media.claim_media_for_derivatives(resources, issue_media_id)
+        if media is None:
+            return
+
+        bucket_name, object_name = crud_media.object_location(media["file_path"])
+        object_name = (media["metadata"] or {}).get("object_name", object_name)
+        media_object = await crud_media.get_media_object(resources, media["sha256"]) if media["sha256"] else None
+        if media_object:
+            cached_variants = media_object["derived"].get("variants")
+            if cached_variants:
+                await crud_media.record_media_variants(resources, issue_media_id, cached_variants)
+                return
+            bucket_name, object_name = media_object["bucket_name"], media_object["object_name"]
+
+        original = await crud_media.read_object_from_os(resources, bucket_name, object_name)
+
+        loop = asyncio.get_running_loop()
+        try:
+            rendered = await loop.run_in_executor(self.executor, render_variants, original)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            # Not a decodable image, record that instead of retrying forever
+            await crud_media.record_media_variants(resources, issue_media_id, {}, error=str(e))
+            return
+
+        variants = {}
+        for name, (data, width, height) in rendered.items():
+            variant_name = variant_object_name(object_name, name)
+            file_path = await crud_media.upload_stream_to_os(
+                resources, bucket_name, variant_name, io.BytesIO(data), length=len(data), content_type="image/webp"
+            )
+            variants[name] = {"file_path": file_path, "width": width, "height": height, "size": len(data), "content_type": "image/webp"}
+
+        await crud_media.record_media_variants(resources, issue_media_id, variants)
+        if media_object:
+            await crud_media.set_media_derived(resources, media_object["sha256"], "variants", variants)
+        logger.info(f"Rendered {len(variants)} variants of media {issue_media_id}.")
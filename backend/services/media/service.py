@@ -0,0 +1,173 @@
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from minio.error import S3Error
+from config.config import config
+from backend.data_stores.resources import Resources
+from backend.crud import issues as crud_issues
+from backend.crud import media as crud_media
+from backend.models.media import MediaUploadRequest
+
+OS_CONFIG = config.data_stores.object_storage
+
+UPLOAD_URL_EXPIRY = timedelta(minutes=15)
+MAX_UPLOADS_PER_REQUEST = 10
+MAX_MEDIA_BYTES = 20 * 1024 * 1024
+
+# content type -> (media_type, extension, leading bytes every such file starts with)
+ALLOWED_MEDIA_TYPES = {
+    "image/jpeg": ("image", ".jpg", b"\xff\xd8\xff"),
+    "image/png": ("image", ".png", b"\x89PNG\r\n\x1a\n"),
+    "image/webp": ("image", ".webp", b"RIFF"),
+}
+MAGIC_BYTES_LENGTH = 12
+
+# Clients PUT to a one-off staging key carrying the declared hash. Only the server writes the
+# content address (crud_media.content_object_name), by copying a staged upload once it passed
+# every check, so a presigned URL can never overwrite media that was already verified.
+# Every file is uploaded and checked, even when its content is already stored: attaching by hash
+# alone would hand stored media to anyone who knows its digest, and say which digests exist.
+STAGING_OBJECT_NAME = re.compile(r"^uploads/(\d+)/[0-9a-f]{32}/([0-9a-f]{64})(\.jpg|\.png|\.webp)$")
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    """
+    The allowed content type a file's first MAGIC_BYTES_LENGTH bytes identify, or None.
+    """
+    for content_type, (_, _, magic) in ALLOWED_MEDIA_TYPES.items():
+        if head.startswith(magic) and (content_type != "image/webp" or head[8:12] == b"WEBP"):
+            return content_type
+    return None
+
+
+def staging_object_name(issue_id: int, sha256: str, extension: str) -> str:
+    return f"uploads/{issue_id}/{uuid.uuid4().hex}/{sha256}{extension}"
+
+
+async def create_media_uploads(resources: Resources, issue_id: int, files: list[MediaUploadRequest]) -> list[dict]:
+    """
+    [
+        {
+            "sha256": <string>,
+            "object_name": <string>,
+            "upload_url": <presigned PUT url>,
+            "method": "PUT",
+            "headers": {"Content-Type": <string>},      # must be sent with the PUT
+            "expires_at": <iso datetime>
+        },
+        ...
+    ]
+
+    Presigned URLs the client PUTs each file to directly, then reports back through
+    complete_media_upload. The bytes never pass through the backend.
+    """
+    if len(files) > MAX_UPLOADS_PER_REQUEST:
+        raise ValueError(f"At most {MAX_UPLOADS_PER_REQUEST} files per request.")
+    for file in files:
+        if file.content_type not in ALLOWED_MEDIA_TYPES:
+            raise ValueError(f"Unsupported content type: {file.content_type}")
+        if file.size > MAX_MEDIA_BYTES:
+            raise ValueError(f"Files must not exceed {MAX_MEDIA_BYTES} bytes.")
+    if not await crud_issues.issue_exists(resources, issue_id):
+        raise ValueError(f"Issue {issue_id} not found.")
+
+    expires_at = datetime.now(timezone.utc) + UPLOAD_URL_EXPIRY
+    uploads = []
+    for file in files:
+        _, extension, _ = ALLOWED_MEDIA_TYPES[file.content_type]
+        object_name = staging_object_name(issue_id, file.sha256, extension)
+        upload_url = crud_media.presign_upload_url(resources, OS_CONFIG.bucket_name, object_name, UPLOAD_URL_EXPIRY)
+        uploads.append({
+            "sha256": file.sha256,
+            "object_name": object_name,
+            "upload_url": upload_url,
+            "method": "PUT",
+            "headers": {"Content-Type": file.content_type},
+            "expires_at": expires_at.isoformat()
+        })
+    return uploads
+
+
+async def complete_media_upload(resources: Resources, issue_id: int, object_name: str) -> dict:
+    """
+    {"issue_id": <integer>, "sha256": <string>, "file_path": <string>, "media_type": <string>, "size": <integer>, "content_type": <string>}
+
+    Checks a staged upload (it must belong to this issue, fit the size limit, really be the image
+    its content type claims and hash to the SHA-256 it was declared with), copies it to its content
+    address unless that content is already stored, and records it. The staged object is deleted
+    whether or not it passed, and attaching the same file to the issue again is a no-op.
+    """
+    staging = STAGING_OBJECT_NAME.match(object_name)
+    if staging is None:
+        raise ValueError("Not a media upload object name.")
+    if int(staging.group(1)) != issue_id:
+        raise ValueError("Object does not belong to this issue.")
+    sha256 = staging.group(2)
+    if not await crud_issues.issue_exists(resources, issue_id):
+        raise ValueError(f"Issue {issue_id} not found.")
+
+    await verify_staged_upload(resources, object_name, sha256)
+    media_object = await crud_media.get_media_object(resources, sha256)
+
+    content_type = media_object["content_type"]
+    allowed = ALLOWED_MEDIA_TYPES.get(content_type)
+    if allowed is None:
+        raise ValueError(f"Unsupported content type: {content_type}")
+    media_type = allowed[0]
+    file_path = crud_media.object_url(resources, media_object["bucket_name"], media_object["object_name"])
+    await crud_media.map_media_to_issue(
+        resources=resources,
+        issue_id=issue_id,
+        media_type=media_type,
+        file_path=file_path,
+        metadata={"object_name": media_object["object_name"], "size": media_object["size"], "content_type": content_type},
+        sha256=sha256
+    )
+
+    return {
+        "issue_id": issue_id, "sha256": sha256, "file_path": file_path, "media_type": media_type,
+        "size": media_object["size"], "content_type": content_type
+    }
+
+
+async def verify_staged_upload(resources: Resources, staging_name: str, sha256: str) -> None:
+    """
+    Check a staged upload and, if it passes and the content is not stored yet, copy it to its
+    content address and register it. The staged object is deleted either way, a rejected upload
+    raises ValueError.
+    """
+    bucket_name = OS_CONFIG.bucket_name
+    stat = await crud_media.stat_object_in_os(resources, bucket_name, staging_name)
+    if stat is None:
+        raise ValueError("Upload not found, PUT the file to the upload URL first.")
+
+    content_type = (stat.content_type or "").split(";")[0].strip().lower()
+    allowed = ALLOWED_MEDIA_TYPES.get(content_type)
+    problem = None
+    if allowed is None or not staging_name.endswith(allowed[1]):
+        problem = f"Unsupported or mismatched content type: {content_type or 'none'}"
+    elif not 0 < stat.size <= MAX_MEDIA_BYTES:
+        problem = f"Files must be between 1 and {MAX_MEDIA_BYTES} bytes."
+    else:
+        head = await crud_media.read_object_head_from_os(resources, bucket_name, staging_name, MAGIC_BYTES_LENGTH)
+        if not head.startswith(allowed[2]) or (content_type == "image/webp" and head[8:12] != b"WEBP"):
+            problem = f"File content is not {content_type}."
+        elif await crud_media.hash_object_in_os(resources, bucket_name, staging_name) != sha256:
+            problem = "File content does not match its SHA-256."
+
+    try:
+        if problem:
+            raise ValueError(problem)
+        if await crud_media.get_media_object(resources, sha256):
+            return
+        # Copy the exact version that was hashed, a PUT to the staging URL after the check cannot slip through
+        object_name = crud_media.content_object_name(sha256, allowed[1])
+        try:
+            await crud_media.copy_object_in_os(resources, bucket_name, staging_name, object_name, source_etag=stat.etag)
+        except S3Error as e:
+            if e.code == "PreconditionFailed":
+                raise ValueError("Upload changed while it was being checked, upload it again.")
+            raise
+        await crud_media.register_media_object(resources, sha256, bucket_name, object_name, content_type, stat.size)
+    finally:
+        await crud_media.delete_file_from_os(resources, bucket_name, staging_name)
@@ -0,0 +1,45 @@
+from backend.data_stores.resources import Resources
+from backend.data_stores.response_cache import snap_to_cell, feed_cache_key
+from backend.crud import posts as crud_posts
+
+FORUM_FEED_RADIUS_M = 2000
+
+async def fetch_forum_posts(resources: Resources, lat: float, lon: float, radius: int = FORUM_FEED_RADIUS_M):
+    """
+    Forum feed around a location, served from resources.feed_cache when possible.
+
+    The location is snapped to its feed cell and the feed is computed for the cell centre,
+    so every user in the cell shares one entry. Entries are evicted by the
+    feed cache invalidation triggers when a post, issue or media row within `radius` changes.
+    """
+    cell_y, cell_x, centre_lat, centre_lon = snap_to_cell(lat, lon)
+    key = feed_cache_key(cell_y, cell_x, radius)
+
+    cached = await resources.feed_cache.get(key)
+    if cached is not None:
+        return cached
+
+    posts = await crud_posts.get_forum_posts(resources=resources, user_lat=centre_lat, user_lon=centre_lon, radius_meters=radius)
+
+    # Plain JSON types only, so cache hits and misses serialise identically
+    formatted_posts = [
+        {
+            "id": post["post_id"],
+            "title": post["title"],
+            "description": post["description"],
+            "latitude": post["latitude"],
+            "longitude": post["longitude"],
+            "severity": post["severity"],
+            "status": post["status"],
+            "created_at": post["created_at"].isoformat() if post["created_at"] else None,
+            "likes": post["like_count"],
+            "dislikes": post["dislike_count"],
+            "comment_count": post["comment_count"],
+            "image": f"/{post['file_path']}" if post["file_path"] else None
+        }
+        for post in posts
+    ]
+    response = {"posts": formatted_posts}
+
+    await resources.feed_cache.set(key, centre_lat, centre_lon, radius, response)
+    return response
@@ -2,8 +2,25 @@ from backend.crud import regions as crud_regions
 from backend.data_stores.resources import Resources
 
 class RegionInfoModule:
+    """
+    Region context for a forecast, from the in-process region metadata when loaded
+    and from the region_metadata table otherwise.
+    """
+
     async def fetch_subzone_centroid(self, resources: Resources, subzone_name: str):
+        if resources.reference_data.loaded:
+            region = resources.reference_data.regions_by_subzone_name.get(subzone_name)
+            return {"latitude": region["subzone_latitude"], "longitude": region["subzone_longitude"]} if region else None
         return await crud_regions.get_subzone_centroid(resources=resources, params={"subzone_name": subzone_name})
 
     async def fetch_planning_area_info_from_subzone(self, resources: Resources, subzone_name: str):
+        if resources.reference_data.loaded:
+            region = resources.reference_data.regions_by_subzone_name.get(subzone_name)
+            if not region:
+                return None
+            return {
+                "planning_area_id": region["planning_area_id"],
+                "planning_area_name": region["planning_area_name"],
+                "planning_area_area_sq_m": region["planning_area_area_sq_m"]
+            }
         return await crud_regions.get_planning_area_info_from_subzone(resources=resources, params={"subzone_name": subzone_name})
@@ -82,12 +82,12 @@ class STFMIssueCountService:
         # --------------------------------------------------------
         # REGION INFORMATION: Performing analysis and forecasting on a planning area & subzone level
         # --------------------------------------------------------
-        location = await self.region_retrieval.fetch_subzone_centroid(subzone_name)
+        location = await self.region_retrieval.fetch_subzone_centroid(resources, subzone_name)
         latitude, longitude = (location["latitude"], location["longitude"]) if location else (None, None)
 
-        planning_area_info = await self.region_retrieval.fetch_planning_area_info_from_subzone(subzone_name)
-        planning_area_name = planning_area_info["planning_area_name"]
-        
+        planning_area_info = await self.region_retrieval.fetch_planning_area_info_from_subzone(resources, subzone_name)
+        planning_area_name = planning_area_info["planning_area_name"] if planning_area_info else None
+
         if not location or not planning_area_name:
             raise ValueError("Subzone not found")
 
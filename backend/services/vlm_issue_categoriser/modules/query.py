@@ -19,6 +19,7 @@ import textwrap
 from typing import Tuple, List, Optional
 from config.config import config
 from backend.crud import issues as crud_issues
+from backend.data_stores.resources import Resources
 from backend.models.issues import Location 
 # --------------------------------------------------------
 # Logger Setup
@@ -51,7 +52,7 @@ class QueryVLMIssueCategoriser:
         """
         Builds the base system prompt using preloaded data.
         """
-        if not hasattr(self, 'categories') or not hasattr(self, 'agencies') or not hasattr(self, 'town_councils'):
+        if not hasattr(self, 'categories'):
             raise ValueError("Static data not loaded. Please call load_context_data() first.")
 
         categories_text = "\n".join(f"- {entry}" for entry in self.categories)
@@ -147,8 +148,11 @@ class QueryVLMIssueCategoriser:
         images: Optional[List[Tuple[str, Tuple[str, bytes, str]]]] = None,
     ) -> dict:
         try:
-            user_content = [{"type": "text", "text": text}, {"type": "text", "text": f"{location.address} (Latitude: {location.latitude}, Longitude: {location.longitude})"}]
-            for _ in images:
+            user_content = [{"type": "text", "text": text}]
+            # The chatbot form has no coordinates, only the description and images
+            if location:
+                user_content.append({"type": "text", "text": f"{location.address} (Latitude: {location.latitude}, Longitude: {location.longitude})"})
+            for _ in images or []:
                 user_content.append({"type": "image"})
 
             messages = [
@@ -175,18 +179,19 @@ class QueryVLMIssueCategoriser:
             logger.error(f"Failed to query VLM Issue Categoriser: {e}")
             raise
 
-    async def load_context_data(self):
+    async def load_context_data(self, resources: Resources):
         """
-        Preloads issue categories into memory.
-        This should be called once at app startup.
+        Loads issue categories from the reference data cache, or from the database while the cache is cold.
+        Called before every categorisation, so category changes reach the prompt without a restart.
         """
         # Load categories
-        issue_subtypes = await crud_issues.fetch_issue_subtype()
+        issue_subtypes = await crud_issues.fetch_issue_subtypes(resources)
         self.categories = [
-            f"{subtype['name']}: {subtype.get('description', 'No description provided')}"
+            f"{subtype['name']}: {subtype.get('description') or 'No description provided'}"
             for subtype in issue_subtypes
         ]
         self.category_names = [subtype['name'] for subtype in issue_subtypes]  # pure names, no description
+        self.subtypes_by_name = {subtype['name']: subtype for subtype in issue_subtypes}  # resolves the names the VLM answers with
 
         logger.info("Static data loaded successfully: Categories.")
 
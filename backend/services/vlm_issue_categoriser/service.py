@@ -54,21 +54,22 @@ class VLMIssueCategoriserService:
         logger.info("LOADING MODULE | Model Query Engine...")
         self.query_service = QueryVLMIssueCategoriser()
         
-    async def setup(self):
-        await self.query_service.load_context_data()
+    async def setup(self, resources: Resources):
+        await self.query_service.load_context_data(resources)
         await self.query_service.create_prompt()
     
     async def run(self, resources: Resources, description: str, location: Optional[Location] = None, images: Optional[List[UploadFile]] = None) -> dict:
 
+        # Categories are re-read on every run, so edits made since the last one are offered to the model
+        await self.setup(resources)
+
         # Validate and load the images if any
         allowed_types = ["image/jpeg", "image/jpg", "image/png"]
-        if images:
-            for i, file in enumerate(images):
-                if file.content_type in allowed_types:
-                    data = file.file.read()
-                    image = Image.open(io.BytesIO(data)).convert("RGB")
-                    images[i] = image
-                    images.append(image)
+        uploads, images = images or [], []
+        for file in uploads:
+            if file.content_type in allowed_types:
+                data = file.file.read()
+                images.append(Image.open(io.BytesIO(data)).convert("RGB"))
 
         # --------------------------------------------------------
         # LOCATION EXTRACTOR: If for some reason, location is not provided, extract the location information from image metadata
@@ -106,7 +107,7 @@ class VLMIssueCategoriserService:
 
         response = await self.query_service.categorise(text=full_text, location=location, images=image_buffers)
 
-        return self._finalise_response(response)
+        return await self._finalise_response(response)
 
     async def _finalise_response(self, response: dict) -> dict: 
         title = response.get("title")
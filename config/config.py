@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, List, Any
 from pydantic import BaseModel
 import yaml
 from dotenv import load_dotenv
@@ -91,12 +91,32 @@ class AIModelsConfig(BaseModel):
     vlm_issue_categoriser: VLMServiceConfig
     forecast_model_issue_count: URLServiceConfig
 
+class RelationalDBPoolConfig(BaseModel):
+    min_size: int = 4                       # per uvicorn worker, so total connections = workers x max_size
+    max_size: int = 20
+    timeout: float = 30.0                   # seconds a request may wait for a connection
+    max_waiting: int = 0                    # queued requests before rejecting, 0 for unlimited
+    max_lifetime: float = 3600.0            # seconds before a connection is recycled
+    max_idle: float = 600.0                 # seconds an idle connection above min_size is kept
+    prepare_threshold: Optional[int] = 5    # executions before a query is prepared server-side, None to disable
+    prepared_max: int = 100                 # prepared statements kept per connection
+
+class RelationalDBReplicaConfig(BaseModel):
+    host: str
+    port: int
+    database: Optional[str] = None          # defaults to the primary's database and credentials
+    user: Optional[str] = None
+    password: Optional[str] = None
+
 class RelationalDBConfig(BaseModel):
     host: str
     port: int
     database: str
     user: str
     password: str
+    pool: RelationalDBPoolConfig = RelationalDBPoolConfig()
+    replicas: List[RelationalDBReplicaConfig] = []      # read-only CRUD goes here, empty reads from the primary
+    read_your_writes_seconds: int = 5                   # how long a client reads from the primary after a write
 
 class ObjectStorageConfig(BaseModel):
     endpoint: str
@@ -104,6 +124,15 @@ class ObjectStorageConfig(BaseModel):
     secret_key: str
     bucket_name: str
     url: str
+    upload_part_size: int = 8 * 1024 * 1024     # multipart chunk size in bytes, MinIO needs at least 5 MiB
+    max_concurrent_uploads: int = 4             # per worker, blocking transfers run on this many threads
+    public_endpoint: Optional[str] = None       # host:port clients reach storage on, for presigned URLs
+    region: str = "us-east-1"
+
+class ResponseCacheConfig(BaseModel):
+    backend: str = "local"      # "local" (in-process LRU) or "postgres" (shared across workers)
+    ttl_seconds: int = 30
+    max_entries: int = 1024
 
 class VectorstoreCollectionConfig(BaseModel):
     name: str
@@ -117,6 +146,8 @@ class DataStoresConfig(BaseModel):
     relational_db: RelationalDBConfig
     object_storage: ObjectStorageConfig
     vectorstore: VectorstoreConfig
+    response_cache: ResponseCacheConfig = ResponseCacheConfig()
+    readiness_timeout: float = 10.0     # seconds each data store may take to answer its startup check
 
 class BackendConfig(BaseModel):
     port: int
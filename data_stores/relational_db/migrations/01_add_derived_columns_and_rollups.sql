@@ -0,0 +1,67 @@
+-- Bring a database created before the rollups and denormalised columns up to the schema the
+-- partitioning migration (02) expects: category id arrays, grid cells and the search vector on issues,
+-- vote/comment counters on forum_posts and comments, and the daily_issue_counts, feed_cache and
+-- region_metadata tables. Fresh databases get all of these from init.
+--
+-- Run once from this folder with psql, before 02_partition_issues_and_chat_sessions.sql:
+--   psql -v ON_ERROR_STOP=1 -h $POSTGRES_HOST -U $POSTGRES_USER -d $POSTGRES_DB -f 01_add_derived_columns_and_rollups.sql
+
+BEGIN;
+
+-- The backfill below updates every issue, which is not an edit anyone needs to be told about
+SET LOCAL hualaowei.skip_issue_webhook = 'on';
+
+-- 1. New columns. Generated columns are computed for existing rows as they are added.
+ALTER TABLE issues
+  ADD COLUMN IF NOT EXISTS grid_x INTEGER GENERATED ALWAYS AS (floor(longitude / 0.0009)::integer) STORED,
+  ADD COLUMN IF NOT EXISTS grid_y INTEGER GENERATED ALWAYS AS (floor(latitude / 0.0009)::integer) STORED,
+  ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(description, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(address, '')), 'B')
+  ) STORED,
+  ADD COLUMN IF NOT EXISTS issue_type_ids INTEGER[] NOT NULL DEFAULT '{}',
+  ADD COLUMN IF NOT EXISTS issue_subtype_ids INTEGER[] NOT NULL DEFAULT '{}';
+
+ALTER TABLE forum_posts
+  ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS dislike_count INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE comments
+  ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS dislike_count INTEGER NOT NULL DEFAULT 0;
+
+-- 2. New tables, and the indexes added to existing ones (the CREATE TABLEs are no-ops there).
+--    Indexes on issues are left to 02, which rebuilds the table.
+\ir ../schema/tables/06_subzones.sql
+\ir ../schema/tables/16_forum_posts.sql
+\ir ../schema/tables/17_comments.sql
+\ir ../schema/tables/18_votes.sql
+\ir ../schema/tables/20_daily_issue_counts.sql
+\ir ../schema/tables/21_feed_cache.sql
+\ir ../schema/tables/22_region_metadata.sql
+
+-- 3. Functions that maintain them. 02 recreates these against the partitioned issues table.
+\ir ../schema/functions/01_update_issue_timestamp_function.sql
+\ir ../schema/functions/04_sync_daily_issue_counts.sql
+\ir ../schema/functions/05_notify_reference_data_changed.sql
+\ir ../schema/functions/06_sync_issue_category_ids.sql
+\ir ../schema/functions/07_sync_vote_and_comment_counts.sql
+\ir ../schema/functions/08_notify_feed_cache_invalidated.sql
+\ir ../schema/functions/09_sync_region_metadata.sql
+
+-- 4. Backfill before the triggers exist, so nothing is counted twice
+SELECT rebuild_issue_category_ids();
+SELECT rebuild_vote_and_comment_counts();
+SELECT rebuild_daily_issue_counts();
+SELECT rebuild_region_metadata();
+
+-- 5. Triggers, so writes made between this migration and 02 keep everything in step
+\ir ../schema/triggers/05_sync_daily_issue_counts.sql
+\ir ../schema/triggers/06_notify_reference_data_changed.sql
+\ir ../schema/triggers/07_sync_issue_category_ids.sql
+\ir ../schema/triggers/08_sync_vote_and_comment_counts.sql
+\ir ../schema/triggers/09_notify_feed_cache_invalidated.sql
+\ir ../schema/triggers/10_sync_region_metadata.sql
+
+COMMIT;
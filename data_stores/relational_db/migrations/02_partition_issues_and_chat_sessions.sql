@@ -0,0 +1,132 @@
+-- Convert an existing database from unpartitioned issues / chat_sessions to the monthly
+-- partitioned tables in schema/tables. Fresh databases get the partitioned tables from init.
+--
+-- Run once from this folder with psql, after 01_add_derived_columns_and_rollups.sql,
+-- in a maintenance window (both tables are locked throughout):
+--   psql -v ON_ERROR_STOP=1 -h $POSTGRES_HOST -U $POSTGRES_USER -d $POSTGRES_DB -f 02_partition_issues_and_chat_sessions.sql
+
+BEGIN;
+
+LOCK TABLE issues, chat_sessions IN ACCESS EXCLUSIVE MODE;
+
+-- 1. Move the old tables, their indexes and sequences aside so the new ones can take their names
+ALTER TABLE issues RENAME TO issues_unpartitioned;
+ALTER TABLE chat_sessions RENAME TO chat_sessions_unpartitioned;
+ALTER SEQUENCE issues_issue_id_seq RENAME TO issues_issue_id_seq_unpartitioned;
+ALTER SEQUENCE chat_sessions_chat_id_seq RENAME TO chat_sessions_chat_id_seq_unpartitioned;
+
+DO $$
+DECLARE
+  idx RECORD;
+BEGIN
+  FOR idx IN
+    SELECT c.relname
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid IN ('issues_unpartitioned'::regclass, 'chat_sessions_unpartitioned'::regclass)
+  LOOP
+    EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.relname, left(idx.relname, 45) || '_unpartitioned');
+  END LOOP;
+END;
+$$;
+
+-- 2. Create the partitioned tables, then monthly partitions covering every existing row
+\ir ../schema/tables/11_issues.sql
+\ir ../schema/tables/19_chat_sessions.sql
+\ir ../schema/functions/10_manage_partitions.sql
+
+SELECT create_monthly_partitions(
+  'issues',
+  (SELECT MIN(datetime_reported)::date FROM issues_unpartitioned),
+  (SELECT MAX(datetime_reported)::date FROM issues_unpartitioned)
+);
+SELECT create_monthly_partitions(
+  'chat_sessions',
+  (SELECT MIN(created_at)::date FROM chat_sessions_unpartitioned),
+  (SELECT MAX(created_at)::date FROM chat_sessions_unpartitioned)
+);
+
+-- 3. Copy the rows. No triggers exist on the new tables yet, so counters and webhooks are untouched.
+--    Partition keys are now NOT NULL and datetime_updated may not precede datetime_reported.
+INSERT INTO issues (
+  issue_id, user_id, latitude, longitude, address, description, severity, status,
+  datetime_reported, datetime_acknowledged, datetime_closed, datetime_updated,
+  authority_id, planning_area_id, subzone_id, issue_type_ids, issue_subtype_ids, is_public, is_deleted
+)
+SELECT
+  issue_id, user_id, latitude, longitude, address, description, severity, status,
+  COALESCE(datetime_reported, datetime_updated, CURRENT_TIMESTAMP), datetime_acknowledged, datetime_closed,
+  CASE
+    WHEN datetime_updated < COALESCE(datetime_reported, datetime_updated) THEN datetime_reported
+    ELSE datetime_updated
+  END,
+  authority_id, planning_area_id, subzone_id, issue_type_ids, issue_subtype_ids, is_public, is_deleted
+FROM issues_unpartitioned;
+
+INSERT INTO chat_sessions (chat_id, user_id, session_id, sender, message, message_type, created_at, metadata)
+SELECT chat_id, user_id, session_id, sender, message, message_type, COALESCE(created_at, CURRENT_TIMESTAMP), metadata
+FROM chat_sessions_unpartitioned;
+
+SELECT setval(pg_get_serial_sequence('issues', 'issue_id'), COALESCE(MAX(issue_id), 0) + 1, false) FROM issues;
+SELECT setval(pg_get_serial_sequence('chat_sessions', 'chat_id'), COALESCE(MAX(chat_id), 0) + 1, false) FROM chat_sessions;
+
+-- 4. Drop the old tables. CASCADE removes the child foreign keys (replaced by the reference triggers)
+--    and bump_daily_issue_counts_for_issue(), which takes the old row type. Both are recreated below.
+DROP TABLE issues_unpartitioned CASCADE;
+DROP TABLE chat_sessions_unpartitioned CASCADE;
+
+CREATE INDEX IF NOT EXISTS idx_issue_media_assets_issue ON issue_media_assets (issue_id);
+CREATE INDEX IF NOT EXISTS idx_issue_status_history_issue ON issue_status_history (issue_id);
+
+-- 5. Recreate every function and trigger, all of them are idempotent.
+--    Keep this list in step with schema/functions and schema/triggers up to 11, the check at the end enforces it.
+--    Later migrations add their own functions and triggers.
+\ir ../schema/functions/01_update_issue_timestamp_function.sql
+\ir ../schema/functions/02_sync_agencies_with_authorities.sql
+\ir ../schema/functions/03_sync_town_councils_with_authorities.sql
+\ir ../schema/functions/04_sync_daily_issue_counts.sql
+\ir ../schema/functions/05_notify_reference_data_changed.sql
+\ir ../schema/functions/06_sync_issue_category_ids.sql
+\ir ../schema/functions/07_sync_vote_and_comment_counts.sql
+\ir ../schema/functions/08_notify_feed_cache_invalidated.sql
+\ir ../schema/functions/09_sync_region_metadata.sql
+\ir ../schema/functions/11_issue_references.sql
+
+\ir ../schema/triggers/01_update_issue_timestamp_trigger.sql
+\ir ../schema/triggers/02_issue_update_webhook.sql
+\ir ../schema/triggers/03_update_agency_authorities.sql
+\ir ../schema/triggers/04_update_town_council_authorities.sql
+\ir ../schema/triggers/05_sync_daily_issue_counts.sql
+\ir ../schema/triggers/06_notify_reference_data_changed.sql
+\ir ../schema/triggers/07_sync_issue_category_ids.sql
+\ir ../schema/triggers/08_sync_vote_and_comment_counts.sql
+\ir ../schema/triggers/09_notify_feed_cache_invalidated.sql
+\ir ../schema/triggers/10_sync_region_metadata.sql
+\ir ../schema/triggers/11_issue_references.sql
+
+-- Reported dates may have been filled in above
+SELECT rebuild_daily_issue_counts();
+
+-- Fail (and roll back) rather than leave issues without a trigger a schema file defines on it.
+-- Triggers on issues that init creates but this migration misses would otherwise vanish silently.
+DO $$
+DECLARE
+  expected TEXT[] := ARRAY[
+    'update_issue_timestamp_trigger', 'issue_update_trigger',
+    'trg_daily_issue_counts_issue_write', 'trg_daily_issue_counts_issue_delete',
+    'trg_feed_cache_issues', 'trg_issue_restrict_delete', 'trg_issue_cascade_delete',
+    'trg_issue_forbid_reported_change'
+  ];
+  missing TEXT[];
+BEGIN
+  SELECT array_agg(name) INTO missing
+  FROM unnest(expected) AS name
+  WHERE NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = 'issues'::regclass AND tgname = name);
+
+  IF missing IS NOT NULL THEN
+    RAISE EXCEPTION 'Triggers missing on issues after migration: %', missing;
+  END IF;
+END;
+$$;
+
+COMMIT;
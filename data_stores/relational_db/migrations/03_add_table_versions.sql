@@ -0,0 +1,13 @@
+-- Add the table change log behind the ETag / Last-Modified validators (table_versions) to an existing database.
+-- Fresh databases get it from init.
+--
+-- Run once from this folder with psql, after 02_partition_issues_and_chat_sessions.sql:
+--   psql -v ON_ERROR_STOP=1 -h $POSTGRES_HOST -U $POSTGRES_USER -d $POSTGRES_DB -f 03_add_table_versions.sql
+
+BEGIN;
+
+\ir ../schema/tables/23_table_versions.sql
+\ir ../schema/functions/12_bump_table_version.sql
+\ir ../schema/triggers/12_bump_table_version.sql
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- Queue existing and new report images for their thumbnail / WebP variants (backend/services/media/derivatives.py).
+-- Fresh databases get this from init.
+--
+-- Run once from this folder with psql, after 03_add_table_versions.sql:
+--   psql -v ON_ERROR_STOP=1 -h $POSTGRES_HOST -U $POSTGRES_USER -d $POSTGRES_DB -f 04_add_media_variants.sql
+
+BEGIN;
+
+-- Same index as schema/tables/14_issue_media_assets.sql, which cannot be included before 05 adds sha256
+CREATE INDEX IF NOT EXISTS idx_issue_media_assets_pending_variants ON issue_media_assets (issue_media_id)
+    WHERE media_type = 'image' AND (metadata IS NULL OR NOT metadata ? 'variants');
+
+\ir ../schema/functions/13_notify_media_derivatives_requested.sql
+\ir ../schema/triggers/13_notify_media_derivatives_requested.sql
+
+COMMIT;
@@ -0,0 +1,30 @@
+-- Add the content-addressed media store (media_objects) to an existing database. Media stored before
+-- this keeps its file_path and a NULL sha256. Fresh databases get this from init.
+--
+-- Run once from this folder with psql, after 04_add_media_variants.sql:
+--   psql -v ON_ERROR_STOP=1 -h $POSTGRES_HOST -U $POSTGRES_USER -d $POSTGRES_DB -f 05_content_addressed_media.sql
+
+BEGIN;
+
+-- The column first, the table file then creates media_objects and the (issue_id, sha256) index
+ALTER TABLE issue_media_assets ADD COLUMN IF NOT EXISTS sha256 CHAR(64);
+\ir ../schema/tables/14_issue_media_assets.sql
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conrelid = 'issue_media_assets'::regclass AND contype = 'f' AND confrelid = 'media_objects'::regclass
+  ) THEN
+    ALTER TABLE issue_media_assets ADD CONSTRAINT issue_media_assets_sha256_fkey
+      FOREIGN KEY (sha256) REFERENCES media_objects(sha256);
+  END IF;
+END;
+$$;
+
+\ir ../schema/functions/14_sync_media_object_ref_count.sql
+\ir ../schema/triggers/14_sync_media_object_ref_count.sql
+
+SELECT rebuild_media_object_ref_counts();
+
+COMMIT;
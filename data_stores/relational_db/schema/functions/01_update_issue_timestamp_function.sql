@@ -1,15 +1,14 @@
-DO $$
+-- Stamp datetime_updated on every issue update, except the category array sync
+-- (refresh_issue_category_ids), which sets hualaowei.skip_issue_timestamp around its own UPDATE
+-- so mapping writes, bulk imports of history and backfills keep the issue's own timestamp.
+CREATE OR REPLACE FUNCTION update_issue_timestamp()
+RETURNS TRIGGER AS $$
 BEGIN
-  IF NOT EXISTS (
-    SELECT 1 FROM pg_proc WHERE proname = 'update_issue_timestamp'
-  ) THEN
-    CREATE OR REPLACE FUNCTION update_issue_timestamp()
-    RETURNS TRIGGER AS $func$
-    BEGIN
-      NEW.datetime_updated = CURRENT_TIMESTAMP;
-      RETURN NEW;
-    END;
-    $func$ LANGUAGE plpgsql;
+  IF current_setting('hualaowei.skip_issue_timestamp', true) = 'on' THEN
+    RETURN NEW;
   END IF;
+
+  NEW.datetime_updated = CURRENT_TIMESTAMP;
+  RETURN NEW;
 END;
-$$;
+$$ LANGUAGE plpgsql;
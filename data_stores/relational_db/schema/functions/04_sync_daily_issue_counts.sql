@@ -0,0 +1,116 @@
+CREATE OR REPLACE FUNCTION bump_daily_issue_count(
+  p_date DATE,
+  p_subzone_id INTEGER,
+  p_authority_id INTEGER,
+  p_issue_type_id INTEGER,
+  p_issue_subtype_id INTEGER,
+  p_delta INTEGER
+) RETURNS VOID AS $$
+BEGIN
+  IF p_date IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO daily_issue_counts (date, subzone_id, authority_id, issue_type_id, issue_subtype_id, count)
+  VALUES (p_date, p_subzone_id, p_authority_id, p_issue_type_id, p_issue_subtype_id, p_delta)
+  ON CONFLICT (date, subzone_id, authority_id, issue_type_id, issue_subtype_id)
+  DO UPDATE SET count = daily_issue_counts.count + EXCLUDED.count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Apply a delta for an issue at every level (all, per type, per subtype) using its current mappings
+CREATE OR REPLACE FUNCTION bump_daily_issue_counts_for_issue(p_issue issues, p_delta INTEGER) RETURNS VOID AS $$
+BEGIN
+  PERFORM bump_daily_issue_count(p_issue.datetime_reported::date, p_issue.subzone_id, p_issue.authority_id, NULL, NULL, p_delta);
+
+  PERFORM bump_daily_issue_count(p_issue.datetime_reported::date, p_issue.subzone_id, p_issue.authority_id, itim.issue_type_id, NULL, p_delta)
+  FROM issue_type_to_issue_mapping itim
+  WHERE itim.issue_id = p_issue.issue_id;
+
+  PERFORM bump_daily_issue_count(p_issue.datetime_reported::date, p_issue.subzone_id, p_issue.authority_id, isc.issue_type_id, iscm.issue_subtype_id, p_delta)
+  FROM issue_subtype_to_issue_mapping iscm
+  JOIN issue_subtypes isc ON iscm.issue_subtype_id = isc.issue_subtype_id
+  WHERE iscm.issue_id = p_issue.issue_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_daily_issue_counts_from_issues() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM bump_daily_issue_counts_for_issue(NEW, 1);
+  ELSIF TG_OP = 'UPDATE' THEN
+    IF (OLD.datetime_reported::date, OLD.subzone_id, OLD.authority_id)
+       IS DISTINCT FROM (NEW.datetime_reported::date, NEW.subzone_id, NEW.authority_id) THEN
+      PERFORM bump_daily_issue_counts_for_issue(OLD, -1);
+      PERFORM bump_daily_issue_counts_for_issue(NEW, 1);
+    END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    -- Runs BEFORE DELETE so the mappings are still visible ahead of the cascade
+    PERFORM bump_daily_issue_counts_for_issue(OLD, -1);
+    RETURN OLD;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_daily_issue_counts_from_type_mapping() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM bump_daily_issue_count(i.datetime_reported::date, i.subzone_id, i.authority_id, OLD.issue_type_id, NULL, -1)
+    FROM issues i
+    WHERE i.issue_id = OLD.issue_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM bump_daily_issue_count(i.datetime_reported::date, i.subzone_id, i.authority_id, NEW.issue_type_id, NULL, 1)
+    FROM issues i
+    WHERE i.issue_id = NEW.issue_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_daily_issue_counts_from_subtype_mapping() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM bump_daily_issue_count(i.datetime_reported::date, i.subzone_id, i.authority_id, isc.issue_type_id, OLD.issue_subtype_id, -1)
+    FROM issues i
+    JOIN issue_subtypes isc ON isc.issue_subtype_id = OLD.issue_subtype_id
+    WHERE i.issue_id = OLD.issue_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM bump_daily_issue_count(i.datetime_reported::date, i.subzone_id, i.authority_id, isc.issue_type_id, NEW.issue_subtype_id, 1)
+    FROM issues i
+    JOIN issue_subtypes isc ON isc.issue_subtype_id = NEW.issue_subtype_id
+    WHERE i.issue_id = NEW.issue_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full rebuild from the raw tables, for backfilling an existing database or repairing drift
+CREATE OR REPLACE FUNCTION rebuild_daily_issue_counts() RETURNS VOID AS $$
+BEGIN
+  TRUNCATE daily_issue_counts;
+
+  INSERT INTO daily_issue_counts (date, subzone_id, authority_id, issue_type_id, issue_subtype_id, count)
+  SELECT i.datetime_reported::date, i.subzone_id, i.authority_id, NULL, NULL, COUNT(*)
+  FROM issues i
+  WHERE i.datetime_reported IS NOT NULL
+  GROUP BY 1, 2, 3;
+
+  INSERT INTO daily_issue_counts (date, subzone_id, authority_id, issue_type_id, issue_subtype_id, count)
+  SELECT i.datetime_reported::date, i.subzone_id, i.authority_id, itim.issue_type_id, NULL, COUNT(*)
+  FROM issues i
+  JOIN issue_type_to_issue_mapping itim ON itim.issue_id = i.issue_id
+  WHERE i.datetime_reported IS NOT NULL
+  GROUP BY 1, 2, 3, 4;
+
+  INSERT INTO daily_issue_counts (date, subzone_id, authority_id, issue_type_id, issue_subtype_id, count)
+  SELECT i.datetime_reported::date, i.subzone_id, i.authority_id, isc.issue_type_id, iscm.issue_subtype_id, COUNT(*)
+  FROM issues i
+  JOIN issue_subtype_to_issue_mapping iscm ON iscm.issue_id = i.issue_id
+  JOIN issue_subtypes isc ON iscm.issue_subtype_id = isc.issue_subtype_id
+  WHERE i.datetime_reported IS NOT NULL
+  GROUP BY 1, 2, 3, 4, 5;
+END;
+$$ LANGUAGE plpgsql;
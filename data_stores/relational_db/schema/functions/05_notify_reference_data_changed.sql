@@ -0,0 +1,7 @@
+-- Tells backend workers to reload their in-process reference data cache (backend/data_stores/reference_data.py)
+CREATE OR REPLACE FUNCTION notify_reference_data_changed() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('reference_data_changed', TG_TABLE_NAME);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,44 @@
+-- Recompute the denormalised category arrays on issues from the mapping tables.
+-- A derived value, not an edit of the issue: datetime_updated is left alone (see update_issue_timestamp()).
+CREATE OR REPLACE FUNCTION refresh_issue_category_ids(p_issue_ids INTEGER[]) RETURNS VOID AS $$
+DECLARE
+  previous_skip TEXT := current_setting('hualaowei.skip_issue_timestamp', true);
+BEGIN
+  PERFORM set_config('hualaowei.skip_issue_timestamp', 'on', true);
+
+  UPDATE issues i
+  SET issue_type_ids = ARRAY(
+        SELECT itim.issue_type_id FROM issue_type_to_issue_mapping itim
+        WHERE itim.issue_id = i.issue_id ORDER BY itim.issue_type_id
+      ),
+      issue_subtype_ids = ARRAY(
+        SELECT iscm.issue_subtype_id FROM issue_subtype_to_issue_mapping iscm
+        WHERE iscm.issue_id = i.issue_id ORDER BY iscm.issue_subtype_id
+      )
+  WHERE i.issue_id = ANY(p_issue_ids);
+
+  -- Restore, so later updates in the same transaction are stamped as usual
+  PERFORM set_config('hualaowei.skip_issue_timestamp', COALESCE(previous_skip, 'off'), true);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level so a multi-row mapping insert (e.g. bulk ingestion) updates each issue once
+CREATE OR REPLACE FUNCTION sync_issue_category_ids() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM refresh_issue_category_ids(ARRAY(SELECT DISTINCT issue_id FROM new_rows));
+  ELSIF TG_OP = 'UPDATE' THEN
+    PERFORM refresh_issue_category_ids(ARRAY(SELECT issue_id FROM old_rows UNION SELECT issue_id FROM new_rows));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM refresh_issue_category_ids(ARRAY(SELECT DISTINCT issue_id FROM old_rows));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full rebuild, for backfilling an existing database or repairing drift
+CREATE OR REPLACE FUNCTION rebuild_issue_category_ids() RETURNS VOID AS $$
+BEGIN
+  PERFORM refresh_issue_category_ids(ARRAY(SELECT issue_id FROM issues));
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,63 @@
+-- Each trigger applies a +/-1 delta with a single UPDATE, so the row lock keeps concurrent votes consistent
+
+CREATE OR REPLACE FUNCTION sync_post_vote_counts() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE forum_posts
+    SET like_count = like_count - CASE WHEN OLD.vote_type = 1 THEN 1 ELSE 0 END,
+        dislike_count = dislike_count - CASE WHEN OLD.vote_type = -1 THEN 1 ELSE 0 END
+    WHERE post_id = OLD.post_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE forum_posts
+    SET like_count = like_count + CASE WHEN NEW.vote_type = 1 THEN 1 ELSE 0 END,
+        dislike_count = dislike_count + CASE WHEN NEW.vote_type = -1 THEN 1 ELSE 0 END
+    WHERE post_id = NEW.post_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_comment_vote_counts() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE comments
+    SET like_count = like_count - CASE WHEN OLD.vote_type = 1 THEN 1 ELSE 0 END,
+        dislike_count = dislike_count - CASE WHEN OLD.vote_type = -1 THEN 1 ELSE 0 END
+    WHERE comment_id = OLD.comment_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE comments
+    SET like_count = like_count + CASE WHEN NEW.vote_type = 1 THEN 1 ELSE 0 END,
+        dislike_count = dislike_count + CASE WHEN NEW.vote_type = -1 THEN 1 ELSE 0 END
+    WHERE comment_id = NEW.comment_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_post_comment_count() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE forum_posts SET comment_count = comment_count - 1 WHERE post_id = OLD.post_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE forum_posts SET comment_count = comment_count + 1 WHERE post_id = NEW.post_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full rebuild from the vote and comment tables, for backfilling an existing database or repairing drift
+CREATE OR REPLACE FUNCTION rebuild_vote_and_comment_counts() RETURNS VOID AS $$
+BEGIN
+  UPDATE forum_posts fp
+  SET like_count = (SELECT COUNT(*) FROM post_votes pv WHERE pv.post_id = fp.post_id AND pv.vote_type = 1),
+      dislike_count = (SELECT COUNT(*) FROM post_votes pv WHERE pv.post_id = fp.post_id AND pv.vote_type = -1),
+      comment_count = (SELECT COUNT(*) FROM comments c WHERE c.post_id = fp.post_id);
+
+  UPDATE comments c
+  SET like_count = (SELECT COUNT(*) FROM comment_votes cv WHERE cv.comment_id = c.comment_id AND cv.vote_type = 1),
+      dislike_count = (SELECT COUNT(*) FROM comment_votes cv WHERE cv.comment_id = c.comment_id AND cv.vote_type = -1);
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,47 @@
+-- Evict forum feed cache entries covering a point: shared entries are deleted here,
+-- in-process caches are told through NOTIFY (payload "<lat>,<lon>", deduplicated per transaction)
+CREATE OR REPLACE FUNCTION invalidate_feed_cache_at(p_latitude DOUBLE PRECISION, p_longitude DOUBLE PRECISION) RETURNS VOID AS $$
+BEGIN
+  IF p_latitude IS NULL OR p_longitude IS NULL THEN
+    RETURN;
+  END IF;
+
+  DELETE FROM feed_cache
+  WHERE ST_DWithin(location, ST_SetSRID(ST_MakePoint(p_longitude, p_latitude), 4326)::geography, radius + 50);
+
+  PERFORM pg_notify('feed_cache_invalidated', p_latitude || ',' || p_longitude);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION invalidate_feed_cache_for_issue(p_issue_id INTEGER) RETURNS VOID AS $$
+BEGIN
+  PERFORM invalidate_feed_cache_at(i.latitude, i.longitude)
+  FROM issues i
+  WHERE i.issue_id = p_issue_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- forum_posts and issue_media_assets rows are located through their issue
+CREATE OR REPLACE FUNCTION notify_feed_cache_invalidated_by_issue_ref() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM invalidate_feed_cache_for_issue(OLD.issue_id);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM invalidate_feed_cache_for_issue(NEW.issue_id);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_feed_cache_invalidated_by_issue() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM invalidate_feed_cache_at(OLD.latitude, OLD.longitude);
+  END IF;
+  IF TG_OP = 'UPDATE' AND (NEW.latitude, NEW.longitude) IS DISTINCT FROM (OLD.latitude, OLD.longitude) THEN
+    PERFORM invalidate_feed_cache_at(NEW.latitude, NEW.longitude);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
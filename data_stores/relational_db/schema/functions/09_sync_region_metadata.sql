@@ -0,0 +1,43 @@
+-- Recompute region_metadata rows for the given subzones from subzones and planning_areas
+CREATE OR REPLACE FUNCTION refresh_region_metadata(p_subzone_ids INTEGER[]) RETURNS VOID AS $$
+BEGIN
+  DELETE FROM region_metadata WHERE subzone_id = ANY(p_subzone_ids);
+
+  INSERT INTO region_metadata (
+    subzone_id, subzone_name, subzone_area_sq_m, subzone_latitude, subzone_longitude,
+    planning_area_id, planning_area_name, planning_area_area_sq_m, planning_area_latitude, planning_area_longitude
+  )
+  SELECT sz.subzone_id, sz.name, sz.area_sq_m,
+         ST_Y(ST_Centroid(sz.geom::geometry)), ST_X(ST_Centroid(sz.geom::geometry)),
+         pa.planning_area_id, pa.name, pa.area_sq_m,
+         ST_Y(ST_Centroid(pa.geom::geometry)), ST_X(ST_Centroid(pa.geom::geometry))
+  FROM subzones sz
+  LEFT JOIN planning_areas pa ON sz.planning_area_id = pa.planning_area_id
+  WHERE sz.subzone_id = ANY(p_subzone_ids);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_region_metadata_from_subzones() RETURNS TRIGGER AS $$
+BEGIN
+  -- Fires on INSERT and UPDATE only, deletes cascade from subzones
+  PERFORM refresh_region_metadata(ARRAY[NEW.subzone_id]);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_region_metadata_from_planning_areas() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM refresh_region_metadata(ARRAY(
+    SELECT sz.subzone_id FROM subzones sz WHERE sz.planning_area_id = NEW.planning_area_id
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full rebuild, for backfilling an existing database or repairing drift
+CREATE OR REPLACE FUNCTION rebuild_region_metadata() RETURNS VOID AS $$
+BEGIN
+  TRUNCATE region_metadata;
+  PERFORM refresh_region_metadata(ARRAY(SELECT subzone_id FROM subzones));
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,62 @@
+-- Create the monthly partitions <parent>_pYYYY_MM of a range partitioned table covering [p_from, p_to].
+-- Months whose rows already sit in <parent>_default are skipped with a NOTICE, since creating the
+-- partition would fail; those rows stay correct, they are just not pruned.
+CREATE OR REPLACE FUNCTION create_monthly_partitions(p_parent TEXT, p_from DATE, p_to DATE) RETURNS VOID AS $$
+DECLARE
+  month_start DATE := date_trunc('month', p_from)::date;
+  month_end DATE;
+  partition_name TEXT;
+  partition_key TEXT;
+  default_name TEXT := p_parent || '_default';
+  has_default_rows BOOLEAN;
+BEGIN
+  -- Serialise concurrent callers (several backend workers, bulk imports)
+  PERFORM pg_advisory_xact_lock(hashtext('create_monthly_partitions'));
+
+  SELECT a.attname INTO partition_key
+  FROM pg_partitioned_table pt
+  JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+  WHERE pt.partrelid = p_parent::regclass;
+
+  IF partition_key IS NULL THEN
+    RAISE EXCEPTION '% is not a partitioned table', p_parent;
+  END IF;
+
+  WHILE month_start <= p_to LOOP
+    month_end := (month_start + INTERVAL '1 month')::date;
+    partition_name := format('%s_p%s', p_parent, to_char(month_start, 'YYYY_MM'));
+
+    IF to_regclass(partition_name) IS NULL THEN
+      has_default_rows := FALSE;
+      IF to_regclass(default_name) IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE %I >= %L AND %I < %L)',
+                       default_name, partition_key, month_start, partition_key, month_end)
+        INTO has_default_rows;
+      END IF;
+
+      IF has_default_rows THEN
+        RAISE NOTICE 'Skipping %: rows for this month are already in %', partition_name, default_name;
+      ELSE
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, p_parent, month_start, month_end);
+      END IF;
+    END IF;
+
+    month_start := month_end;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keep partitions from p_months_back months ago to p_months_ahead months ahead for every
+-- time-partitioned table. Run at schema init and daily by the backend (data_stores/partitions.py).
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(p_months_back INTEGER DEFAULT 1, p_months_ahead INTEGER DEFAULT 3) RETURNS VOID AS $$
+DECLARE
+  range_from DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => p_months_back))::date;
+  range_to DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead))::date;
+BEGIN
+  PERFORM create_monthly_partitions('issues', range_from, range_to);
+  PERFORM create_monthly_partitions('chat_sessions', range_from, range_to);
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_monthly_partitions();
@@ -0,0 +1,47 @@
+-- issues is partitioned on datetime_reported, so tables referencing issues(issue_id) cannot use a
+-- foreign key (it would have to include the partition key). These triggers stand in for it.
+
+-- Insert/update side: the referenced issue must exist
+CREATE OR REPLACE FUNCTION check_issue_reference() RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.issue_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM issues WHERE issue_id = NEW.issue_id) THEN
+    RAISE EXCEPTION 'insert or update on table "%" violates issue reference', TG_TABLE_NAME
+      USING ERRCODE = 'foreign_key_violation',
+            DETAIL = format('Key (issue_id)=(%s) is not present in table "issues".', NEW.issue_id);
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Delete side: forum posts restrict, everything else cascades (as the previous foreign keys did)
+CREATE OR REPLACE FUNCTION restrict_issue_delete() RETURNS TRIGGER AS $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM forum_posts WHERE issue_id = OLD.issue_id) THEN
+    RAISE EXCEPTION 'delete on table "issues" violates issue reference from table "forum_posts"'
+      USING ERRCODE = 'foreign_key_violation',
+            DETAIL = format('Key (issue_id)=(%s) is still referenced from table "forum_posts".', OLD.issue_id);
+  END IF;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION cascade_issue_delete() RETURNS TRIGGER AS $$
+BEGIN
+  DELETE FROM issue_type_to_issue_mapping WHERE issue_id = OLD.issue_id;
+  DELETE FROM issue_subtype_to_issue_mapping WHERE issue_id = OLD.issue_id;
+  DELETE FROM issue_media_assets WHERE issue_id = OLD.issue_id;
+  DELETE FROM issue_status_history WHERE issue_id = OLD.issue_id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Changing the partition key would move the row between partitions, which runs DELETE/INSERT
+-- triggers (and the cascade above) instead of UPDATE ones
+CREATE OR REPLACE FUNCTION forbid_issue_reported_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.datetime_reported IS DISTINCT FROM OLD.datetime_reported THEN
+    RAISE EXCEPTION 'datetime_reported is the partition key of issues and cannot be changed';
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
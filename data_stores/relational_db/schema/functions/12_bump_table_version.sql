@@ -0,0 +1,24 @@
+-- Statement-level: one change row per INSERT/UPDATE/DELETE/TRUNCATE however many rows it touched.
+-- A plain insert, so concurrent writers to the same table never queue on each other.
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO table_changes (table_name) VALUES (TG_TABLE_NAME);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fold the change rows into one per table, keeping each table's version and last change time.
+-- Rows of transactions still in flight are not visible here and simply stay, so no change is lost.
+CREATE OR REPLACE FUNCTION compact_table_changes() RETURNS VOID AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('compact_table_changes'));
+
+  WITH removed AS (
+    DELETE FROM table_changes RETURNING table_name, changes, changed_at
+  )
+  INSERT INTO table_changes (table_name, changes, changed_at)
+  SELECT table_name, SUM(changes), MAX(changed_at)
+  FROM removed
+  GROUP BY table_name;
+END;
+$$ LANGUAGE plpgsql;
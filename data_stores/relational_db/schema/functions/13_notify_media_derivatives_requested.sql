@@ -0,0 +1,7 @@
+-- Tells backend workers a new image needs its derivatives (backend/services/media/derivatives.py), payload issue_media_id
+CREATE OR REPLACE FUNCTION notify_media_derivatives_requested() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('media_derivatives_requested', NEW.issue_media_id::text);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,22 @@
+-- media_objects.ref_count = number of issue_media_assets rows pointing at the object, applied as +/-1 deltas.
+-- Objects that drop to 0 are kept: a later resubmission of the same file then needs no upload.
+
+CREATE OR REPLACE FUNCTION sync_media_object_ref_count() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.sha256 IS NOT NULL THEN
+    UPDATE media_objects SET ref_count = ref_count - 1 WHERE sha256 = OLD.sha256;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.sha256 IS NOT NULL THEN
+    UPDATE media_objects SET ref_count = ref_count + 1 WHERE sha256 = NEW.sha256;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full rebuild from issue_media_assets, for repairing drift
+CREATE OR REPLACE FUNCTION rebuild_media_object_ref_counts() RETURNS VOID AS $$
+BEGIN
+  UPDATE media_objects mo
+  SET ref_count = (SELECT COUNT(*) FROM issue_media_assets ima WHERE ima.sha256 = mo.sha256);
+END;
+$$ LANGUAGE plpgsql;
@@ -3,12 +3,18 @@ CREATE TABLE IF NOT EXISTS system_config (
   value text
 );
 
+DROP TABLE IF EXISTS table_changes CASCADE;     -- takes the table_versions view with it
+DROP TABLE IF EXISTS table_versions CASCADE;    -- counter table of older schemas
+DROP TABLE IF EXISTS region_metadata CASCADE;
+DROP TABLE IF EXISTS feed_cache CASCADE;
+DROP TABLE IF EXISTS daily_issue_counts CASCADE;
 DROP TABLE IF EXISTS comment_votes CASCADE;
 DROP TABLE IF EXISTS post_votes CASCADE;
 DROP TABLE IF EXISTS comments CASCADE;
 DROP TABLE IF EXISTS forum_posts CASCADE;
 DROP TABLE IF EXISTS issue_status_history CASCADE;
 DROP TABLE IF EXISTS issue_media_assets CASCADE;
+DROP TABLE IF EXISTS media_objects CASCADE;
 DROP TABLE IF EXISTS issue_subtype_to_issue_mapping CASCADE;
 DROP TABLE IF EXISTS issue_type_to_issue_mapping CASCADE;
 DROP TABLE IF EXISTS issues CASCADE;
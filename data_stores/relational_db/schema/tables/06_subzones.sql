@@ -5,3 +5,6 @@ CREATE TABLE IF NOT EXISTS subzones (
     geom GEOGRAPHY(MULTIPOLYGON, 4326),
     area_sq_m double precision GENERATED ALWAYS AS (ST_Area(geom::geography)) STORED
 );
+
+-- Point-in-subzone lookups (geo-tagging issues)
+CREATE INDEX IF NOT EXISTS idx_subzones_geom ON subzones USING GIST (geom);
@@ -1,5 +1,9 @@
+-- Range partitioned by month on datetime_reported, which never changes after insert.
+-- Monthly partitions are created ahead of time by create_monthly_partitions() (functions/10_manage_partitions.sql),
+-- rows outside every monthly partition land in issues_default.
+-- To convert an existing unpartitioned database run migrations/01 and 02_partition_issues_and_chat_sessions.sql
 CREATE TABLE IF NOT EXISTS issues (
-    issue_id SERIAL PRIMARY KEY,
+    issue_id SERIAL,
     user_id INTEGER REFERENCES users(user_id),
 
     -- Location Info
@@ -10,11 +14,15 @@ CREATE TABLE IF NOT EXISTS issues (
     ) STORED,
     address TEXT,
 
+    -- Square grid cell (0.0009 degrees, ~100 m) used for map aggregation, coarser cells are integer multiples
+    grid_x INTEGER GENERATED ALWAYS AS (floor(longitude / 0.0009)::integer) STORED,
+    grid_y INTEGER GENERATED ALWAYS AS (floor(latitude / 0.0009)::integer) STORED,
+
     -- Description & Classification
     description TEXT,
     severity VARCHAR(50),
     status VARCHAR(50) DEFAULT 'Reported',
-    datetime_reported TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    datetime_reported TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     datetime_acknowledged TIMESTAMP,
     datetime_closed TIMESTAMP,
     datetime_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -26,9 +34,43 @@ CREATE TABLE IF NOT EXISTS issues (
     planning_area_id INTEGER REFERENCES planning_areas(planning_area_id),
     subzone_id INTEGER REFERENCES subzones(subzone_id),
 
+    -- Full-text search document, description weighted above address (see crud.issues.search_issues)
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(description, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(address, '')), 'B')
+    ) STORED,
+
+    -- Denormalised copies of the type/subtype mappings, kept in sync by sync_issue_category_ids()
+    issue_type_ids INTEGER[] NOT NULL DEFAULT '{}',
+    issue_subtype_ids INTEGER[] NOT NULL DEFAULT '{}',
+
     -- Visibility
     is_public BOOLEAN DEFAULT TRUE,
 
     -- Triggers
-    is_deleted BOOLEAN DEFAULT FALSE
-);
+    is_deleted BOOLEAN DEFAULT FALSE,
+
+    -- The partition key must be part of the primary key, issue_id alone stays unique through its sequence
+    PRIMARY KEY (issue_id, datetime_reported),
+
+    -- Lets upper bounds on datetime_updated also bound datetime_reported, so those filters prune partitions
+    CONSTRAINT issues_updated_after_reported CHECK (datetime_updated IS NULL OR datetime_updated >= datetime_reported)
+) PARTITION BY RANGE (datetime_reported);
+
+CREATE TABLE IF NOT EXISTS issues_default PARTITION OF issues DEFAULT;
+
+-- Keyset pagination over (datetime_updated, issue_id), matches ORDER BY in crud.issues.get_issues
+CREATE INDEX IF NOT EXISTS idx_issues_updated_id ON issues (datetime_updated DESC NULLS LAST, issue_id DESC);
+
+-- Spatial lookups (vector tiles, proximity) on the stored point
+CREATE INDEX IF NOT EXISTS idx_issues_location ON issues USING GIST (location);
+
+-- Grid aggregation, bbox ranges and GROUP BY over precomputed cells
+CREATE INDEX IF NOT EXISTS idx_issues_grid ON issues (grid_y, grid_x);
+
+-- Category filters (&&, @>) on the denormalised arrays
+CREATE INDEX IF NOT EXISTS idx_issues_issue_type_ids ON issues USING GIN (issue_type_ids);
+CREATE INDEX IF NOT EXISTS idx_issues_issue_subtype_ids ON issues USING GIN (issue_subtype_ids);
+
+-- Keyword search (@@) on the stored tsvector
+CREATE INDEX IF NOT EXISTS idx_issues_search_vector ON issues USING GIN (search_vector);
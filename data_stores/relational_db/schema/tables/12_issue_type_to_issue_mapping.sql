@@ -1,5 +1,6 @@
+-- References issues(issue_id), enforced by trigger since issues is partitioned (functions/11_issue_references.sql)
 CREATE TABLE IF NOT EXISTS issue_type_to_issue_mapping (
-    issue_id INTEGER REFERENCES issues(issue_id) ON DELETE CASCADE, 
+    issue_id INTEGER, 
     issue_type_id INTEGER REFERENCES issue_types(issue_type_id) ON DELETE CASCADE, 
     PRIMARY KEY (issue_id, issue_type_id)
 );
@@ -1,8 +1,32 @@
+-- Content-addressed store behind issue media: one object per distinct file, keyed by its SHA-256.
+-- ref_count is kept by sync_media_object_ref_count() (functions/14_sync_media_object_ref_count.sql).
+CREATE TABLE IF NOT EXISTS media_objects (
+    sha256 CHAR(64) PRIMARY KEY,
+    bucket_name TEXT NOT NULL,
+    object_name TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    size BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    derived JSONB NOT NULL DEFAULT '{}',    -- per-image work keyed by content: variants, EXIF, VLM output...
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- References issues(issue_id), enforced by trigger since issues is partitioned (functions/11_issue_references.sql)
 CREATE TABLE IF NOT EXISTS issue_media_assets (
     issue_media_id SERIAL PRIMARY KEY,
-    issue_id INTEGER REFERENCES issues(issue_id) ON DELETE CASCADE,
+    issue_id INTEGER,
+    sha256 CHAR(64) REFERENCES media_objects(sha256),  -- NULL for media stored before content addressing
     media_type VARCHAR(20) CHECK (media_type IN ('image', 'video', 'audio', 'document')),
     file_path TEXT NOT NULL, 
     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     metadata JSONB -- Optional: dimensions, duration, size, MIME type, etc.
 );
+
+CREATE INDEX IF NOT EXISTS idx_issue_media_assets_issue ON issue_media_assets (issue_id);
+
+-- The same file is attached to an issue once, however often it is resubmitted
+CREATE UNIQUE INDEX IF NOT EXISTS idx_issue_media_assets_issue_sha256 ON issue_media_assets (issue_id, sha256);
+
+-- Images still waiting for their thumbnail/WebP variants (backend/services/media/derivatives.py)
+CREATE INDEX IF NOT EXISTS idx_issue_media_assets_pending_variants ON issue_media_assets (issue_media_id)
+    WHERE media_type = 'image' AND (metadata IS NULL OR NOT metadata ? 'variants');
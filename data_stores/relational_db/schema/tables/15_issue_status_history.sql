@@ -1,8 +1,11 @@
+-- References issues(issue_id), enforced by trigger since issues is partitioned (functions/11_issue_references.sql)
 CREATE TABLE IF NOT EXISTS issue_status_history (
     history_id SERIAL PRIMARY KEY,
-    issue_id INTEGER REFERENCES issues(issue_id) ON DELETE CASCADE,
+    issue_id INTEGER,
     old_status VARCHAR(50),
     new_status VARCHAR(50) NOT NULL,
     changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     notes TEXT -- optional admin notes
 );
+
+CREATE INDEX IF NOT EXISTS idx_issue_status_history_issue ON issue_status_history (issue_id);
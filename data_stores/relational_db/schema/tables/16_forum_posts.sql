@@ -1,7 +1,16 @@
+-- References issues(issue_id), enforced by trigger since issues is partitioned (functions/11_issue_references.sql)
 CREATE TABLE IF NOT EXISTS forum_posts (
     post_id SERIAL PRIMARY KEY,
-    issue_id INTEGER REFERENCES issues(issue_id),
+    issue_id INTEGER,
     user_id INTEGER REFERENCES users(user_id),
     title TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- Maintained by the vote/comment counter triggers
+    like_count INTEGER NOT NULL DEFAULT 0,
+    dislike_count INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0
 );
+
+-- Post lookup per issue (nearby threads)
+CREATE INDEX IF NOT EXISTS idx_forum_posts_issue ON forum_posts (issue_id, post_id);
@@ -4,5 +4,12 @@ CREATE TABLE IF NOT EXISTS comments (
     user_id INTEGER REFERENCES users(user_id),
     parent_comment_id INTEGER REFERENCES comments(comment_id) ON DELETE CASCADE,
     content TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- Maintained by the vote counter triggers
+    like_count INTEGER NOT NULL DEFAULT 0,
+    dislike_count INTEGER NOT NULL DEFAULT 0
 );
+
+-- Comment pages per post, keyed on comment_id
+CREATE INDEX IF NOT EXISTS idx_comments_post ON comments (post_id, comment_id);
@@ -11,3 +11,7 @@ CREATE TABLE IF NOT EXISTS comment_votes (
     vote_type SMALLINT CHECK (vote_type IN (-1, 1)),
     PRIMARY KEY (user_id, comment_id)
 );
+
+-- Vote counts per post/comment, the primary keys lead with user_id
+CREATE INDEX IF NOT EXISTS idx_post_votes_post ON post_votes (post_id);
+CREATE INDEX IF NOT EXISTS idx_comment_votes_comment ON comment_votes (comment_id);
@@ -1,10 +1,17 @@
+-- Range partitioned by month on created_at, see tables/11_issues.sql
 CREATE TABLE IF NOT EXISTS chat_sessions (
-    chat_id SERIAL PRIMARY KEY,
+    chat_id SERIAL,
     user_id INTEGER REFERENCES users(user_id),                      -- nullable if anonymous
     session_id UUID NOT NULL,                                       -- groups messages into a session
     sender VARCHAR(10) NOT NULL CHECK (sender IN ('user', 'bot')),
     message TEXT NOT NULL,
     message_type VARCHAR(20) DEFAULT 'text',                        -- e.g. 'text', 'image', 'map'
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    metadata JSONB                                                  -- optional: NER, intent, etc.
-);
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    metadata JSONB,                                                 -- optional: NER, intent, etc.
+    PRIMARY KEY (chat_id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS chat_sessions_default PARTITION OF chat_sessions DEFAULT;
+
+-- Session history lookups
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_session ON chat_sessions (session_id, created_at);
@@ -0,0 +1,20 @@
+/*
+Daily rollup of issue counts, maintained by triggers on issues and the category mapping tables (see functions/04 and triggers/05).
+Each issue is counted once per level:
+  - issue_type_id IS NULL AND issue_subtype_id IS NULL : all issues
+  - issue_type_id set, issue_subtype_id IS NULL        : issues mapped to that type
+  - issue_subtype_id set (with its parent type)        : issues mapped to that subtype
+*/
+CREATE TABLE IF NOT EXISTS daily_issue_counts (
+    date DATE NOT NULL,
+    subzone_id INTEGER REFERENCES subzones(subzone_id) ON DELETE CASCADE,
+    authority_id INTEGER REFERENCES authorities(authority_id) ON DELETE CASCADE,
+    issue_type_id INTEGER REFERENCES issue_types(issue_type_id) ON DELETE CASCADE,
+    issue_subtype_id INTEGER REFERENCES issue_subtypes(issue_subtype_id) ON DELETE CASCADE,
+    count INTEGER NOT NULL DEFAULT 0,
+
+    UNIQUE NULLS NOT DISTINCT (date, subzone_id, authority_id, issue_type_id, issue_subtype_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_issue_counts_series
+    ON daily_issue_counts (subzone_id, issue_type_id, issue_subtype_id, date) INCLUDE (count, authority_id);
@@ -0,0 +1,15 @@
+-- Shared forum feed response cache (response_cache.backend: postgres), rebuilt on demand so no WAL is needed
+CREATE UNLOGGED TABLE IF NOT EXISTS feed_cache (
+    key TEXT PRIMARY KEY,
+    latitude DOUBLE PRECISION NOT NULL,
+    longitude DOUBLE PRECISION NOT NULL,
+    location geography(Point, 4326) GENERATED ALWAYS AS (
+        ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)
+    ) STORED,
+    radius INTEGER NOT NULL,
+    body JSONB NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Invalidation looks up entries whose feed area covers a changed point
+CREATE INDEX IF NOT EXISTS idx_feed_cache_location ON feed_cache USING GIST (location);
@@ -0,0 +1,16 @@
+-- One row per subzone with its parent planning area, centroids and areas precomputed.
+-- Maintained by the region metadata triggers, served from the backend's reference data cache
+CREATE TABLE IF NOT EXISTS region_metadata (
+    subzone_id INTEGER PRIMARY KEY REFERENCES subzones(subzone_id) ON DELETE CASCADE,
+    subzone_name VARCHAR(100) NOT NULL,
+    subzone_area_sq_m DOUBLE PRECISION,
+    subzone_latitude DOUBLE PRECISION,
+    subzone_longitude DOUBLE PRECISION,
+    planning_area_id INTEGER REFERENCES planning_areas(planning_area_id) ON DELETE CASCADE,
+    planning_area_name VARCHAR(100),
+    planning_area_area_sq_m DOUBLE PRECISION,
+    planning_area_latitude DOUBLE PRECISION,
+    planning_area_longitude DOUBLE PRECISION
+);
+
+CREATE INDEX IF NOT EXISTS idx_region_metadata_planning_area ON region_metadata (planning_area_id);
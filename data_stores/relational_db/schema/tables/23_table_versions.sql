@@ -0,0 +1,23 @@
+-- Append-only change log, one row per modifying statement written by bump_table_version() (functions/12_bump_table_version.sql).
+-- Inserting never waits on other writers, unlike bumping a shared counter row. compact_table_changes() folds the rows
+-- into one per table from time to time.
+CREATE TABLE IF NOT EXISTS table_changes (
+    change_id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    changes BIGINT NOT NULL DEFAULT 1,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX IF NOT EXISTS idx_table_changes_table ON table_changes (table_name) INCLUDE (changes, changed_at);
+
+-- Change counter per table backing the ETag / Last-Modified validators of cacheable read endpoints.
+-- A row only counts once its transaction commits, so the version moves exactly when the data becomes visible.
+CREATE OR REPLACE VIEW table_versions AS
+SELECT table_name, SUM(changes)::BIGINT AS version, MAX(changed_at) AS changed_at
+FROM table_changes
+GROUP BY table_name;
+
+INSERT INTO table_changes (table_name, changes)
+SELECT seed.table_name, 0
+FROM (VALUES ('issues'), ('issue_types'), ('issue_subtypes'), ('authorities'), ('subzones'), ('planning_areas')) AS seed (table_name)
+WHERE NOT EXISTS (SELECT 1 FROM table_changes tc WHERE tc.table_name = seed.table_name);
@@ -4,6 +4,16 @@ DECLARE
   webhook_url text;
   response json;
 BEGIN
+  -- Bulk ingestion sets this for its transaction to avoid one HTTP call per row
+  IF current_setting('hualaowei.skip_issue_webhook', true) = 'on' THEN
+    RETURN NEW;
+  END IF;
+
+  -- Writes made from other triggers (e.g. category array sync) are not user edits
+  IF pg_trigger_depth() > 1 THEN
+    RETURN NEW;
+  END IF;
+
   -- Lookup webhook URL from system_config
   SELECT value INTO webhook_url
   FROM system_config
@@ -0,0 +1,24 @@
+DROP TRIGGER IF EXISTS trg_daily_issue_counts_issue_write ON issues;
+DROP TRIGGER IF EXISTS trg_daily_issue_counts_issue_delete ON issues;
+DROP TRIGGER IF EXISTS trg_daily_issue_counts_type_mapping ON issue_type_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_daily_issue_counts_subtype_mapping ON issue_subtype_to_issue_mapping;
+
+CREATE TRIGGER trg_daily_issue_counts_issue_write
+AFTER INSERT OR UPDATE OF datetime_reported, subzone_id, authority_id ON issues
+FOR EACH ROW
+EXECUTE FUNCTION sync_daily_issue_counts_from_issues();
+
+CREATE TRIGGER trg_daily_issue_counts_issue_delete
+BEFORE DELETE ON issues
+FOR EACH ROW
+EXECUTE FUNCTION sync_daily_issue_counts_from_issues();
+
+CREATE TRIGGER trg_daily_issue_counts_type_mapping
+AFTER INSERT OR UPDATE OR DELETE ON issue_type_to_issue_mapping
+FOR EACH ROW
+EXECUTE FUNCTION sync_daily_issue_counts_from_type_mapping();
+
+CREATE TRIGGER trg_daily_issue_counts_subtype_mapping
+AFTER INSERT OR UPDATE OR DELETE ON issue_subtype_to_issue_mapping
+FOR EACH ROW
+EXECUTE FUNCTION sync_daily_issue_counts_from_subtype_mapping();
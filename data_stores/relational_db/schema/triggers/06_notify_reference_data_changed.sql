@@ -0,0 +1,29 @@
+DROP TRIGGER IF EXISTS trg_notify_reference_data_changed ON issue_types;
+CREATE TRIGGER trg_notify_reference_data_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON issue_types
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reference_data_changed();
+
+DROP TRIGGER IF EXISTS trg_notify_reference_data_changed ON issue_subtypes;
+CREATE TRIGGER trg_notify_reference_data_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON issue_subtypes
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reference_data_changed();
+
+DROP TRIGGER IF EXISTS trg_notify_reference_data_changed ON authorities;
+CREATE TRIGGER trg_notify_reference_data_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON authorities
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reference_data_changed();
+
+DROP TRIGGER IF EXISTS trg_notify_reference_data_changed ON subzones;
+CREATE TRIGGER trg_notify_reference_data_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON subzones
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reference_data_changed();
+
+DROP TRIGGER IF EXISTS trg_notify_reference_data_changed ON planning_areas;
+CREATE TRIGGER trg_notify_reference_data_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON planning_areas
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reference_data_changed();
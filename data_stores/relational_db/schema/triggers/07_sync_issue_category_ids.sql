@@ -0,0 +1,44 @@
+DROP TRIGGER IF EXISTS trg_issue_type_ids_insert ON issue_type_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_type_ids_update ON issue_type_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_type_ids_delete ON issue_type_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_subtype_ids_insert ON issue_subtype_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_subtype_ids_update ON issue_subtype_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_subtype_ids_delete ON issue_subtype_to_issue_mapping;
+
+-- Transition tables need one trigger per event
+
+CREATE TRIGGER trg_issue_type_ids_insert
+AFTER INSERT ON issue_type_to_issue_mapping
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION sync_issue_category_ids();
+
+CREATE TRIGGER trg_issue_type_ids_update
+AFTER UPDATE ON issue_type_to_issue_mapping
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION sync_issue_category_ids();
+
+CREATE TRIGGER trg_issue_type_ids_delete
+AFTER DELETE ON issue_type_to_issue_mapping
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION sync_issue_category_ids();
+
+CREATE TRIGGER trg_issue_subtype_ids_insert
+AFTER INSERT ON issue_subtype_to_issue_mapping
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION sync_issue_category_ids();
+
+CREATE TRIGGER trg_issue_subtype_ids_update
+AFTER UPDATE ON issue_subtype_to_issue_mapping
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION sync_issue_category_ids();
+
+CREATE TRIGGER trg_issue_subtype_ids_delete
+AFTER DELETE ON issue_subtype_to_issue_mapping
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION sync_issue_category_ids();
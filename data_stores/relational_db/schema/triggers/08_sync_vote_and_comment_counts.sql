@@ -0,0 +1,18 @@
+DROP TRIGGER IF EXISTS trg_post_vote_counts ON post_votes;
+DROP TRIGGER IF EXISTS trg_comment_vote_counts ON comment_votes;
+DROP TRIGGER IF EXISTS trg_post_comment_count ON comments;
+
+CREATE TRIGGER trg_post_vote_counts
+AFTER INSERT OR UPDATE OF post_id, vote_type OR DELETE ON post_votes
+FOR EACH ROW
+EXECUTE FUNCTION sync_post_vote_counts();
+
+CREATE TRIGGER trg_comment_vote_counts
+AFTER INSERT OR UPDATE OF comment_id, vote_type OR DELETE ON comment_votes
+FOR EACH ROW
+EXECUTE FUNCTION sync_comment_vote_counts();
+
+CREATE TRIGGER trg_post_comment_count
+AFTER INSERT OR UPDATE OF post_id OR DELETE ON comments
+FOR EACH ROW
+EXECUTE FUNCTION sync_post_comment_count();
@@ -0,0 +1,20 @@
+DROP TRIGGER IF EXISTS trg_feed_cache_forum_posts ON forum_posts;
+DROP TRIGGER IF EXISTS trg_feed_cache_issue_media_assets ON issue_media_assets;
+DROP TRIGGER IF EXISTS trg_feed_cache_issues ON issues;
+
+-- Vote and comment counters are left to the TTL so busy threads do not churn the cache
+CREATE TRIGGER trg_feed_cache_forum_posts
+AFTER INSERT OR UPDATE OF issue_id, title, created_at OR DELETE ON forum_posts
+FOR EACH ROW
+EXECUTE FUNCTION notify_feed_cache_invalidated_by_issue_ref();
+
+CREATE TRIGGER trg_feed_cache_issue_media_assets
+AFTER INSERT OR UPDATE OR DELETE ON issue_media_assets
+FOR EACH ROW
+EXECUTE FUNCTION notify_feed_cache_invalidated_by_issue_ref();
+
+-- New issues have no forum post yet, so only edits and deletes of existing ones matter
+CREATE TRIGGER trg_feed_cache_issues
+AFTER UPDATE OF latitude, longitude, description, severity, status, is_deleted OR DELETE ON issues
+FOR EACH ROW
+EXECUTE FUNCTION notify_feed_cache_invalidated_by_issue();
@@ -0,0 +1,20 @@
+DROP TRIGGER IF EXISTS trg_region_metadata_subzones ON subzones;
+DROP TRIGGER IF EXISTS trg_region_metadata_planning_areas ON planning_areas;
+
+CREATE TRIGGER trg_region_metadata_subzones
+AFTER INSERT OR UPDATE OF planning_area_id, name, geom ON subzones
+FOR EACH ROW
+EXECUTE FUNCTION sync_region_metadata_from_subzones();
+
+-- Subzones are seeded after planning areas, so inserts here have nothing to refresh
+CREATE TRIGGER trg_region_metadata_planning_areas
+AFTER UPDATE OF name, geom ON planning_areas
+FOR EACH ROW
+EXECUTE FUNCTION sync_region_metadata_from_planning_areas();
+
+-- Backend workers hold region_metadata in their reference data cache
+DROP TRIGGER IF EXISTS trg_notify_reference_data_changed ON region_metadata;
+CREATE TRIGGER trg_notify_reference_data_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON region_metadata
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reference_data_changed();
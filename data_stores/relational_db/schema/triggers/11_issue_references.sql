@@ -0,0 +1,49 @@
+DROP TRIGGER IF EXISTS trg_issue_reference ON issue_type_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_reference ON issue_subtype_to_issue_mapping;
+DROP TRIGGER IF EXISTS trg_issue_reference ON issue_media_assets;
+DROP TRIGGER IF EXISTS trg_issue_reference ON issue_status_history;
+DROP TRIGGER IF EXISTS trg_issue_reference ON forum_posts;
+DROP TRIGGER IF EXISTS trg_issue_restrict_delete ON issues;
+DROP TRIGGER IF EXISTS trg_issue_cascade_delete ON issues;
+DROP TRIGGER IF EXISTS trg_issue_forbid_reported_change ON issues;
+
+CREATE TRIGGER trg_issue_reference
+BEFORE INSERT OR UPDATE OF issue_id ON issue_type_to_issue_mapping
+FOR EACH ROW
+EXECUTE FUNCTION check_issue_reference();
+
+CREATE TRIGGER trg_issue_reference
+BEFORE INSERT OR UPDATE OF issue_id ON issue_subtype_to_issue_mapping
+FOR EACH ROW
+EXECUTE FUNCTION check_issue_reference();
+
+CREATE TRIGGER trg_issue_reference
+BEFORE INSERT OR UPDATE OF issue_id ON issue_media_assets
+FOR EACH ROW
+EXECUTE FUNCTION check_issue_reference();
+
+CREATE TRIGGER trg_issue_reference
+BEFORE INSERT OR UPDATE OF issue_id ON issue_status_history
+FOR EACH ROW
+EXECUTE FUNCTION check_issue_reference();
+
+CREATE TRIGGER trg_issue_reference
+BEFORE INSERT OR UPDATE OF issue_id ON forum_posts
+FOR EACH ROW
+EXECUTE FUNCTION check_issue_reference();
+
+CREATE TRIGGER trg_issue_restrict_delete
+BEFORE DELETE ON issues
+FOR EACH ROW
+EXECUTE FUNCTION restrict_issue_delete();
+
+-- AFTER so the daily count trigger (BEFORE DELETE) still sees the category mappings
+CREATE TRIGGER trg_issue_cascade_delete
+AFTER DELETE ON issues
+FOR EACH ROW
+EXECUTE FUNCTION cascade_issue_delete();
+
+CREATE TRIGGER trg_issue_forbid_reported_change
+BEFORE UPDATE OF datetime_reported ON issues
+FOR EACH ROW
+EXECUTE FUNCTION forbid_issue_reported_change();
@@ -0,0 +1,35 @@
+DROP TRIGGER IF EXISTS trg_bump_table_version ON issues;
+CREATE TRIGGER trg_bump_table_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON issues
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_bump_table_version ON issue_types;
+CREATE TRIGGER trg_bump_table_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON issue_types
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_bump_table_version ON issue_subtypes;
+CREATE TRIGGER trg_bump_table_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON issue_subtypes
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_bump_table_version ON authorities;
+CREATE TRIGGER trg_bump_table_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON authorities
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_bump_table_version ON subzones;
+CREATE TRIGGER trg_bump_table_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON subzones
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_bump_table_version ON planning_areas;
+CREATE TRIGGER trg_bump_table_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON planning_areas
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_table_version();
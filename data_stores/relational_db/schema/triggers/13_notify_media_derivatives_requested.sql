@@ -0,0 +1,6 @@
+DROP TRIGGER IF EXISTS trg_notify_media_derivatives_requested ON issue_media_assets;
+CREATE TRIGGER trg_notify_media_derivatives_requested
+AFTER INSERT ON issue_media_assets
+FOR EACH ROW
+WHEN (NEW.media_type = 'image')
+EXECUTE FUNCTION notify_media_derivatives_requested();
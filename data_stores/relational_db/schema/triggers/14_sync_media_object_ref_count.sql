@@ -0,0 +1,5 @@
+DROP TRIGGER IF EXISTS trg_sync_media_object_ref_count ON issue_media_assets;
+CREATE TRIGGER trg_sync_media_object_ref_count
+AFTER INSERT OR UPDATE OF sha256 OR DELETE ON issue_media_assets
+FOR EACH ROW
+EXECUTE FUNCTION sync_media_object_ref_count();
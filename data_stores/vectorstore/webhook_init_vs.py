@@ -29,7 +29,7 @@ model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
 app = FastAPI()
 
-def get_issue_details(issue_id: int):
+def get_issue_details(issue_ids: list[int]):
     query = """
     SELECT 
         i.issue_id, i.description, i.severity, i.address, i.status, sz.name AS subzone_name,
@@ -48,72 +48,84 @@ def get_issue_details(issue_id: int):
     LEFT JOIN town_councils tc ON auth.authority_type = 'town_council' AND auth.authority_ref_id = tc.town_council_id
     WHERE i.description IS NOT NULL 
     AND (i.status != 'Resolved' OR i.datetime_closed IS NULL) 
-    AND i.issue_id = %s
+    AND i.issue_id = ANY(%s)
     GROUP BY i.issue_id, sz.name, a.name, tc.name
     """
 
     with psycopg.connect(**DB_CONN_PARAMS) as conn:
         with conn.cursor() as cursor:
-            cursor.execute(query, (issue_id,))
-            return cursor.fetchone()
+            cursor.execute(query, (issue_ids,))
+            return cursor.fetchall()
+
+def build_issue_object(issue, vector: list[float]) -> dict:
+    (
+        issue_id, description, severity, address, status,
+        subzone_name, datetime_reported, datetime_acknowledged,
+        issue_types, issue_subtypes, agency_name, town_council_name
+    ) = issue
+
+    combined_text = (
+        f"Issue Types: {', '.join(issue_types or [])} > {', '.join(issue_subtypes or [])}\n"
+        f"Description: {description}\n"
+        f"Severity: {severity}, Status: {status}\n"
+        f"Location: {address or 'N/A'}, Subzone: {subzone_name}\n"
+        f"Reported: {datetime_reported}\n"
+        f"Acknowledged: {datetime_acknowledged}\n"
+        f"Agency: {agency_name}, Town Council: {town_council_name}"
+    )
+
+    return {
+        "class": COLLECTION_NAME,
+        "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"issue:{issue_id}")),
+        "properties": {
+            "description": description or "",
+            "severity": severity or "",
+            "status": status or "",
+            "address": address or "",
+            "subzone": subzone_name or "",
+            "issue_type": issue_types or [],
+            "issue_subtype": issue_subtypes or [],
+            "agency": agency_name or "",
+            "town_council": town_council_name or "",
+            "datetime_reported": datetime_reported.isoformat() if datetime_reported else None,
+            "datetime_acknowledged": datetime_acknowledged.isoformat() if datetime_acknowledged else None,
+            "combined_text": combined_text
+        },
+        "vector": vector
+    }
 
 @app.post("/webhook/issue")
 async def issue_webhook(request: Request):
+    """
+    Embed and upsert issues into the vectorstore. Takes {"issue_id": <int>} from the row trigger,
+    or {"issue_ids": [<int>, ...]} from bulk imports, which are embedded and written in one batch.
+    """
     try:
         data = await request.json()
-        issue_id = data.get("issue_id")
+        issue_ids = data.get("issue_ids") or ([data["issue_id"]] if data.get("issue_id") else [])
 
-        if not issue_id:
+        if not issue_ids:
             return JSONResponse(content={"error": "Missing issue_id"}, status_code=400)
 
-        issue = get_issue_details(issue_id)
-        if not issue:
+        issues = get_issue_details(issue_ids)
+        if not issues and data.get("issue_ids"):
+            # Resolved or undescribed issues are not indexed, a batch of only those is not an error
+            return JSONResponse(content={"message": "No indexable issues."}, status_code=200)
+        if not issues:
             return JSONResponse(content={"error": "Issue not found"}, status_code=404)
 
-        (
-            _issue_id, description, severity, address, status,
-            subzone_name, datetime_reported, datetime_acknowledged,
-            issue_types, issue_subtypes, agency_name, town_council_name
-        ) = issue
-
-        vector = model.encode(description).tolist()
-
-        combined_text = (
-            f"Issue Types: {', '.join(issue_types or [])} > {', '.join(issue_subtypes or [])}\n"
-            f"Description: {description}\n"
-            f"Severity: {severity}, Status: {status}\n"
-            f"Location: {address or 'N/A'}, Subzone: {subzone_name}\n"
-            f"Reported: {datetime_reported}\n"
-            f"Acknowledged: {datetime_acknowledged}\n"
-            f"Agency: {agency_name}, Town Council: {town_council_name}"
-        )
-
-        payload = {
-            "class": COLLECTION_NAME,
-            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"issue:{issue_id}")),
-            "properties": {
-                "description": description or "",
-                "severity": severity or "",
-                "status": status or "",
-                "address": address or "",
-                "subzone": subzone_name or "",
-                "issue_type": issue_types or [],
-                "issue_subtype": issue_subtypes or [],
-                "agency": agency_name or "",
-                "town_council": town_council_name or "",
-                "datetime_reported": datetime_reported.isoformat() if datetime_reported else None,
-                "datetime_acknowledged": datetime_acknowledged.isoformat() if datetime_acknowledged else None,
-                "combined_text": combined_text
-            },
-            "vector": vector
-        }
-
-        response = requests.post(f"{VECTORSTORE_URL}/v1/objects", json=payload)
+        vectors = model.encode([issue[1] for issue in issues]).tolist()
+        objects = [build_issue_object(issue, vector) for issue, vector in zip(issues, vectors)]
+
+        if len(objects) == 1:
+            response = requests.post(f"{VECTORSTORE_URL}/v1/objects", json=objects[0])
+        else:
+            response = requests.post(f"{VECTORSTORE_URL}/v1/batch/objects", json={"objects": objects})
         if response.status_code >= 400:
             logger.error(f"Failed to update vectorstore: {response.text}")
             return JSONResponse(content={"error": response.text}, status_code=500)
 
-        return JSONResponse(content={"message": "Embedded and updated successfully."}, status_code=200)
+        return JSONResponse(content={"message": f"Embedded and updated {len(objects)} issues successfully."}, status_code=200)
 
     except Exception as e:
         logger.exception("Webhook processing failed.")